@@ -6,8 +6,12 @@ https://docs.pytest.org/en/stable/deprecations.html#pytest-plugins-in-non-top-le
 """
 
 pytest_plugins = [
+    "v1.test_fixtures.benchmarks",
     "v1.test_fixtures.classes",
+    "v1.test_fixtures.clocks",
     "v1.test_fixtures.clients",
     "v1.test_fixtures.database",
+    "v1.test_fixtures.emails",
+    "v1.test_fixtures.queries",
     "v1.test_fixtures.users",
 ]
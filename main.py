@@ -3,29 +3,86 @@
 from fastapi import APIRouter, FastAPI
 
 from v1.api_infra.lifespans.all import lifespans
+from v1.api_infra.middlewares.metrics import RequestMetricsMiddleware
+from v1.api_infra.middlewares.query_stats import QueryStatsMiddleware
+from v1.api_infra.middlewares.read_your_writes import ReadYourWritesMiddleware
+from v1.exceptions.auth import IncorrectLoginError, InvalidAccessTokenError
+from v1.exceptions.handlers.auth import incorrect_login_exception_handler, invalid_access_token_exception_handler
+from v1.exceptions.handlers.pagination import invalid_cursor_exception_handler
+from v1.exceptions.handlers.passwords import password_hashing_pool_full_exception_handler
 from v1.exceptions.handlers.users import (
     user_already_exists_exception_handler,
+    user_email_undeliverable_exception_handler,
     user_has_been_previously_deleted_exception_handler,
     user_id_does_not_exist_exception_handler,
 )
-from v1.exceptions.users import UserAlreadyExistsError, UserHasBeenPreviouslyDeletedError, UserIdDoesNotExistError
-from v1.settings import APP_TITLE, DEBUG_FASTAPI_APP
+from v1.exceptions.pagination import InvalidCursorError
+from v1.exceptions.passwords import PasswordHashingPoolFullError
+from v1.exceptions.users import (
+    UserAlreadyExistsError,
+    UserEmailUndeliverableError,
+    UserHasBeenPreviouslyDeletedError,
+    UserIdDoesNotExistError,
+)
+from v1.settings import APP_TITLE, DEBUG_FASTAPI_APP, USE_ASYNC_DATABASE, db_replica_infos
+from v1.views.async_auth import router as async_auth_router
+from v1.views.async_users import router as async_user_router
+from v1.views.auth import router as auth_router
 from v1.views.health_check import router as health_check_router
+from v1.views.metrics import router as metrics_router
+from v1.views.responses import FastJSONResponse
 from v1.views.users import router as user_router
 
-# Main app and versions
-main_app = FastAPI(title=APP_TITLE, version="1.0.0", lifespan=lifespans, debug=DEBUG_FASTAPI_APP)
+API_V1_PREFIX = "/api/v1"
+
+
+def create_app(*, use_async_database: bool = USE_ASYNC_DATABASE) -> FastAPI:
+    """Return the math quiz FastAPI app.
+
+    Keyword arguments:
+    use_async_database -- serve the async user and authentication endpoints rather than the sync ones
+        (default USE_ASYNC_DATABASE)
+    """
+    # Main app and versions
+    app = FastAPI(
+        title=APP_TITLE,
+        version="1.0.0",
+        lifespan=lifespans,
+        debug=DEBUG_FASTAPI_APP,
+        default_response_class=FastJSONResponse,
+    )
+
+    # Lifespans read which database engine serves the app from the app state
+    app.state.use_async_database = use_async_database
+
+    # API v1 routes
+    v1_router = APIRouter(prefix=API_V1_PREFIX)
+    v1_router.include_router(health_check_router)
+    v1_router.include_router(async_auth_router if use_async_database else auth_router)
+    v1_router.include_router(async_user_router if use_async_database else user_router)
+
+    # Main app routes
+    app.include_router(health_check_router)
+    app.include_router(metrics_router)
+    app.include_router(v1_router)
+
+    # Middlewares
+    if db_replica_infos:
+        app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    # Added last, so it is the outermost middleware and its latency includes the other middlewares
+    app.add_middleware(RequestMetricsMiddleware)
 
-# API v1 routes
-v1_router = APIRouter(prefix="/api/v1")
-v1_router.include_router(health_check_router)
-v1_router.include_router(user_router)
+    # Exceptions
+    app.exception_handler(UserAlreadyExistsError)(user_already_exists_exception_handler)
+    app.exception_handler(UserEmailUndeliverableError)(user_email_undeliverable_exception_handler)
+    app.exception_handler(UserIdDoesNotExistError)(user_id_does_not_exist_exception_handler)
+    app.exception_handler(UserHasBeenPreviouslyDeletedError)(user_has_been_previously_deleted_exception_handler)
+    app.exception_handler(InvalidCursorError)(invalid_cursor_exception_handler)
+    app.exception_handler(PasswordHashingPoolFullError)(password_hashing_pool_full_exception_handler)
+    app.exception_handler(IncorrectLoginError)(incorrect_login_exception_handler)
+    app.exception_handler(InvalidAccessTokenError)(invalid_access_token_exception_handler)
+    return app
 
-# Main app routes
-main_app.include_router(health_check_router)
-main_app.include_router(v1_router)
 
-# Exceptions
-main_app.exception_handler(UserAlreadyExistsError)(user_already_exists_exception_handler)
-main_app.exception_handler(UserIdDoesNotExistError)(user_id_does_not_exist_exception_handler)
-main_app.exception_handler(UserHasBeenPreviouslyDeletedError)(user_has_been_previously_deleted_exception_handler)
+main_app = create_app()
@@ -0,0 +1,15 @@
+"""FastAPI access token lifespans."""
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from v1.services.access_tokens import get_access_token_key_set
+
+
+@asynccontextmanager
+async def access_token_key_set_lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    """Load the access token signing keys on startup, so the app fails to start if they are missing or not valid."""
+    get_access_token_key_set()
+    yield
@@ -1,6 +1,6 @@
 """All FastAPI lifespans.
 
-If there are more than 3 lifespans, then we would want to use a lifespan manager. For ideas, see:
+If there are many more lifespans, then we would want to use a lifespan manager. For ideas, see:
 - https://github.com/tiangolo/fastapi/discussions/9397
 - https://github.com/uriyyo/fastapi-lifespan-manager
 """
@@ -10,7 +10,10 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from v1.api_infra.lifespans.access_tokens import access_token_key_set_lifespan
 from v1.api_infra.lifespans.database import database_connection_lifespan
+from v1.api_infra.lifespans.password_hashing import password_hashing_pool_lifespan
+from v1.api_infra.lifespans.user_cache import user_cache_invalidation_lifespan
 
 
 @asynccontextmanager
@@ -19,5 +22,10 @@ async def lifespans(app: FastAPI) -> AsyncGenerator[None, None]:
 
     See https://fastapi.tiangolo.com/advanced/events/ for details.
     """
-    async with database_connection_lifespan(app):
+    async with (
+        access_token_key_set_lifespan(app),
+        database_connection_lifespan(app),
+        password_hashing_pool_lifespan(app),
+        user_cache_invalidation_lifespan(app),
+    ):
         yield
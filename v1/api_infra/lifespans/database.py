@@ -1,16 +1,58 @@
 """FastAPI database lifespans."""
 
+import asyncio
+import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from v1.database.connections import db_engine
+from v1.database.connections import (
+    get_created_engines,
+    get_db_async_engine,
+    get_db_async_replica_engines,
+    get_db_engine,
+    get_db_replica_engines,
+    get_replica_lag_monitor,
+)
+from v1.database.pools import warm_up_async_pool, warm_up_pool
+from v1.settings import DATABASE_POOL_WARMUP_SIZE, USE_ASYNC_DATABASE
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def database_connection_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Attach a database connection to the FastAPI application."""
-    with db_engine.connect() as db_connection:
-        app.state.db_connection = db_connection
+    """Warm up the connection pools of the engines serving the app and monitor replica lag, while the app is running.
+
+    Only the engines serving the app are created on startup. Connections of every engine created are closed on
+    shutdown. The app does not start if the primary database is unreachable, but does if a replica is, as reads fall
+    back to the primary while the replica lag monitor finds a replica unreachable.
+    """
+    if getattr(app.state, "use_async_database", USE_ASYNC_DATABASE):
+        await warm_up_async_pool(get_db_async_engine(), DATABASE_POOL_WARMUP_SIZE)
+        for async_replica_engine in get_db_async_replica_engines():
+            try:
+                await warm_up_async_pool(async_replica_engine, DATABASE_POOL_WARMUP_SIZE)
+            except (OSError, SQLAlchemyError):
+                logger.warning("Could not warm up the pool of replica %s", async_replica_engine.url, exc_info=True)
+    else:
+        await asyncio.to_thread(warm_up_pool, get_db_engine(), DATABASE_POOL_WARMUP_SIZE)
+        for replica_engine in get_db_replica_engines():
+            try:
+                await asyncio.to_thread(warm_up_pool, replica_engine, DATABASE_POOL_WARMUP_SIZE)
+            except (OSError, SQLAlchemyError):
+                logger.warning("Could not warm up the pool of replica %s", replica_engine.url, exc_info=True)
+    replica_lag_monitor = get_replica_lag_monitor()
+    replica_lag_monitor.start()
+    try:
         yield
+    finally:
+        await replica_lag_monitor.stop()
+        for engine in get_created_engines().values():
+            if isinstance(engine, AsyncEngine):
+                await engine.dispose()
+            else:
+                await asyncio.to_thread(engine.dispose)
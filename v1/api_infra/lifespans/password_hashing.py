@@ -0,0 +1,19 @@
+"""FastAPI password hashing lifespans."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from v1.services.password_hashing import password_hashing_pool
+
+
+@asynccontextmanager
+async def password_hashing_pool_lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    """Start the password hashing worker processes on startup and stop them on shutdown."""
+    await asyncio.to_thread(password_hashing_pool.start)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(password_hashing_pool.shutdown)
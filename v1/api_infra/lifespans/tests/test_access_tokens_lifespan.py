@@ -0,0 +1,25 @@
+"""Test FastAPI access token lifespans."""
+
+import pytest
+from fastapi import FastAPI
+from pytest_mock import MockerFixture
+
+from v1.api_infra.lifespans.access_tokens import access_token_key_set_lifespan
+from v1.services.access_tokens import get_access_token_key_set
+
+
+@pytest.mark.asyncio()
+async def test_access_token_key_set_lifespan_without_keys_fails(mocker: MockerFixture):
+    """Test the app fails to start if no signing keys are set outside of debug mode."""
+    # Given
+    mocker.patch("v1.services.access_tokens.ACCESS_TOKEN_SIGNING_KEYS", "")
+    mocker.patch("v1.services.access_tokens.DEBUG_FASTAPI_APP", new=False)
+    get_access_token_key_set.cache_clear()
+
+    # When, Then
+    try:
+        with pytest.raises(ValueError, match="ACCESS_TOKEN_SIGNING_KEYS must be set"):
+            async with access_token_key_set_lifespan(FastAPI()):
+                pass
+    finally:
+        get_access_token_key_set.cache_clear()
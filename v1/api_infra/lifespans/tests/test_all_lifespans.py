@@ -14,14 +14,32 @@ async def test_lifespans(mocker: MockerFixture):
     """Test FastAPI lifespans."""
     # Setup app with mocked lifespans
     app = FastAPI()
+    mock_access_token_key_set_lifespan = mocker.patch(
+        "v1.api_infra.lifespans.all.access_token_key_set_lifespan",
+        MagicMock(AsyncMock),
+    )
     mock_database_connection_lifespan = mocker.patch(
         "v1.api_infra.lifespans.all.database_connection_lifespan",
         MagicMock(AsyncMock),
     )
+    mock_password_hashing_pool_lifespan = mocker.patch(
+        "v1.api_infra.lifespans.all.password_hashing_pool_lifespan",
+        MagicMock(AsyncMock),
+    )
+    mock_user_cache_invalidation_lifespan = mocker.patch(
+        "v1.api_infra.lifespans.all.user_cache_invalidation_lifespan",
+        MagicMock(AsyncMock),
+    )
 
     async with lifespans(app):
         # Verify that database_connection_lifespan is invoked with the app
+        mock_access_token_key_set_lifespan.assert_called_once_with(app)
         mock_database_connection_lifespan.assert_called_once_with(app)
+        mock_password_hashing_pool_lifespan.assert_called_once_with(app)
+        mock_user_cache_invalidation_lifespan.assert_called_once_with(app)
 
-    # Verify database lifespan is cleaned up properly
+    # Verify lifespans are cleaned up properly
+    mock_access_token_key_set_lifespan.return_value.__aexit__.assert_called_once()
     mock_database_connection_lifespan.return_value.__aexit__.assert_called_once()
+    mock_password_hashing_pool_lifespan.return_value.__aexit__.assert_called_once()
+    mock_user_cache_invalidation_lifespan.return_value.__aexit__.assert_called_once()
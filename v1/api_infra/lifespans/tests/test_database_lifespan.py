@@ -3,22 +3,88 @@
 import pytest
 from fastapi import FastAPI
 from pytest_mock import MockerFixture
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from v1.api_infra.lifespans.database import database_connection_lifespan
-from v1.test_fixtures.database import testing_db_engine
+from v1.database.pools import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, get_pool_stats
+from v1.test_fixtures.database import testing_db_info
 
 
 @pytest.mark.asyncio()
-async def test_database_connection_lifespan(mocker: MockerFixture):
-    """Test database connection lifespan for FastAPI."""
-    # Setup app with test database engine
+@pytest.mark.parametrize("use_async_database", [True, False], ids=["async", "sync"])
+async def test_database_connection_lifespan(mocker: MockerFixture, use_async_database: bool):
+    """Test database connection lifespan warms up the pool of the engine serving the app."""
+    # Setup app with test database engines
     app = FastAPI()
-    mocker.patch("v1.api_infra.lifespans.database.db_engine", testing_db_engine)
+    app.state.use_async_database = use_async_database
+    db_engine = create_engine(testing_db_info.url, poolclass=InstrumentedQueuePool, pool_size=2)
+    db_async_engine = create_async_engine(
+        testing_db_info.async_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=2,
+    )
+    mocker.patch("v1.api_infra.lifespans.database.get_db_engine", return_value=db_engine)
+    mocker.patch("v1.api_infra.lifespans.database.get_db_async_engine", return_value=db_async_engine)
+    mocker.patch(
+        "v1.api_infra.lifespans.database.get_created_engines",
+        return_value={"sync": db_engine, "async": db_async_engine},
+    )
+    mocker.patch("v1.api_infra.lifespans.database.DATABASE_POOL_WARMUP_SIZE", 2)
+
     async with database_connection_lifespan(app):
-        pass
+        # Verify that only the engine serving the app has idle connections
+        warmed_up_engine, other_engine = (
+            (db_async_engine, db_engine) if use_async_database else (db_engine, db_async_engine)
+        )
+        warmed_up_stats = get_pool_stats(warmed_up_engine)
+        assert warmed_up_stats is not None
+        assert warmed_up_stats.checked_in == 2
+        other_stats = get_pool_stats(other_engine)
+        assert other_stats is not None
+        assert other_stats.checked_in == 0
+
+    # Verify that the connections are closed on shutdown
+    warmed_up_stats = get_pool_stats(warmed_up_engine)
+    assert warmed_up_stats is not None
+    assert warmed_up_stats.checked_in == 0
 
-    # Verify that db_connection is in the FastAPI's app state
-    app_state = app.state.__dict__.get("_state", {})
-    assert "db_connection" in app_state
-    # Verify that connection was made and it was using the correct engine
-    assert app_state["db_connection"].engine == testing_db_engine
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("use_async_database", [True, False], ids=["async", "sync"])
+async def test_database_connection_lifespan_with_an_unreachable_replica(
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+    use_async_database: bool,
+):
+    """Test the app still starts if a replica is unreachable, as reads fall back to the primary."""
+    # Setup app with a reachable primary and an unreachable replica
+    app = FastAPI()
+    app.state.use_async_database = use_async_database
+    unreachable_url = testing_db_info.url.replace(f":{testing_db_info.port}/", ":1/")
+    unreachable_async_url = testing_db_info.async_url.replace(f":{testing_db_info.port}/", ":1/")
+    db_engine = create_engine(testing_db_info.url, poolclass=InstrumentedQueuePool, pool_size=2)
+    db_async_engine = create_async_engine(testing_db_info.async_url, poolclass=InstrumentedAsyncAdaptedQueuePool)
+    replica_engine = create_engine(unreachable_url, poolclass=InstrumentedQueuePool)
+    async_replica_engine = create_async_engine(unreachable_async_url, poolclass=InstrumentedAsyncAdaptedQueuePool)
+    mocker.patch("v1.api_infra.lifespans.database.get_db_engine", return_value=db_engine)
+    mocker.patch("v1.api_infra.lifespans.database.get_db_async_engine", return_value=db_async_engine)
+    mocker.patch("v1.api_infra.lifespans.database.get_db_replica_engines", return_value=(replica_engine,))
+    mocker.patch("v1.api_infra.lifespans.database.get_db_async_replica_engines", return_value=(async_replica_engine,))
+    mocker.patch(
+        "v1.api_infra.lifespans.database.get_created_engines",
+        return_value={
+            "sync": db_engine,
+            "async": db_async_engine,
+            "sync-replica-0": replica_engine,
+            "async-replica-0": async_replica_engine,
+        },
+    )
+    mocker.patch("v1.api_infra.lifespans.database.DATABASE_POOL_WARMUP_SIZE", 2)
+
+    async with database_connection_lifespan(app):
+        # Verify that the primary is warmed up and the replica's failure is logged
+        primary_stats = get_pool_stats(db_async_engine if use_async_database else db_engine)
+        assert primary_stats is not None
+        assert primary_stats.checked_in == 2
+        assert "Could not warm up the pool of replica" in caplog.text
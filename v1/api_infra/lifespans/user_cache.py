@@ -0,0 +1,25 @@
+"""FastAPI user cache lifespans."""
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from v1.services.user_cache_invalidation import UserCacheInvalidationListener
+from v1.settings import USER_CACHE_LISTEN_FOR_INVALIDATIONS, db_info
+
+
+@asynccontextmanager
+async def user_cache_invalidation_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """Evict users changed by any worker from this worker's user cache, while the app is running."""
+    if not USER_CACHE_LISTEN_FOR_INVALIDATIONS:
+        yield
+        return
+
+    listener = UserCacheInvalidationListener(dsn=db_info.url)
+    app.state.user_cache_invalidation_listener = listener
+    listener.start()
+    try:
+        yield
+    finally:
+        await listener.stop()
@@ -0,0 +1,75 @@
+"""Request metrics middleware.
+
+Records the latency of every HTTP request, labelled by the path template of the route which served it, so requests
+for different users share a time series.
+"""
+
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Self
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from v1.services.metrics import UNMATCHED_ROUTE, RequestMetrics, request_metrics
+
+
+class RequestMetricsMiddleware:
+    """Record the method, route, status and latency of every HTTP request."""
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Set up the middleware.
+
+        Keyword arguments:
+        app -- ASGI app to wrap
+        metrics -- metrics the requests are recorded in (default request_metrics)
+        clock -- returns the current time in seconds (default time.perf_counter)
+        """
+        self.app = app
+        self.metrics = metrics
+        self._clock = clock
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request to the app, recording it once the response has been sent or the app has failed."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = self._clock()
+        # A server error, unless the app starts a response
+        status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+
+        async def send_and_record_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            self.metrics.observe(scope["method"], get_route_path(scope), status, self._clock() - start_time)
+
+
+def get_route_path(scope: Scope) -> str:
+    """Return the path template of the route which served the request or UNMATCHED_ROUTE.
+
+    The router adds the endpoint to the scope. The same endpoint can be served at several paths (e.g. with and without
+    the API version prefix), so only the routes of that endpoint are matched against the path. Routes are served with
+    and without a trailing slash, so the trailing slash is removed, to record both in the same time series.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    routes: list[BaseRoute] = app.router.routes
+    for route in routes:
+        if getattr(route, "endpoint", None) is endpoint and route.matches(scope)[0] is not Match.NONE:
+            return route.path.rstrip("/") or "/"  # type: ignore[attr-defined]
+    return UNMATCHED_ROUTE
@@ -0,0 +1,109 @@
+"""Query stats middleware.
+
+Tracks the database statements executed by every request. The number of statements and the time spent executing them
+are sent to the client in a Server-Timing header, which browsers show alongside the request's timings. Requests which
+exceed the query budgets are logged, so endpoints which issue too many queries (e.g. N+1 queries) are noticed.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Self
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from v1.database.instrumentation import QueryStats, track_queries
+from v1.settings import (
+    DATABASE_REQUEST_QUERY_COUNT_BUDGET,
+    DATABASE_REQUEST_QUERY_SECONDS_BUDGET,
+    DATABASE_REQUEST_REPEATED_QUERY_BUDGET,
+    USE_SERVER_TIMING_HEADER,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class QueryStatsMiddleware:
+    """Track the database statements executed by every HTTP request, reporting them and logging those over budget."""
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        *,
+        query_count_budget: int = DATABASE_REQUEST_QUERY_COUNT_BUDGET,
+        query_seconds_budget: float = DATABASE_REQUEST_QUERY_SECONDS_BUDGET,
+        repeated_query_budget: int = DATABASE_REQUEST_REPEATED_QUERY_BUDGET,
+        use_server_timing_header: bool = USE_SERVER_TIMING_HEADER,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Set up the middleware.
+
+        Keyword arguments:
+        app -- ASGI app to wrap
+        query_count_budget -- requests executing more statements are logged
+            (default DATABASE_REQUEST_QUERY_COUNT_BUDGET)
+        query_seconds_budget -- requests spending more seconds executing statements are logged
+            (default DATABASE_REQUEST_QUERY_SECONDS_BUDGET)
+        repeated_query_budget -- requests executing the same statement more times are logged
+            (default DATABASE_REQUEST_REPEATED_QUERY_BUDGET)
+        use_server_timing_header -- add the Server-Timing header to responses (default USE_SERVER_TIMING_HEADER)
+        clock -- returns the current time in seconds (default time.perf_counter)
+        """
+        self.app = app
+        self.query_count_budget = query_count_budget
+        self.query_seconds_budget = query_seconds_budget
+        self.repeated_query_budget = repeated_query_budget
+        self.use_server_timing_header = use_server_timing_header
+        self._clock = clock
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request to the app, tracking the statements it executes."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = self._clock()
+        with track_queries() as query_stats:
+
+            async def send_with_server_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.use_server_timing_header:
+                    # Statements executed while streaming the response body are not included
+                    MutableHeaders(scope=message).append(
+                        SERVER_TIMING_HEADER,
+                        get_server_timing(query_stats, self._clock() - start_time),
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_server_timing)
+            finally:
+                self.log_if_over_budget(scope, query_stats)
+
+    def log_if_over_budget(self: Self, scope: Scope, query_stats: QueryStats) -> None:
+        """Log a warning if the request exceeded any of the query budgets."""
+        most_repeated_statement, most_repeated_count = query_stats.get_most_repeated_statement() or ("", 0)
+        if (
+            query_stats.count > self.query_count_budget
+            or query_stats.total_seconds > self.query_seconds_budget
+            or most_repeated_count > self.repeated_query_budget
+        ):
+            logger.warning(
+                "%s %s executed %s queries in %.3f seconds, over budget. Most repeated query (%s times): %s",
+                scope["method"],
+                scope["path"],
+                query_stats.count,
+                query_stats.total_seconds,
+                most_repeated_count,
+                most_repeated_statement,
+            )
+
+
+def get_server_timing(query_stats: QueryStats, app_seconds: float) -> str:
+    """Return the Server-Timing header value, with the database time and the total time to respond, in milliseconds."""
+    return (
+        f'db;dur={query_stats.total_seconds * 1000:.1f};desc="{query_stats.count} queries", '
+        f"app;dur={app_seconds * 1000:.1f}"
+    )
@@ -0,0 +1,74 @@
+"""Read your writes middleware.
+
+Replicas lag behind the primary, so a client reading from a replica just after writing may not see its own write.
+After a successful write, the client is given a cookie which sends its reads to the primary until every replica which
+is read from has the write, i.e. for the maximum replica lag.
+"""
+
+import math
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Self
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from v1.settings import DATABASE_REPLICA_MAX_LAG_SECONDS
+
+# Cookie holding the time (in seconds since the epoch) until which the client reads from the primary
+READ_YOUR_WRITES_COOKIE = "read_your_writes_until"
+# Methods which do not write
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """Set the read your writes cookie on the response to every successful write."""
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        sticky_seconds: float = DATABASE_REPLICA_MAX_LAG_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Set up the middleware.
+
+        Keyword arguments:
+        app -- ASGI app to wrap
+        sticky_seconds -- seconds the client reads from the primary after a write
+            (default DATABASE_REPLICA_MAX_LAG_SECONDS)
+        clock -- returns the current time in seconds since the epoch, as shared by every worker (default time.time)
+        """
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+        self._clock = clock
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request to the app, adding the cookie to the response if the request was a successful write."""
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < HTTPStatus.BAD_REQUEST:
+                sticky_until = self._clock() + self.sticky_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={sticky_until:.3f}; Max-Age={math.ceil(self.sticky_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def is_reading_own_writes(request: Request, clock: Callable[[], float] = time.time) -> bool:
+    """Return True if the client wrote recently, so it needs to read from the primary to see its writes."""
+    sticky_until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if sticky_until is None:
+        return False
+    try:
+        return float(sticky_until) > clock()
+    except ValueError:
+        return False
@@ -0,0 +1,63 @@
+"""Test request metrics middleware."""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from v1.api_infra.middlewares.metrics import RequestMetricsMiddleware
+from v1.services.metrics import UNMATCHED_ROUTE, RequestLabels, RequestMetrics
+
+
+@pytest.fixture(name="metrics")
+def fixture_metrics() -> RequestMetrics:
+    """Request metrics with a single bucket."""
+    return RequestMetrics(buckets_seconds=[1])
+
+
+@pytest.fixture(name="metrics_client")
+def fixture_metrics_client(metrics: RequestMetrics) -> TestClient:
+    """Test client of an app recording its requests in the metrics, which take 0.5 seconds each."""
+    clock_times = iter(range(1000))
+
+    def clock() -> float:
+        return next(clock_times) / 2
+
+    router = APIRouter()
+
+    @router.get("/users/{user_id}")
+    async def read_user(user_id: int) -> dict:
+        return {"id": user_id}
+
+    @router.get("/fail")
+    async def fail() -> dict:
+        raise RuntimeError
+
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(router, prefix="/api/v1")
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics, clock=clock)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_request_metrics_middleware(metrics_client: TestClient, metrics: RequestMetrics):
+    """Test requests are recorded by the path template of their route, with their status."""
+    # When
+    metrics_client.get("/users/1")
+    metrics_client.get("/users/2")
+    metrics_client.get("/api/v1/users/3")
+    metrics_client.post("/users/4")
+    metrics_client.get("/users/not-a-number")
+    metrics_client.get("/does-not-exist")
+    metrics_client.get("/fail")
+
+    # Then
+    histograms = metrics.collect()
+    assert {labels: histogram.count for labels, histogram in histograms.items()} == {
+        RequestLabels("GET", "/users/{user_id}", 200): 2,
+        RequestLabels("GET", "/api/v1/users/{user_id}", 200): 1,
+        RequestLabels("POST", "/users/{user_id}", 405): 1,
+        RequestLabels("GET", "/users/{user_id}", 422): 1,
+        RequestLabels("GET", UNMATCHED_ROUTE, 404): 1,
+        RequestLabels("GET", "/fail", 500): 1,
+    }
+    assert histograms[RequestLabels("GET", "/users/{user_id}", 200)].sum == 1.0
@@ -0,0 +1,48 @@
+"""Test query stats middleware."""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from v1.api_infra.middlewares.query_stats import QueryStatsMiddleware
+from v1.database.instrumentation import query_stats_context
+
+
+@pytest.fixture(name="query_stats_client")
+def fixture_query_stats_client() -> TestClient:
+    """Test client of an app whose endpoint records a query 5 times, for 10 milliseconds each, taking a second."""
+    clock_times = iter((0.0, 1.0))
+    app = FastAPI()
+    app.add_middleware(
+        QueryStatsMiddleware,
+        query_count_budget=5,
+        query_seconds_budget=1,
+        repeated_query_budget=4,
+        clock=lambda: next(clock_times),
+    )
+
+    @app.get("/users")
+    async def read_users() -> list:
+        query_stats = query_stats_context.get()
+        assert query_stats is not None
+        for _ in range(5):
+            query_stats.record("SELECT * FROM users WHERE id = $1", 0.01)
+        return []
+
+    return TestClient(app)
+
+
+def test_query_stats_middleware(query_stats_client: TestClient, caplog: pytest.LogCaptureFixture):
+    """Test the request's queries are reported in the Server-Timing header and logged as they are over budget."""
+    # When
+    with caplog.at_level(logging.WARNING):
+        response = query_stats_client.get("/users")
+
+    # Then
+    assert response.headers["Server-Timing"] == 'db;dur=50.0;desc="5 queries", app;dur=1000.0'
+    assert caplog.messages == [
+        "GET /users executed 5 queries in 0.050 seconds, over budget. "
+        "Most repeated query (5 times): SELECT * FROM users WHERE id = $1",
+    ]
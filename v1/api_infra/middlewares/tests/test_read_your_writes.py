@@ -0,0 +1,67 @@
+"""Test read your writes middleware."""
+
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from v1.api_infra.middlewares.read_your_writes import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesMiddleware,
+    is_reading_own_writes,
+)
+
+
+@pytest.fixture(name="read_your_writes_client")
+def fixture_read_your_writes_client() -> TestClient:
+    """Test client of an app using the read your writes middleware, whose clock is at 1000 seconds."""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=5, clock=lambda: 1000.0)
+
+    @app.get("/")
+    async def read() -> dict:
+        return {}
+
+    @app.post("/")
+    async def write() -> dict:
+        return {}
+
+    @app.post("/fail")
+    async def fail_to_write() -> dict:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+
+    return TestClient(app)
+
+
+def test_successful_writes_set_the_read_your_writes_cookie(read_your_writes_client: TestClient):
+    """Test that the cookie is only set for successful writes, until the sticky time."""
+    # When
+    read_response = read_your_writes_client.get("/")
+    write_response = read_your_writes_client.post("/")
+    failed_write_response = read_your_writes_client.post("/fail")
+
+    # Then
+    assert "Set-Cookie" not in read_response.headers
+    assert write_response.headers["Set-Cookie"] == (
+        f"{READ_YOUR_WRITES_COOKIE}=1005.000; Max-Age=5; Path=/; HttpOnly; SameSite=Lax"
+    )
+    assert "Set-Cookie" not in failed_write_response.headers
+
+
+@pytest.mark.parametrize(
+    ("cookies", "expected_is_reading_own_writes"),
+    [({}, False), ({READ_YOUR_WRITES_COOKIE: "1005.000"}, True), ({READ_YOUR_WRITES_COOKIE: "999"}, False)],
+    ids=["no-cookie", "wrote-recently", "wrote-long-ago"],
+)
+def test_is_reading_own_writes(cookies: dict[str, str], expected_is_reading_own_writes: bool):
+    """Test that a client reads its own writes until the time in the cookie."""
+    request = MagicMock(Request, cookies=cookies)
+    assert is_reading_own_writes(request, clock=lambda: 1000.0) is expected_is_reading_own_writes
+
+
+def test_is_reading_own_writes_ignores_an_invalid_cookie():
+    """Test that a client with an invalid cookie does not read from the primary."""
+    request = MagicMock(Request, cookies={READ_YOUR_WRITES_COOKIE: "not-a-time"})
+    assert is_reading_own_writes(request) is False
@@ -0,0 +1,92 @@
+"""Benchmark starting the app, as workers are started on demand when autoscaling.
+
+Each measurement starts a new Python process, so modules imported by earlier tests do not make startup look faster.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+
+To see which modules are slow to import, do:
+python -X importtime -c "import main" 2>&1 | sort -t "|" -k 2 -n | tail -30
+"""
+
+import os
+import statistics
+import subprocess  # nosec: only runs the current python executable
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_DIRPATH = Path(__file__).resolve().parents[3]
+REPEATS = 5
+# Regression thresholds. Importing the app takes ~0.9 seconds on a developer laptop, mostly importing FastAPI and
+# SQLAlchemy, and serving the first request adds ~0.1 seconds.
+MAX_IMPORT_SECONDS = 1.5
+MAX_TIME_TO_FIRST_RESPONSE_SECONDS = 2.5
+
+# Serves the first request without running the lifespans, so the database is not needed
+FIRST_RESPONSE_SCRIPT = """
+import sys
+from fastapi.testclient import TestClient
+from main import main_app
+assert TestClient(main_app).get("/health-check/live").status_code == 200
+print(",".join(sorted(name for name in ("asyncpg", "psycopg2") if name in sys.modules)))
+"""
+
+
+def run_python(*args: str, use_async_database: bool = True) -> subprocess.CompletedProcess[str]:
+    """Run python in a new process from the repo directory, serving the async or sync endpoints."""
+    return subprocess.run(  # nosec: only runs the current python executable
+        [sys.executable, *args],
+        cwd=REPO_DIRPATH,
+        env={**os.environ, "USE_ASYNC_DATABASE": str(use_async_database)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def get_import_seconds() -> float:
+    """Return the seconds taken to import the app, as reported by python -X importtime."""
+    stderr = run_python("-X", "importtime", "-c", "import main").stderr
+    # Lines are formatted as "import time: self [us] | cumulative | module"
+    main_line = next(line for line in stderr.splitlines() if line.endswith("| main"))
+    return int(main_line.split("|")[1]) / 1_000_000
+
+
+def get_time_to_first_response_seconds() -> float:
+    """Return the seconds from starting a process until the app has served its first request."""
+    start_time = time.perf_counter()
+    run_python("-c", FIRST_RESPONSE_SCRIPT)
+    return time.perf_counter() - start_time
+
+
+@pytest.mark.benchmark()
+def test_import_time():
+    """Test importing the app takes less than the regression threshold."""
+    # When
+    import_seconds = statistics.median(get_import_seconds() for _ in range(REPEATS))
+
+    # Then
+    assert import_seconds < MAX_IMPORT_SECONDS, import_seconds
+
+
+@pytest.mark.benchmark()
+def test_time_to_first_response():
+    """Test a new process serves its first request in less than the regression threshold."""
+    # When
+    time_to_first_response_seconds = statistics.median(get_time_to_first_response_seconds() for _ in range(REPEATS))
+
+    # Then
+    assert time_to_first_response_seconds < MAX_TIME_TO_FIRST_RESPONSE_SECONDS, time_to_first_response_seconds
+
+
+@pytest.mark.benchmark()
+def test_sync_database_driver_is_not_imported_when_serving_async_endpoints():
+    """Test engines are created lazily, so the sync driver is not imported when serving the async endpoints."""
+    # When
+    imported_database_drivers = run_python("-c", FIRST_RESPONSE_SCRIPT, use_async_database=True).stdout
+
+    # Then
+    assert imported_database_drivers.strip() == "asyncpg"
@@ -0,0 +1 @@
+"""Command line utilities for operating the math quiz backend."""
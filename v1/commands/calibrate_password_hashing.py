@@ -0,0 +1,106 @@
+"""Calibrate argon2 password hashing parameters for the current machine.
+
+Memory cost and parallelism are kept fixed, while time cost is increased until hashing a password takes as long as
+the target latency. Run on the same hardware as the server, e.g.:
+
+    python -m v1.commands.calibrate_password_hashing --target-ms 250
+"""
+
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Self
+
+from argon2 import PasswordHasher
+
+from v1.settings import PASSWORD_HASHING_MEMORY_COST_KIB, PASSWORD_HASHING_PARALLELISM
+
+# Password used to measure hashing latency. Argon2 latency does not depend on the password.
+CALIBRATION_PASSWORD = "CalibrationPassword123!"  # nosec: hardcoded_password_string
+# Upper bound for the time cost search, so a very high target cannot loop for ever
+MAX_TIME_COST = 100
+
+
+@dataclass(frozen=True)
+class Argon2Calibration:
+    """Calibrated argon2 parameters and the measured latency of hashing a password with them."""
+
+    time_cost: int
+    memory_cost_kib: int
+    parallelism: int
+    latency_seconds: float
+
+    def to_env(self: Self) -> str:
+        """Return the parameters as lines for the .env file."""
+        return (
+            f'PASSWORD_HASHING_TIME_COST = "{self.time_cost}"\n'
+            f'PASSWORD_HASHING_MEMORY_COST_KIB = "{self.memory_cost_kib}"\n'
+            f'PASSWORD_HASHING_PARALLELISM = "{self.parallelism}"'
+        )
+
+
+def measure_hashing_latency(password_hasher: PasswordHasher, samples: int) -> float:
+    """Return the median number of seconds the password hasher takes to hash a password."""
+    latencies = []
+    for _ in range(samples):
+        start_time = time.perf_counter()
+        password_hasher.hash(CALIBRATION_PASSWORD)
+        latencies.append(time.perf_counter() - start_time)
+    return statistics.median(latencies)
+
+
+def calibrate_argon2_parameters(
+    target_seconds: float,
+    memory_cost_kib: int = PASSWORD_HASHING_MEMORY_COST_KIB,
+    parallelism: int = PASSWORD_HASHING_PARALLELISM,
+    samples: int = 5,
+) -> Argon2Calibration:
+    """Return the highest time cost which hashes a password within the target latency.
+
+    Time cost is at least 1, even if that exceeds the target latency. In that case, lower the memory cost.
+
+    Keyword arguments:
+    target_seconds -- maximum number of seconds hashing a single password should take
+    memory_cost_kib -- argon2 memory cost in kibibytes (default PASSWORD_HASHING_MEMORY_COST_KIB)
+    parallelism -- argon2 number of lanes (default PASSWORD_HASHING_PARALLELISM)
+    samples -- number of hashes used to measure the latency of each time cost (default 5)
+    """
+
+    def measure_time_cost(time_cost: int) -> Argon2Calibration:
+        password_hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost_kib, parallelism=parallelism)
+        latency_seconds = measure_hashing_latency(password_hasher, samples)
+        return Argon2Calibration(time_cost, memory_cost_kib, parallelism, latency_seconds)
+
+    calibration = measure_time_cost(1)
+    for time_cost in range(2, MAX_TIME_COST + 1):
+        if calibration.latency_seconds > target_seconds:
+            break
+        next_calibration = measure_time_cost(time_cost)
+        if next_calibration.latency_seconds > target_seconds:
+            break
+        calibration = next_calibration
+    return calibration
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Calibrate argon2 parameters and print them as .env settings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250, help="target hashing latency in milliseconds")
+    parser.add_argument("--memory-cost-kib", type=int, default=PASSWORD_HASHING_MEMORY_COST_KIB)
+    parser.add_argument("--parallelism", type=int, default=PASSWORD_HASHING_PARALLELISM)
+    parser.add_argument("--samples", type=int, default=5, help="number of hashes measured for each time cost")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate_argon2_parameters(
+        target_seconds=args.target_ms / 1000,
+        memory_cost_kib=args.memory_cost_kib,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+    print(f"# Hashing a password takes {calibration.latency_seconds * 1000:.0f} ms with these settings")  # noqa: T201
+    print(calibration.to_env())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""Load test the users API.
+
+Boots the app with uvicorn against a throwaway database, seeds it with users and then replays weighted scenarios
+(signup, read, list with paging, patch and delete) from concurrent virtual users for a fixed duration. Throughput,
+latency percentiles and error rates are written as a JSON report.
+
+The throwaway database is cloned from the template database of the current schema (see the database templates module)
+on the database server configured in the environment, and dropped afterwards. So each run starts from the same empty
+tables and leaves the configured database untouched. An app which is already running can be load tested with
+--base-url instead, in which case the seeded and signed up users are left in its database.
+
+A report can be saved as a baseline. Later runs compared with the baseline fail if throughput drops, or p99 latency
+rises, by more than the tolerance, or if the error rate rises. Compare runs on the same hardware, e.g.:
+
+    python -m v1.commands.load_test --concurrency 20 --duration-seconds 30 --save-baseline
+    python -m v1.commands.load_test --concurrency 20 --duration-seconds 30 --tolerance 0.2
+
+Signing up hashes a password, so signup throughput is bound by the password hashing parameters.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess  # nosec: only runs the current python executable
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Self
+from uuid import uuid4
+
+import httpx
+from sqlalchemy_utils import drop_database
+
+from v1.database.templates import create_db_from_template, get_template_db_info, get_template_db_name_prefix
+from v1.schemas.database import DatabaseInfo
+from v1.settings import db_info
+
+REPO_DIRPATH = Path(__file__).resolve().parents[2]
+LOAD_TESTS_DIRPATH = REPO_DIRPATH / "data" / "load_tests"
+DEFAULT_REPORT_FILEPATH = LOAD_TESTS_DIRPATH / "reports" / "latest.json"
+DEFAULT_BASELINE_FILEPATH = LOAD_TESTS_DIRPATH / "baselines" / "users_api.json"
+USERS_PATH = "/api/v1/users"
+READINESS_PATH = "/health-check/ready"
+# Users created before the load test starts, so reads, lists and patches have users to work with
+DEFAULT_SEED_USERS = 500
+# Maximum number of users created per bulk create request (see BULK_CREATE_USERS_LIMIT)
+SEED_USERS_BATCH_SIZE = 1000
+LIST_PAGE_SIZE = 20
+LIST_PAGES = 3
+PASSWORD = "LoadTestPassword123!"  # nosec: hardcoded_password_string
+# Name of the stats of all requests combined
+TOTAL = "total"
+PERCENTILES = (50, 90, 95, 99)
+# Allowed absolute increase in error rate over the baseline
+ERROR_RATE_TOLERANCE = 0.01
+
+
+@dataclass
+class RequestRecorder:
+    """Latencies and failures of the requests made during a load test, by request name."""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    error_counts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self: Self, name: str, latency_seconds: float, *, is_error: bool) -> None:
+        """Record a request and whether it failed."""
+        self.latencies[name].append(latency_seconds)
+        if is_error:
+            self.error_counts[name] += 1
+
+
+@dataclass
+class ScenarioContext:
+    """State shared by the scenarios of a load test."""
+
+    client: httpx.AsyncClient
+    recorder: RequestRecorder
+    rng: random.Random
+    # Users which exist for the whole load test, i.e. which no scenario deletes
+    user_ids: list[str]
+
+    async def request(
+        self: Self,
+        name: str,
+        method: str,
+        url: str,
+        expected_status: int,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response | None:
+        """Make a timed request, recording it under the name, and return the response or None if the request failed.
+
+        Keyword arguments:
+        name -- name the request is recorded under, e.g. the scenario step
+        method -- HTTP method
+        url -- URL relative to the client's base URL
+        expected_status -- responses with any other status are recorded as errors
+        kwargs -- passed on to httpx.AsyncClient.request
+        """
+        start_time = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(name, time.perf_counter() - start_time, is_error=True)
+            return None
+        is_error = response.status_code != expected_status
+        self.recorder.record(name, time.perf_counter() - start_time, is_error=is_error)
+        return None if is_error else response
+
+
+def get_new_user_payload() -> dict[str, Any]:
+    """Return the request body to create a user with a unique email."""
+    return {
+        "first_name": "Load",
+        "last_name": "Test",
+        "email": f"load.test.{uuid4().hex}@gmail.com",
+        "is_superuser": False,
+        "password": PASSWORD,
+    }
+
+
+async def signup(context: ScenarioContext) -> None:
+    """Create a user."""
+    await context.request("signup", "POST", f"{USERS_PATH}/", 201, json=get_new_user_payload())
+
+
+async def read(context: ScenarioContext) -> None:
+    """Read an existing user."""
+    await context.request("read", "GET", f"{USERS_PATH}/{context.rng.choice(context.user_ids)}", 200)
+
+
+async def list_with_paging(context: ScenarioContext) -> None:
+    """List users, following the next cursor for a few pages."""
+    params = {"limit": LIST_PAGE_SIZE}
+    for _ in range(LIST_PAGES):
+        response = await context.request("list", "GET", f"{USERS_PATH}/", 200, params=params)
+        if response is None or "X-Next-Cursor" not in response.headers:
+            return
+        params = {"limit": LIST_PAGE_SIZE, "cursor": response.headers["X-Next-Cursor"]}
+
+
+async def patch(context: ScenarioContext) -> None:
+    """Update the name of an existing user."""
+    user_id = context.rng.choice(context.user_ids)
+    await context.request("patch", "PATCH", f"{USERS_PATH}/{user_id}", 200, json={"first_name": uuid4().hex[:8]})
+
+
+async def delete(context: ScenarioContext) -> None:
+    """Create a user and delete it, so the users read by other scenarios are not deleted."""
+    response = await context.request("delete_signup", "POST", f"{USERS_PATH}/", 201, json=get_new_user_payload())
+    if response is not None:
+        await context.request("delete", "DELETE", f"{USERS_PATH}/{response.json()['id']}", 200)
+
+
+Scenario = Callable[[ScenarioContext], Awaitable[None]]
+SCENARIOS: dict[str, Scenario] = {
+    "signup": signup,
+    "read": read,
+    "list": list_with_paging,
+    "patch": patch,
+    "delete": delete,
+}
+# Relative frequency of each scenario, i.e. mostly reads
+DEFAULT_SCENARIO_WEIGHTS = {"signup": 1, "read": 10, "list": 5, "patch": 2, "delete": 1}
+
+
+@dataclass(frozen=True)
+class RequestStats:
+    """Throughput, latency percentiles and error rate of a kind of request during a load test."""
+
+    count: int
+    error_count: int
+    error_rate: float
+    requests_per_second: float
+    # Latency percentiles in milliseconds, keyed by "p50", "p90", etc.
+    latency_ms: dict[str, float]
+
+    @classmethod
+    def from_latencies(cls: type[Self], latencies: list[float], error_count: int, duration_seconds: float) -> Self:
+        """Return the stats of requests which took the given seconds, over a load test of the given duration."""
+        sorted_latencies = sorted(latencies)
+        latency_ms = {
+            f"p{percentile}": get_percentile(sorted_latencies, percentile) * 1000 for percentile in PERCENTILES
+        }
+        latency_ms["max"] = sorted_latencies[-1] * 1000 if sorted_latencies else 0.0
+        return cls(
+            count=len(latencies),
+            error_count=error_count,
+            error_rate=error_count / len(latencies) if latencies else 0.0,
+            requests_per_second=round(len(latencies) / duration_seconds, 3),
+            latency_ms={name: round(value, 3) for name, value in latency_ms.items()},
+        )
+
+
+@dataclass(frozen=True)
+class LoadTestReport:
+    """Result of a load test, with the stats of all requests combined and by request name."""
+
+    concurrency: int
+    duration_seconds: float
+    scenario_weights: dict[str, int]
+    requests: dict[str, RequestStats]
+
+    @classmethod
+    def from_recorder(
+        cls: type[Self],
+        recorder: RequestRecorder,
+        concurrency: int,
+        duration_seconds: float,
+        scenario_weights: dict[str, int],
+    ) -> Self:
+        """Return the report of the requests recorded during a load test."""
+        requests = {
+            name: RequestStats.from_latencies(latencies, recorder.error_counts[name], duration_seconds)
+            for name, latencies in sorted(recorder.latencies.items())
+        }
+        requests[TOTAL] = RequestStats.from_latencies(
+            [latency for latencies in recorder.latencies.values() for latency in latencies],
+            sum(recorder.error_counts.values()),
+            duration_seconds,
+        )
+        return cls(concurrency, round(duration_seconds, 3), scenario_weights, requests)
+
+    @classmethod
+    def from_dict(cls: type[Self], report: dict[str, Any]) -> Self:
+        """Return the report loaded from JSON."""
+        requests = {name: RequestStats(**stats) for name, stats in report["requests"].items()}
+        return cls(report["concurrency"], report["duration_seconds"], report["scenario_weights"], requests)
+
+    def to_dict(self: Self) -> dict[str, Any]:
+        """Return the report as a dictionary which can be dumped to JSON."""
+        return asdict(self)
+
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float:
+    """Return the percentile of the sorted values using the nearest rank method, or 0 if there are no values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def compare_with_baseline(report: LoadTestReport, baseline: LoadTestReport, tolerance: float) -> list[str]:
+    """Return a description of each regression of the report compared with the baseline.
+
+    A kind of request regresses if its throughput drops or its p99 latency rises by more than the tolerance (a fraction
+    of the baseline), or if its error rate rises by more than ERROR_RATE_TOLERANCE.
+    """
+    regressions = []
+    for name, baseline_stats in baseline.requests.items():
+        stats = report.requests.get(name)
+        if stats is None:
+            regressions.append(f"{name}: no requests were made")
+            continue
+        if stats.requests_per_second < baseline_stats.requests_per_second * (1 - tolerance):
+            regressions.append(
+                f"{name}: {stats.requests_per_second:.1f} requests per second, "
+                f"baseline {baseline_stats.requests_per_second:.1f}",
+            )
+        if stats.latency_ms["p99"] > baseline_stats.latency_ms["p99"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 latency {stats.latency_ms['p99']:.1f} ms, baseline {baseline_stats.latency_ms['p99']:.1f} ms",
+            )
+        if stats.error_rate > baseline_stats.error_rate + ERROR_RATE_TOLERANCE:
+            regressions.append(f"{name}: error rate {stats.error_rate:.2%}, baseline {baseline_stats.error_rate:.2%}")
+    return regressions
+
+
+async def seed_users(client: httpx.AsyncClient, number_of_users: int) -> list[str]:
+    """Create the users with bulk create requests and return their ids."""
+    user_ids = []
+    for batch_start in range(0, number_of_users, SEED_USERS_BATCH_SIZE):
+        batch_size = min(SEED_USERS_BATCH_SIZE, number_of_users - batch_start)
+        users = [get_new_user_payload() for _ in range(batch_size)]
+        response = await client.post(f"{USERS_PATH}/bulk", json={"users": users}, timeout=None)
+        response.raise_for_status()
+        user_ids.extend(result["user"]["id"] for result in response.json() if result["user"] is not None)
+    return user_ids
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    *,
+    concurrency: int,
+    duration_seconds: float,
+    scenario_weights: dict[str, int] = DEFAULT_SCENARIO_WEIGHTS,
+    number_of_seed_users: int = DEFAULT_SEED_USERS,
+    seed: int | None = None,
+) -> LoadTestReport:
+    """Seed users, then replay randomly picked scenarios from concurrent virtual users and return the report.
+
+    Keyword arguments:
+    client -- client of the app being load tested
+    concurrency -- number of virtual users, each running one scenario at a time
+    duration_seconds -- virtual users start new scenarios until this many seconds have passed
+    scenario_weights -- relative frequency of each scenario (default DEFAULT_SCENARIO_WEIGHTS)
+    number_of_seed_users -- number of users created before the load test (default DEFAULT_SEED_USERS)
+    seed -- seed of the random scenario picks, to replay the same scenarios (default None)
+    """
+    scenarios = [SCENARIOS[name] for name in scenario_weights]
+    weights = list(scenario_weights.values())
+    context = ScenarioContext(
+        client=client,
+        recorder=RequestRecorder(),
+        rng=random.Random(seed),  # noqa: S311 # nosec: not used for security
+        user_ids=await seed_users(client, number_of_seed_users),
+    )
+
+    start_time = time.perf_counter()
+    deadline = start_time + duration_seconds
+
+    async def run_virtual_user() -> None:
+        while time.perf_counter() < deadline:
+            await context.rng.choices(scenarios, weights)[0](context)
+
+    await asyncio.gather(*(run_virtual_user() for _ in range(concurrency)))
+    return LoadTestReport.from_recorder(
+        context.recorder,
+        concurrency,
+        time.perf_counter() - start_time,
+        scenario_weights,
+    )
+
+
+@contextmanager
+def create_load_test_db(
+    server_db_info: DatabaseInfo,
+    template_db_info: DatabaseInfo,
+    template_db_name_prefix: str,
+) -> Iterator[str]:
+    """Create a throwaway database with the schema and yield its name, dropping the database afterwards.
+
+    Keyword arguments:
+    server_db_info -- database whose server the throwaway database is created on
+    template_db_info -- template database of the current schema, which is cloned
+    template_db_name_prefix -- prefix of the names of all template databases,
+        those not for the current schema are dropped
+    """
+    load_test_db_info = server_db_info.model_copy(update={"name": f"load-test-{uuid4().hex}"})
+    create_db_from_template(load_test_db_info, template_db_info, template_db_name_prefix)
+    try:
+        yield load_test_db_info.name
+    finally:
+        drop_database(load_test_db_info.url)
+
+
+@contextmanager
+def run_server(
+    host: str,
+    port: int,
+    workers: int,
+    env: dict[str, str],
+    startup_timeout_seconds: float = 30,
+) -> Iterator[str]:
+    """Run the app with uvicorn in a new process and yield its base URL once it is ready to serve requests.
+
+    Keyword arguments:
+    host -- host the app listens on
+    port -- port the app listens on
+    workers -- number of uvicorn worker processes
+    env -- environment variables of the app, i.e. its settings
+    startup_timeout_seconds -- seconds to wait for the app to be ready to serve requests (default 30)
+    """
+    base_url = f"http://{host}:{port}"
+    server = subprocess.Popen(  # nosec: only runs the current python executable
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:main_app",
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+        ],
+        cwd=REPO_DIRPATH,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + startup_timeout_seconds
+        while not is_server_ready(base_url):
+            if server.poll() is not None or time.monotonic() > deadline:
+                msg = f"App did not start serving requests at {base_url}"
+                raise RuntimeError(msg)
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def is_server_ready(base_url: str) -> bool:
+    """Return True if the app at the base URL is ready to serve requests."""
+    try:
+        return httpx.get(f"{base_url}{READINESS_PATH}").status_code == httpx.codes.OK
+    except httpx.HTTPError:
+        return False
+
+
+def parse_scenario_weights(weights: str) -> dict[str, int]:
+    """Return the scenario weights from a string such as "read=10,list=5"."""
+    scenario_weights = {}
+    for weight in weights.split(","):
+        name, _, value = weight.partition("=")
+        if name.strip() not in SCENARIOS:
+            msg = f"Unknown scenario {name.strip()!r}, choose from {', '.join(SCENARIOS)}"
+            raise argparse.ArgumentTypeError(msg)
+        scenario_weights[name.strip()] = int(value)
+    return scenario_weights
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the load test, write the report and fail if performance regressed compared with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--base-url",
+        help="load test an app which is already running, and its database, rather than one with a throwaway database",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="number of uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=10, help="number of virtual users")
+    parser.add_argument("--duration-seconds", type=float, default=30)
+    parser.add_argument("--seed-users", type=int, default=DEFAULT_SEED_USERS, help="number of users created first")
+    parser.add_argument(
+        "--scenario-weights",
+        type=parse_scenario_weights,
+        default=DEFAULT_SCENARIO_WEIGHTS,
+        help=f"e.g. {','.join(f'{name}={weight}' for name, weight in DEFAULT_SCENARIO_WEIGHTS.items())}",
+    )
+    parser.add_argument("--seed", type=int, help="seed of the random scenario picks")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT_FILEPATH)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_FILEPATH)
+    parser.add_argument("--save-baseline", action="store_true", help="save the report as the baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="fraction by which throughput may drop, or p99 latency may rise, before failing",
+    )
+    args = parser.parse_args(argv)
+
+    async def run(base_url: str) -> LoadTestReport:
+        async with httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            return await run_load_test(
+                client,
+                concurrency=args.concurrency,
+                duration_seconds=args.duration_seconds,
+                scenario_weights=args.scenario_weights,
+                number_of_seed_users=args.seed_users,
+                seed=args.seed,
+            )
+
+    if args.base_url:
+        report = asyncio.run(run(args.base_url))
+    else:
+        with (
+            create_load_test_db(
+                db_info,
+                get_template_db_info(db_info),
+                get_template_db_name_prefix(db_info.name),
+            ) as db_name,
+            run_server(args.host, args.port, args.workers, env={**os.environ, "DATABASE_NAME": db_name}) as base_url,
+        ):
+            report = asyncio.run(run(base_url))
+
+    report_json = json.dumps(report.to_dict(), indent=2)
+    print(report_json)  # noqa: T201
+    for filepath in (args.report, args.baseline) if args.save_baseline else (args.report,):
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(f"{report_json}\n")
+
+    if not args.save_baseline and args.baseline.exists():
+        baseline = LoadTestReport.from_dict(json.loads(args.baseline.read_text()))
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressed compared with the baseline:", *regressions, sep="\n  ")  # noqa: T201
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Test argon2 password hashing calibration command."""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from v1.commands.calibrate_password_hashing import calibrate_argon2_parameters, main
+
+
+@pytest.mark.parametrize(
+    ("target_seconds", "expected_time_cost"),
+    [(0.0, 1), (0.35, 3), (0.45, 4), (10, 4)],
+)
+def test_calibrate_argon2_parameters(mocker: MockerFixture, target_seconds: float, expected_time_cost: int):
+    """Test calibration picks the highest time cost within the target latency, but never less than 1."""
+    # Given hashing takes 0.1 seconds per unit of time cost, up to a maximum time cost of 4
+    mocker.patch("v1.commands.calibrate_password_hashing.MAX_TIME_COST", 4)
+    mocker.patch(
+        "v1.commands.calibrate_password_hashing.measure_hashing_latency",
+        side_effect=lambda password_hasher, _samples: password_hasher.time_cost / 10,
+    )
+
+    # When
+    calibration = calibrate_argon2_parameters(target_seconds, memory_cost_kib=1024, parallelism=2)
+
+    # Then
+    assert calibration.time_cost == expected_time_cost
+    assert calibration.latency_seconds == pytest.approx(expected_time_cost / 10)
+    assert calibration.memory_cost_kib == 1024
+    assert calibration.parallelism == 2
+
+
+def test_main(capsys: pytest.CaptureFixture[str]):
+    """Test calibration command prints the calibrated parameters as .env settings."""
+    main(["--target-ms", "1", "--memory-cost-kib", "1024", "--parallelism", "1", "--samples", "1"])
+
+    output = capsys.readouterr().out
+    settings = dict(line.replace('"', "").split(" = ") for line in output.splitlines() if not line.startswith("#"))
+    assert settings == {
+        "PASSWORD_HASHING_TIME_COST": "1",
+        "PASSWORD_HASHING_MEMORY_COST_KIB": "1024",
+        "PASSWORD_HASHING_PARALLELISM": "1",
+    }
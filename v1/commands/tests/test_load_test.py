@@ -0,0 +1,172 @@
+"""Test users API load testing command."""
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import NullPool, create_engine, func, select
+from sqlalchemy_utils import database_exists
+
+from v1.commands.load_test import (
+    TOTAL,
+    LoadTestReport,
+    RequestStats,
+    compare_with_baseline,
+    create_load_test_db,
+    get_percentile,
+    main,
+    run_load_test,
+)
+from v1.database.models.users import User
+from v1.test_fixtures.database import testing_db_info, testing_template_db_info, testing_template_db_name_prefix
+
+
+def get_report(requests_per_second: float, p99_ms: float, error_rate: float) -> LoadTestReport:
+    """Return a load test report where all requests are read requests with the given stats."""
+    stats = RequestStats(
+        count=100,
+        error_count=int(error_rate * 100),
+        error_rate=error_rate,
+        requests_per_second=requests_per_second,
+        latency_ms={"p50": p99_ms / 2, "p90": p99_ms, "p95": p99_ms, "p99": p99_ms, "max": p99_ms},
+    )
+    return LoadTestReport(concurrency=10, duration_seconds=10, scenario_weights={"read": 1}, requests={"read": stats})
+
+
+def handle_users_api_request(request: httpx.Request) -> httpx.Response:
+    """Respond to the users API requests made by the load test scenarios, failing every patch request."""
+    if request.method == "POST" and request.url.path.endswith("/bulk"):
+        users = json.loads(request.content)["users"]
+        return httpx.Response(200, json=[{"user": {"id": str(uuid4())}} for _ in users])
+    if request.method == "POST":
+        return httpx.Response(201, json={"id": str(uuid4())})
+    if request.method == "PATCH":
+        return httpx.Response(500)
+    if "cursor" not in request.url.params and request.url.path.endswith("/users/"):
+        return httpx.Response(200, json=[], headers={"X-Next-Cursor": "next"})
+    return httpx.Response(200, json=[])
+
+
+@pytest.mark.parametrize(
+    ("percentile", "expected_value"),
+    [(50, 5), (90, 9), (99, 10), (100, 10), (1, 1)],
+)
+def test_get_percentile(percentile: float, expected_value: float):
+    """Test percentiles are picked from the values using the nearest rank method."""
+    assert get_percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], percentile) == expected_value
+    assert get_percentile([], percentile) == 0
+
+
+@pytest.mark.asyncio()
+async def test_run_load_test():
+    """Test load test replays every scenario and records the throughput, latency and errors of each request."""
+    # Given
+    transport = httpx.MockTransport(handle_users_api_request)
+
+    # When
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        report = await run_load_test(client, concurrency=3, duration_seconds=0.2, number_of_seed_users=5, seed=1)
+
+    # Then
+    assert set(report.requests) == {"signup", "read", "list", "patch", "delete_signup", "delete", TOTAL}
+    assert report.requests["patch"].error_rate == 1
+    assert report.requests["read"].error_rate == 0
+    assert report.requests[TOTAL].count == sum(stats.count for name, stats in report.requests.items() if name != TOTAL)
+    assert report.requests[TOTAL].error_count == report.requests["patch"].count
+    assert report.requests[TOTAL].requests_per_second > 0
+    assert LoadTestReport.from_dict(json.loads(json.dumps(report.to_dict()))) == report
+
+
+@pytest.mark.parametrize(
+    ("report", "expected_regressions"),
+    [
+        (get_report(requests_per_second=95, p99_ms=110, error_rate=0.005), []),
+        (
+            get_report(requests_per_second=85, p99_ms=100, error_rate=0),
+            ["read: 85.0 requests per second, baseline 100.0"],
+        ),
+        (
+            get_report(requests_per_second=100, p99_ms=120, error_rate=0),
+            ["read: p99 latency 120.0 ms, baseline 100.0 ms"],
+        ),
+        (get_report(requests_per_second=100, p99_ms=100, error_rate=0.02), ["read: error rate 2.00%, baseline 0.00%"]),
+    ],
+)
+def test_compare_with_baseline(report: LoadTestReport, expected_regressions: list[str]):
+    """Test only throughput drops and latency rises beyond the tolerance, and error rate rises, are regressions."""
+    baseline = get_report(requests_per_second=100, p99_ms=100, error_rate=0)
+    assert compare_with_baseline(report, baseline, tolerance=0.1) == expected_regressions
+
+
+def test_main_fails_if_performance_regressed(mocker: MockerFixture, tmp_path: Path):
+    """Test the command saves a baseline, then writes the report and fails if a later run regressed."""
+    # Given
+    mocker.patch(
+        "v1.commands.load_test.run_load_test",
+        side_effect=[
+            get_report(requests_per_second=100, p99_ms=100, error_rate=0),
+            get_report(requests_per_second=50, p99_ms=100, error_rate=0),
+        ],
+    )
+    args = ["--base-url", "http://test", "--report", str(tmp_path / "report.json")]
+    args += ["--baseline", str(tmp_path / "baseline.json")]
+
+    # When
+    main([*args, "--save-baseline"])
+    with pytest.raises(SystemExit) as exc_info:
+        main(args)
+
+    # Then
+    assert exc_info.value.code == 1
+    assert json.loads((tmp_path / "baseline.json").read_text())["requests"]["read"]["requests_per_second"] == 100
+    assert json.loads((tmp_path / "report.json").read_text())["requests"]["read"]["requests_per_second"] == 50
+
+
+@pytest.mark.integration()
+def test_create_load_test_db():
+    """Test the load test database is an empty copy of the schema, which is dropped afterwards."""
+    # When
+    with create_load_test_db(testing_db_info, testing_template_db_info, testing_template_db_name_prefix) as db_name:
+        load_test_db_info = testing_db_info.model_copy(update={"name": db_name})
+        db_engine = create_engine(load_test_db_info.url, poolclass=NullPool)
+        with db_engine.connect() as db_connection:
+            number_of_users = db_connection.scalar(select(func.count()).select_from(User))
+        db_engine.dispose()
+
+    # Then
+    assert db_name != testing_db_info.name
+    assert number_of_users == 0
+    assert not database_exists(load_test_db_info.url)
+
+
+def test_main_runs_the_app_against_the_load_test_db(mocker: MockerFixture, tmp_path: Path):
+    """Test the command starts the app with the load test database, rather than the database of the environment."""
+    # Given
+    server_envs = []
+
+    @contextmanager
+    def run_server(*_args: object, env: dict[str, str]) -> Iterator[str]:
+        server_envs.append(env)
+        yield "http://test"
+
+    @contextmanager
+    def create_load_test_db(*_args: object) -> Iterator[str]:
+        yield "load-test-db"
+
+    mocker.patch("v1.commands.load_test.run_server", run_server)
+    mocker.patch("v1.commands.load_test.create_load_test_db", create_load_test_db)
+    mocker.patch(
+        "v1.commands.load_test.run_load_test",
+        return_value=get_report(requests_per_second=100, p99_ms=100, error_rate=0),
+    )
+
+    # When
+    main(["--report", str(tmp_path / "report.json"), "--baseline", str(tmp_path / "baseline.json")])
+
+    # Then
+    assert [env["DATABASE_NAME"] for env in server_envs] == ["load-test-db"]
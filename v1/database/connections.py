@@ -1,21 +1,162 @@
 """Functionality relating to database connections."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
-from v1.settings import DEBUG_DATABASE, db_info
+from v1.database.instrumentation import instrument_engine
+from v1.database.pools import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from v1.database.replicas import IS_REPLICA_SESSION, ReplicaLagMonitor, ReplicaRouter
+from v1.settings import (
+    DATABASE_POOL_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE_SECONDS,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_TIMEOUT_SECONDS,
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    DATABASE_REPLICA_MAX_LAG_SECONDS,
+    DEBUG_DATABASE,
+    db_info,
+    db_replica_infos,
+)
 
-db_engine = create_engine(url=db_info.url, echo=DEBUG_DATABASE)
-DbSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+pool_options = {
+    "pool_size": DATABASE_POOL_SIZE,
+    "max_overflow": DATABASE_POOL_MAX_OVERFLOW,
+    "pool_timeout": DATABASE_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": DATABASE_POOL_RECYCLE_SECONDS,
+    "pool_pre_ping": DATABASE_POOL_PRE_PING,
+}
+
+# Engines are created on first use, so importing the app does not import database drivers it does not use (e.g. the
+# sync driver when serving the async endpoints). Sessions are bound to an engine when they are created.
+DbSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+# Do not expire objects on commit, otherwise accessing their attributes afterwards triggers implicit (sync) IO
+AsyncDbSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+@cache
+def get_db_engine() -> Engine:
+    """Return the engine of the primary database, creating it on first use."""
+    engine = create_engine(url=db_info.url, echo=DEBUG_DATABASE, poolclass=InstrumentedQueuePool, **pool_options)
+    instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_db_async_engine() -> AsyncEngine:
+    """Return the async engine of the primary database, creating it on first use."""
+    engine = create_async_engine(
+        url=db_info.async_url,
+        echo=DEBUG_DATABASE,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **pool_options,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_db_replica_engines() -> tuple[Engine, ...]:
+    """Return the engines of the replicas, creating them on first use."""
+    engines = tuple(
+        create_engine(url=replica_info.url, echo=DEBUG_DATABASE, poolclass=InstrumentedQueuePool, **pool_options)
+        for replica_info in db_replica_infos
+    )
+    for engine in engines:
+        instrument_engine(engine)
+    return engines
+
+
+@cache
+def get_db_async_replica_engines() -> tuple[AsyncEngine, ...]:
+    """Return the async engines of the replicas, creating them on first use."""
+    engines = tuple(
+        create_async_engine(
+            url=replica_info.async_url,
+            echo=DEBUG_DATABASE,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            **pool_options,
+        )
+        for replica_info in db_replica_infos
+    )
+    for engine in engines:
+        instrument_engine(engine)
+    return engines
+
+
+@cache
+def get_replica_lag_monitor() -> ReplicaLagMonitor:
+    """Return the monitor of the replicas' lag, which queries the replicas with their async engines."""
+    return ReplicaLagMonitor(get_db_async_replica_engines(), DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+
+
+@cache
+def get_replica_router() -> ReplicaRouter[Engine]:
+    """Return the router choosing a replica engine to read from."""
+    return ReplicaRouter(get_db_replica_engines(), get_replica_lag_monitor(), DATABASE_REPLICA_MAX_LAG_SECONDS)
+
+
+@cache
+def get_async_replica_router() -> ReplicaRouter[AsyncEngine]:
+    """Return the router choosing an async replica engine to read from."""
+    return ReplicaRouter(get_db_async_replica_engines(), get_replica_lag_monitor(), DATABASE_REPLICA_MAX_LAG_SECONDS)
+
+
+def get_created_engines() -> dict[str, Engine | AsyncEngine]:
+    """Return the engines which have been created so far by name, without creating any others (e.g. to dispose them)."""
+    engines: dict[str, Engine | AsyncEngine] = {}
+    if get_db_engine.cache_info().currsize:
+        engines["sync"] = get_db_engine()
+    if get_db_async_engine.cache_info().currsize:
+        engines["async"] = get_db_async_engine()
+    if get_db_replica_engines.cache_info().currsize:
+        engines.update(
+            {f"sync-replica-{index}": engine for index, engine in enumerate(get_db_replica_engines())},
+        )
+    if get_db_async_replica_engines.cache_info().currsize:
+        engines.update(
+            {f"async-replica-{index}": engine for index, engine in enumerate(get_db_async_replica_engines())},
+        )
+    return engines
 
 
 def get_db_session() -> Generator[Session, None, None]:
     """Yield database session."""
-    db_session = DbSessionLocal()
+    db_session = DbSessionLocal(bind=get_db_engine())
     try:
         yield db_session
     finally:
         db_session.close()
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield async database session."""
+    async with AsyncDbSessionLocal(bind=get_db_async_engine()) as db_session:
+        yield db_session
+
+
+def create_read_db_session(*, prefer_primary: bool) -> Session:
+    """Return database session for reads which may be slightly stale (i.e. by up to the maximum replica lag).
+
+    The session reads from a replica which is within the maximum lag. It reads from the primary instead if there is
+    no such replica or the primary is preferred, e.g. so a client which wrote recently can read its own writes.
+    """
+    replica_engine = None if prefer_primary else get_replica_router().choose_replica()
+    return DbSessionLocal(bind=replica_engine or get_db_engine(), info={IS_REPLICA_SESSION: replica_engine is not None})
+
+
+def create_async_read_db_session(*, prefer_primary: bool) -> AsyncSession:
+    """Return async database session for reads which may be slightly stale.
+
+    See `create_read_db_session` for details.
+    """
+    replica_engine = None if prefer_primary else get_async_replica_router().choose_replica()
+    return AsyncDbSessionLocal(
+        bind=replica_engine or get_db_async_engine(),
+        info={IS_REPLICA_SESSION: replica_engine is not None},
+    )
@@ -0,0 +1,85 @@
+"""Database query instrumentation.
+
+Engines are hooked to count and time the statements they execute. Statements are recorded into the query stats of the
+current context (e.g. the current request), so each request knows how many queries it issued and how long they took.
+Statements executed outside of a tracked context are not timed.
+"""
+
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Key of the connection info holding the time the connection's current statement started
+QUERY_START_TIME = "query_start_time"
+
+
+@dataclass
+class QueryStats:
+    """Number of statements executed, the seconds spent executing them and how often each statement was executed."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    statement_counts: Counter[str] = field(default_factory=Counter)
+    # Stats of the enclosing context, which also record the statements of this context
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    def record(self: Self, statement: str, duration_seconds: float) -> None:
+        """Record an executed statement in these stats and those of every enclosing context."""
+        query_stats: QueryStats | None = self
+        while query_stats is not None:
+            query_stats.count += 1
+            query_stats.total_seconds += duration_seconds
+            query_stats.statement_counts[statement] += 1
+            query_stats = query_stats.parent
+
+    def get_most_repeated_statement(self: Self) -> tuple[str, int] | None:
+        """Return the most executed statement and its count, or None if no statements were executed.
+
+        A statement executed many times in one request usually means related rows are loaded one at a time (N+1).
+        """
+        most_common = self.statement_counts.most_common(1)
+        return most_common[0] if most_common else None
+
+
+query_stats_context: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Record the statements executed within the context into new query stats, which are yielded."""
+    query_stats = QueryStats(parent=query_stats_context.get())
+    token = query_stats_context.set(query_stats)
+    try:
+        yield query_stats
+    finally:
+        query_stats_context.reset(token)
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Record the statements executed by the engine into the query stats of the current context."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if not event.contains(sync_engine, "before_cursor_execute", _start_query_timer):
+        event.listen(sync_engine, "before_cursor_execute", _start_query_timer)
+        event.listen(sync_engine, "after_cursor_execute", _record_query)
+
+
+def _start_query_timer(db_connection: Connection, *_args: Any) -> None:  # noqa: ANN401
+    """Record the time the statement started, if it is executed within a tracked context."""
+    if query_stats_context.get() is not None:
+        db_connection.info[QUERY_START_TIME] = time.perf_counter()
+
+
+def _record_query(db_connection: Connection, _cursor: DBAPICursor, statement: str, *_args: Any) -> None:  # noqa: ANN401
+    """Record the executed statement and how long it took into the query stats of the current context."""
+    query_stats = query_stats_context.get()
+    start_time = db_connection.info.pop(QUERY_START_TIME, None)
+    if query_stats is not None and start_time is not None:
+        query_stats.record(statement, time.perf_counter() - start_time)
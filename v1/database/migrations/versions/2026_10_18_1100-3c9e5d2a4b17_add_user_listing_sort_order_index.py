@@ -0,0 +1,58 @@
+"""Add user listing sort order index.
+
+Revision ID: 3c9e5d2a4b17
+Revises: 7da01f85b708
+Create Date: 2026-10-18 11:00:12.418204+00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from sqlalchemy import text
+
+# Revision identifiers used by Alembic
+revision: str = "3c9e5d2a4b17"
+down_revision: str | None = "7da01f85b708"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX_NAME = "ix_users_first_name_users_last_name_users_id"
+
+
+def upgrade() -> None:
+    """Perform upgrade actions on the database."""
+    # Manually written code
+    # Build the index without locking writes to the table, so that it can run on a live database.
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an invalid index behind, which IF NOT EXISTS would silently keep
+        is_index_invalid = (
+            op.get_bind()
+            .execute(
+                text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index_name)"),
+                {"index_name": INDEX_NAME},
+            )
+            .scalar()
+        )
+        if is_index_invalid:
+            op.drop_index(op.f(INDEX_NAME), table_name="users", postgresql_concurrently=True)
+        op.create_index(
+            op.f(INDEX_NAME),
+            "users",
+            ["first_name", "last_name", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Perform downgrade actions on the database."""
+    # Manually written code
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f(INDEX_NAME),
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,45 @@
+"""Notify users changed.
+
+Revision ID: 8b41f0c6e2d9
+Revises: 3c9e5d2a4b17
+Create Date: 2026-10-18 13:00:47.102934+00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# Revision identifiers used by Alembic
+revision: str = "8b41f0c6e2d9"
+down_revision: str | None = "3c9e5d2a4b17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Perform upgrade actions on the database."""
+    # Manually written code
+    op.execute(
+        """CREATE OR REPLACE FUNCTION trigger_function__notify_users_changed()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM pg_notify('users_changed', COALESCE(NEW.id, OLD.id)::text);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """,
+    )
+    op.execute(
+        """CREATE TRIGGER trigger__notify_users_changed
+            AFTER INSERT OR UPDATE OR DELETE ON users
+            FOR EACH ROW
+            EXECUTE FUNCTION trigger_function__notify_users_changed();
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Perform downgrade actions on the database."""
+    # Manually written code
+    op.execute("DROP TRIGGER IF EXISTS trigger__notify_users_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS trigger_function__notify_users_changed")
@@ -1,6 +1,9 @@
 """Common factory related functionality."""
 
+from typing import Any
+
 import factory
+from factory.alchemy import SESSION_PERSISTENCE_COMMIT, SESSION_PERSISTENCE_FLUSH
 
 
 class BaseFactory(factory.alchemy.SQLAlchemyModelFactory):
@@ -10,3 +13,20 @@ class BaseFactory(factory.alchemy.SQLAlchemyModelFactory):
         """Factory boy metadata."""
 
         abstract = True
+
+    @classmethod
+    def create_batch(cls: type["BaseFactory"], size: int, **kwargs: Any) -> list[Any]:  # noqa: ANN401
+        """Create a batch of instances, which are inserted with one statement when the session is flushed.
+
+        The instances are built and added to the session together, then flushed or committed once (depending on the
+        session persistence), rather than one at a time.
+        """
+        instances = cls.build_batch(size, **kwargs)
+        session = cls._meta.sqlalchemy_session  # pylint: disable=protected-access
+        session.add_all(instances)
+        session_persistence = cls._meta.sqlalchemy_session_persistence  # pylint: disable=protected-access
+        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+            session.flush()
+        elif session_persistence == SESSION_PERSISTENCE_COMMIT:
+            session.commit()
+        return instances
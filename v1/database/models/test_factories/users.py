@@ -1,13 +1,24 @@
 """Test related functionality for user database model."""
 
 from datetime import datetime, timezone
+from functools import cache
 
 import factory
 import factory.fuzzy
-from argon2 import PasswordHasher
 
 from v1.database.models.test_factories.base import BaseFactory
 from v1.database.models.users import User
+from v1.services.passwords import hash_password
+
+
+@cache
+def hash_test_password(password: str) -> str:
+    """Return the hashed password, hashing each password only once.
+
+    Hashing is deliberately slow, so building many users would spend most of its time hashing the same password.
+    Users built with the same password share the same hash (and salt), which is fine for test data.
+    """
+    return hash_password(password)
 
 
 class UserFactory(BaseFactory):
@@ -25,7 +36,7 @@ class UserFactory(BaseFactory):
     email = factory.LazyAttribute(
         lambda obj: f"{obj.first_name.lower()}.{obj.last_name.lower()}.{str(obj.id).replace('-', '')}@gmail.com",
     )
-    hashed_password = factory.LazyAttribute(lambda obj: PasswordHasher().hash(obj.password))
+    hashed_password = factory.LazyAttribute(lambda obj: hash_test_password(obj.password))
     is_superuser = False
     created_at = factory.fuzzy.FuzzyDateTime(
         start_dt=datetime(2000, 1, 13, tzinfo=timezone.utc),
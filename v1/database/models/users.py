@@ -1,15 +1,25 @@
 """User database model."""
 
+from sqlalchemy import Index, event
 from sqlalchemy.orm import Mapped, mapped_column
 
 from v1.database.models.base import SqlAlchemyBase, TimeAudit
 from v1.database.models.types import ColumnTypes
+from v1.database.triggers.functions import trigger_function_notify_row_id_changed
+from v1.database.triggers.triggers import trigger_notify_row_id_changed
+
+# Postgres channel notified with the id of every user which is inserted, updated or deleted
+USERS_CHANGED_CHANNEL = "users_changed"
 
 
 class User(SqlAlchemyBase, TimeAudit):
     """User database model."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Matches the user listing sort order, so pages are read in order from the index rather than sorted
+        Index(None, "first_name", "last_name", "id"),
+    )
 
     id: Mapped[ColumnTypes.id_pk]
     first_name: Mapped[str]
@@ -17,3 +27,7 @@ class User(SqlAlchemyBase, TimeAudit):
     email: Mapped[str] = mapped_column(unique=True, index=True)
     hashed_password: Mapped[str]
     is_superuser: Mapped[bool]
+
+
+event.listen(User.__table__, "after_create", trigger_function_notify_row_id_changed(USERS_CHANGED_CHANNEL))
+event.listen(User.__table__, "after_create", trigger_notify_row_id_changed(User.__tablename__, USERS_CHANGED_CHANNEL))
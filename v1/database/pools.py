@@ -0,0 +1,151 @@
+"""Database connection pools.
+
+Pools record how long requests wait for a connection, so an undersized pool shows up in monitoring as wait time and
+timeouts, rather than only as slow requests.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Self
+
+from sqlalchemy import AsyncAdaptedQueuePool, Engine, PoolProxiedConnection, QueuePool
+from sqlalchemy import exc as sqlalchemy_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point in time metrics of a connection pool."""
+
+    # Number of connections kept open in the pool and opened beyond it under load (-1 if unlimited)
+    pool_size: int
+    max_overflow: int
+    # Number of connections in use, idle in the pool and opened beyond the pool size
+    checked_out: int
+    checked_in: int
+    overflow: int
+    # Number of connections checked out, checkouts which timed out and seconds spent waiting for them
+    checkouts: int
+    timeouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class PoolWaitStatsMixin:
+    """Record the number of checkouts, timeouts and the seconds spent waiting to check out a connection.
+
+    Waiting includes opening a new connection and pinging an idle connection (if pre-ping is enabled).
+    """
+
+    def __init__(self: Self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Set up the pool with no checkouts recorded."""
+        super().__init__(*args, **kwargs)
+        self._wait_stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def connect(self: Self) -> PoolProxiedConnection:
+        """Return a connection from the pool, recording how long it took to check out."""
+        start_time = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()  # type: ignore[misc]
+        except sqlalchemy_exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait_seconds = time.perf_counter() - start_time
+            with self._wait_stats_lock:
+                self._checkouts += 1
+                self._timeouts += timed_out
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def stats(self: Self) -> PoolStats:
+        """Return the current metrics of the pool."""
+        pool: QueuePool = self  # type: ignore[assignment]
+        with self._wait_stats_lock:
+            return PoolStats(
+                pool_size=pool.size(),
+                max_overflow=pool._max_overflow,  # noqa: SLF001
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                # The overflow counts up from minus the pool size, until the pool is full
+                overflow=max(pool.overflow(), 0),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds,
+            )
+
+
+class InstrumentedQueuePool(PoolWaitStatsMixin, QueuePool):
+    """Queue pool which records wait time, for sync engines."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(PoolWaitStatsMixin, AsyncAdaptedQueuePool):
+    """Queue pool which records wait time, for async engines."""
+
+
+def get_pool_saturation(stats: PoolStats) -> float:
+    """Return the fraction of the pool's connections in use, including those beyond the pool size.
+
+    Once the pool is saturated (1.0), requests wait for a connection until one is returned or they time out.
+    A pool with unlimited overflow is never saturated.
+    """
+    if stats.max_overflow < 0:
+        return 0.0
+    max_connections = stats.pool_size + stats.max_overflow
+    return stats.checked_out / max_connections if max_connections else 1.0
+
+
+def get_pool_stats(engine: Engine | AsyncEngine) -> PoolStats | None:
+    """Return the current metrics of the engine's pool or None if the pool is not instrumented (e.g. NullPool)."""
+    pool = engine.pool
+    return pool.stats() if isinstance(pool, PoolWaitStatsMixin) else None
+
+
+def get_warm_up_size(engine: Engine | AsyncEngine, number_of_connections: int) -> int:
+    """Return the number of connections to warm up, at most the pool size.
+
+    Connections beyond the pool size are closed when they are returned, and opening more than the pool size plus its
+    overflow would wait for a connection until the pool times out. Pools which are not queue pools (e.g. NullPool)
+    do not keep connections, so are not warmed up.
+    """
+    pool = engine.pool
+    return min(number_of_connections, pool.size()) if isinstance(pool, QueuePool) else 0
+
+
+def warm_up_pool(engine: Engine, number_of_connections: int) -> None:
+    """Open connections up front and return them to the pool, so the first requests do not wait to connect.
+
+    All of the connections are held at once, otherwise the pool would hand out the same connection each time.
+    At most the pool size is warmed up (see `get_warm_up_size`).
+    """
+    with contextlib.ExitStack() as stack:
+        for _ in range(get_warm_up_size(engine, number_of_connections)):
+            stack.enter_context(engine.connect())
+
+
+async def warm_up_async_pool(engine: AsyncEngine, number_of_connections: int) -> None:
+    """Open connections concurrently and return them to the pool, so the first requests do not wait to connect.
+
+    Every connection is opened or fails before any error is raised, so all of the connections which were opened are
+    returned to the pool. See `warm_up_pool` for details.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(
+                stack.enter_async_context(engine.connect())
+                for _ in range(get_warm_up_size(engine, number_of_connections))
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
@@ -0,0 +1,153 @@
+"""Read replica routing.
+
+Reads which can tolerate slightly stale data are sent to a replica, to take load off the primary. A background task
+polls the replication lag of every replica. Replicas lagging behind the primary by more than the maximum lag, or
+whose lag is unknown (e.g. they are down), are not used, so reads fall back to the primary.
+"""
+
+import asyncio
+import contextlib
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Generic, Self, TypeVar
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+EngineType = TypeVar("EngineType", Engine, AsyncEngine)
+
+# Seconds the replica has not replayed write ahead log it has received. Zero if it is streaming from the primary and
+# has replayed all of it, or if it is not a replica. A replica which is not streaming (e.g. it lost its connection to
+# the primary) receives nothing, so having replayed everything it received does not mean it is up to date; its lag is
+# then the time since it last replayed a transaction. NULL if the lag is unknown, e.g. the replica has not replayed any
+# transactions since it started. The status of the WAL receiver is only visible to roles with pg_read_all_stats.
+REPLICATION_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """,
+)
+# Key of the session info which is True if the session reads from a replica
+IS_REPLICA_SESSION = "is_replica"
+# Number of missed checks after which the last lag of a replica is no longer trusted
+STALE_LAG_CHECKS = 3
+
+
+class ReplicaLagMonitor:
+    """Poll the replication lag of replicas in a background task."""
+
+    def __init__(
+        self: Self,
+        replica_engines: Sequence[AsyncEngine],
+        interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Set up the monitor. No lag is known until it is started or `check_lags` is called.
+
+        Keyword arguments:
+        replica_engines -- async engines of the replicas, used to query their lag
+        interval_seconds -- seconds between checks, which is also the timeout of each check
+        clock -- returns the current time in seconds (default time.monotonic)
+        """
+        self.replica_engines = replica_engines
+        self.interval_seconds = interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Index of each replica mapped to its lag in seconds and the time it was checked
+        self._lags: dict[int, tuple[float, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self: Self) -> None:
+        """Start checking lags in a background task."""
+        if self._task is None and self.replica_engines:
+            self._task = asyncio.create_task(self._check_lags_until_stopped())
+
+    async def stop(self: Self) -> None:
+        """Stop checking lags."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def record_lag(self: Self, replica_index: int, lag_seconds: float | None) -> None:
+        """Record the current lag of the replica, or None if it could not be determined."""
+        with self._lock:
+            if lag_seconds is None:
+                self._lags.pop(replica_index, None)
+            else:
+                self._lags[replica_index] = (lag_seconds, self._clock())
+
+    def get_lag_seconds(self: Self, replica_index: int) -> float | None:
+        """Return the lag of the replica or None if it is unknown or was last checked too long ago."""
+        with self._lock:
+            lag = self._lags.get(replica_index)
+        if lag is None:
+            return None
+        lag_seconds, checked_at = lag
+        if self._clock() - checked_at > self.interval_seconds * STALE_LAG_CHECKS:
+            return None
+        return lag_seconds
+
+    async def check_lags(self: Self) -> None:
+        """Query and record the lag of every replica concurrently."""
+        lags = await asyncio.gather(*(self._query_lag_seconds(engine) for engine in self.replica_engines))
+        for replica_index, lag_seconds in enumerate(lags):
+            self.record_lag(replica_index, lag_seconds)
+
+    async def _query_lag_seconds(self: Self, engine: AsyncEngine) -> float | None:
+        """Return the lag of the replica or None if it could not be queried in time."""
+        try:
+            async with asyncio.timeout(self.interval_seconds), engine.connect() as db_connection:
+                lag_seconds = (await db_connection.execute(REPLICATION_LAG_QUERY)).scalar_one()
+        except (OSError, SQLAlchemyError, TimeoutError) as exc:
+            logger.warning("Could not check replication lag of %s: %s", engine.url.render_as_string(), exc)
+            return None
+        return None if lag_seconds is None else float(lag_seconds)
+
+    async def _check_lags_until_stopped(self: Self) -> None:
+        """Check the lag of every replica once per interval."""
+        while True:
+            await self.check_lags()
+            await asyncio.sleep(self.interval_seconds)
+
+
+class ReplicaRouter(Generic[EngineType]):
+    """Choose a replica to read from, out of those which are within the maximum lag."""
+
+    def __init__(
+        self: Self,
+        replica_engines: Sequence[EngineType],
+        lag_monitor: ReplicaLagMonitor,
+        max_lag_seconds: float,
+    ) -> None:
+        """Set up the router.
+
+        Keyword arguments:
+        replica_engines -- engines of the replicas, in the same order as the lag monitor's engines
+        lag_monitor -- monitor of the replicas' lag
+        max_lag_seconds -- replicas lagging behind the primary by more than this are not used
+        """
+        self.replica_engines = replica_engines
+        self.lag_monitor = lag_monitor
+        self.max_lag_seconds = max_lag_seconds
+
+    def choose_replica(self: Self) -> EngineType | None:
+        """Return a random replica within the maximum lag, spreading reads, or None if there is no such replica."""
+        replica_engines = [
+            engine
+            for replica_index, engine in enumerate(self.replica_engines)
+            if (lag_seconds := self.lag_monitor.get_lag_seconds(replica_index)) is not None
+            and lag_seconds <= self.max_lag_seconds
+        ]
+        return random.choice(replica_engines) if replica_engines else None  # nosec: random is not used for security
@@ -0,0 +1,103 @@
+"""Functionality relating to template databases.
+
+The schema is built once into a template database, named after a hash of the files defining the schema. Databases
+with the schema are then created by cloning the template, which is much faster than building the schema each time.
+Template databases are kept, so later databases are cloned from the same template until the schema changes.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+from sqlalchemy import NullPool, create_engine, func, select, text
+from sqlalchemy_utils import create_database, database_exists, drop_database
+
+from v1.database.models.base import SqlAlchemyBase
+from v1.schemas.database import DatabaseInfo
+
+DATABASE_DIRECTORY = Path(__file__).parent
+# Directories of the files which define the database schema
+DATABASE_SCHEMA_DIRECTORIES = (
+    DATABASE_DIRECTORY / "models",
+    DATABASE_DIRECTORY / "triggers",
+    DATABASE_DIRECTORY / "migrations" / "versions",
+)
+# Database which is always present, connected to when creating and dropping the other databases
+MAINTENANCE_DB_NAME = "postgres"
+# Advisory lock held while the template database is built or cloned, so processes do not build it concurrently
+TEMPLATE_DB_LOCK_ID = 7_215_046_821
+
+
+def get_database_schema_hash(directories: Iterable[Path] = DATABASE_SCHEMA_DIRECTORIES) -> str:
+    """Return a hash of the python files in the directories, which changes whenever the database schema may change."""
+    schema_hash = hashlib.sha256()
+    for directory in directories:
+        for path in sorted(directory.rglob("*.py")):
+            schema_hash.update(path.relative_to(directory.parent).as_posix().encode())
+            schema_hash.update(path.read_bytes())
+    return schema_hash.hexdigest()
+
+
+def get_template_db_name_prefix(db_name: str) -> str:
+    """Return the prefix of the names of the template databases of the database."""
+    return f"test-{db_name}-template-"
+
+
+def get_template_db_info(db_info_: DatabaseInfo) -> DatabaseInfo:
+    """Return the template database of the database for the current schema."""
+    return db_info_.model_copy(
+        update={"name": f"{get_template_db_name_prefix(db_info_.name)}{get_database_schema_hash()[:12]}"},
+    )
+
+
+def create_template_db(template_db_info: DatabaseInfo, *, echo: bool = False) -> None:
+    """Create the template database and build the schema in it, dropping the database if the schema fails to build."""
+    create_database(url=template_db_info.url)
+    template_db_engine = create_engine(url=template_db_info.url, echo=echo, poolclass=NullPool)
+    try:
+        SqlAlchemyBase.metadata.create_all(bind=template_db_engine)
+    except Exception:
+        drop_database(template_db_info.url)
+        raise
+    finally:
+        # A database cannot be cloned while anyone is connected to it
+        template_db_engine.dispose()
+
+
+def drop_stale_template_dbs(template_db_info: DatabaseInfo, stale_template_db_names: Iterable[str]) -> None:
+    """Drop the template databases built for an earlier schema."""
+    for stale_template_db_name in stale_template_db_names:
+        drop_database(template_db_info.model_copy(update={"name": stale_template_db_name}).url)
+
+
+def create_db_from_template(
+    db_info_: DatabaseInfo,
+    template_db_info: DatabaseInfo,
+    db_name_prefix: str,
+    *,
+    echo: bool = False,
+) -> None:
+    """Create the database by cloning the template database, creating the template database first if needed.
+
+    Keyword arguments:
+    db_info_ -- database to create
+    template_db_info -- template database to clone, which is named after the hash of the schema
+    db_name_prefix -- prefix of the names of all template databases, those not for the current schema are dropped
+    echo -- log the statements building the template database (default False)
+    """
+    maintenance_db_info = db_info_.model_copy(update={"name": MAINTENANCE_DB_NAME})
+    maintenance_db_engine = create_engine(url=maintenance_db_info.url, isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    with maintenance_db_engine.connect() as db_connection:
+        db_connection.execute(select(func.pg_advisory_lock(TEMPLATE_DB_LOCK_ID)))
+        try:
+            if not database_exists(template_db_info.url):
+                template_db_names = db_connection.scalars(
+                    text("SELECT datname FROM pg_database WHERE starts_with(datname, :prefix)"),
+                    {"prefix": db_name_prefix},
+                )
+                drop_stale_template_dbs(template_db_info, template_db_names.all())
+                create_template_db(template_db_info, echo=echo)
+            create_database(url=db_info_.url, template=template_db_info.name)
+        finally:
+            db_connection.execute(select(func.pg_advisory_unlock(TEMPLATE_DB_LOCK_ID)))
+    maintenance_db_engine.dispose()
@@ -5,7 +5,14 @@ from unittest.mock import MagicMock
 
 from pytest_mock import MockerFixture
 
-from v1.database.connections import get_db_session
+from v1.database.connections import (
+    create_read_db_session,
+    get_created_engines,
+    get_db_async_engine,
+    get_db_engine,
+    get_db_session,
+)
+from v1.database.replicas import IS_REPLICA_SESSION
 
 
 def test_get_db_session(mocker: MockerFixture):
@@ -24,3 +31,36 @@ def test_get_db_session(mocker: MockerFixture):
     with contextlib.suppress(StopIteration):
         next(db_session)
     mock_db_session.close.assert_called_once()
+
+
+def test_create_read_db_session(mocker: MockerFixture):
+    """Test read sessions are bound to a replica, unless the primary is preferred."""
+    # Given
+    replica_engine = MagicMock()
+    mocker.patch("v1.database.connections.get_replica_router").return_value.choose_replica.return_value = replica_engine
+
+    # When
+    replica_db_session = create_read_db_session(prefer_primary=False)
+    primary_db_session = create_read_db_session(prefer_primary=True)
+
+    # Then
+    assert replica_db_session.get_bind() is replica_engine
+    assert replica_db_session.info[IS_REPLICA_SESSION] is True
+    assert primary_db_session.get_bind() is get_db_engine()
+    assert primary_db_session.info[IS_REPLICA_SESSION] is False
+
+
+def test_engines_are_created_on_first_use():
+    """Test engines are only created when they are first used, and the same engine is returned afterwards."""
+    # Given
+    get_db_engine.cache_clear()
+    get_db_async_engine.cache_clear()
+
+    # When
+    created_engines_before_use = get_created_engines()
+    db_async_engine = get_db_async_engine()
+
+    # Then
+    assert created_engines_before_use == {}
+    assert get_created_engines() == {"async": db_async_engine}
+    assert get_db_async_engine() is db_async_engine
@@ -0,0 +1,34 @@
+"""Tests for database model test factories."""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from v1.database.instrumentation import QueryStats
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.services.passwords import is_password_correct
+
+NUMBER_OF_USERS = 1000
+
+
+@pytest.mark.integration()
+def test_create_batch_inserts_with_one_statement(
+    db_session: Session,
+    assert_query_count: Callable[[int], AbstractContextManager[QueryStats]],
+) -> None:
+    """Test a batch of users is inserted with one statement and the shared password is only hashed once."""
+    # Given
+    users = UserFactory.create_batch(NUMBER_OF_USERS)
+
+    # When
+    with assert_query_count(1):
+        db_session.flush()
+
+    # Then
+    assert db_session.scalar(select(func.count()).select_from(User)) == NUMBER_OF_USERS
+    assert len({user.hashed_password for user in users}) == 1
+    assert is_password_correct(UserFactory.password, users[0].hashed_password) is True
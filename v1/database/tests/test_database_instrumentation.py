@@ -0,0 +1,45 @@
+"""Test database query instrumentation."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from v1.database.instrumentation import QueryStats, track_queries
+
+
+@pytest.mark.integration()
+def test_track_queries(db_session: Session):
+    """Test statements executed within a tracked context are recorded, including in the enclosing contexts."""
+    # When
+    db_session.execute(text("SELECT 1"))
+    with track_queries() as outer_query_stats:
+        db_session.execute(text("SELECT 1"))
+        with track_queries() as inner_query_stats:
+            db_session.execute(text("SELECT 2"))
+            db_session.execute(text("SELECT 2"))
+
+    # Then
+    assert inner_query_stats.count == 2
+    assert inner_query_stats.get_most_repeated_statement() == ("SELECT 2", 2)
+    assert outer_query_stats.count == 3
+    assert outer_query_stats.statement_counts == {"SELECT 1": 1, "SELECT 2": 2}
+    assert outer_query_stats.total_seconds >= inner_query_stats.total_seconds > 0
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_track_queries_async(async_db_session: AsyncSession):
+    """Test statements executed by async engines are recorded in the query stats of the current context."""
+    # When
+    with track_queries() as query_stats:
+        await async_db_session.execute(text("SELECT 1"))
+
+    # Then
+    assert query_stats.count == 1
+    assert query_stats.statement_counts == {"SELECT 1": 1}
+
+
+def test_get_most_repeated_statement_without_statements():
+    """Test there is no most repeated statement if no statements were executed."""
+    assert QueryStats().get_most_repeated_statement() is None
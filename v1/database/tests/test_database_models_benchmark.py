@@ -0,0 +1,20 @@
+"""Micro-benchmark converting database models to dictionaries.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.test_fixtures.benchmarks import MicroBenchmarkResult
+
+
+@pytest.mark.benchmark()
+def test_to_dict_benchmark(micro_benchmark: Callable[[Callable[[], Any]], MicroBenchmarkResult]):
+    """Benchmark converting a user to a dictionary."""
+    user = UserFactory.build(hashed_password="not-a-real-hash")  # nosec: hardcoded_password_funcarg
+    micro_benchmark(user.to_dict)
@@ -0,0 +1,164 @@
+"""Test database connection pools."""
+
+import pytest
+from sqlalchemy import NullPool, create_engine, event
+from sqlalchemy import exc as sqlalchemy_exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from v1.database.pools import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolStats,
+    get_pool_saturation,
+    get_pool_stats,
+    warm_up_async_pool,
+    warm_up_pool,
+)
+from v1.test_fixtures.database import testing_db_info
+
+
+@pytest.mark.integration()
+def test_warm_up_pool_opens_idle_connections():
+    """Test that warming up a pool leaves the connections open and idle in the pool."""
+    # Given
+    engine = create_engine(testing_db_info.url, poolclass=InstrumentedQueuePool, pool_size=3)
+
+    # When
+    warm_up_pool(engine, 3)
+
+    # Then
+    stats = get_pool_stats(engine)
+    assert stats is not None
+    assert stats.checked_in == 3
+    assert stats.checked_out == 0
+    assert stats.overflow == 0
+    assert stats.checkouts == 3
+    engine.dispose()
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_warm_up_async_pool_opens_idle_connections():
+    """Test that warming up an async pool leaves the connections open and idle in the pool."""
+    # Given
+    engine = create_async_engine(testing_db_info.async_url, poolclass=InstrumentedAsyncAdaptedQueuePool, pool_size=3)
+
+    # When
+    await warm_up_async_pool(engine, 3)
+
+    # Then
+    stats = get_pool_stats(engine)
+    assert stats is not None
+    assert stats.checked_in == 3
+    assert stats.checked_out == 0
+    await engine.dispose()
+
+
+@pytest.mark.integration()
+def test_warm_up_pool_opens_at_most_the_pool_size():
+    """Test that warming up more connections than the pool holds only opens the pool size, without waiting."""
+    # Given
+    engine = create_engine(
+        testing_db_info.url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=30,
+    )
+
+    # When
+    warm_up_pool(engine, 5)
+
+    # Then
+    stats = get_pool_stats(engine)
+    assert stats is not None
+    assert stats.checked_in == 2
+    assert stats.checkouts == 2
+    assert stats.timeouts == 0
+    engine.dispose()
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_warm_up_async_pool_returns_opened_connections_if_one_fails():
+    """Test that if a connection cannot be opened, the connections which were opened are returned to the pool."""
+    # Given
+    engine = create_async_engine(testing_db_info.async_url, poolclass=InstrumentedAsyncAdaptedQueuePool, pool_size=3)
+    connection_attempts = []
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def fail_second_connection(*_args: object) -> None:
+        connection_attempts.append(1)
+        if len(connection_attempts) == 2:
+            msg = "Connection refused"
+            raise OSError(msg)
+
+    # When
+    with pytest.raises(OSError, match="Connection refused"):
+        await warm_up_async_pool(engine, 3)
+
+    # Then
+    stats = get_pool_stats(engine)
+    assert stats is not None
+    assert len(connection_attempts) == 3
+    assert stats.checked_out == 0
+    assert stats.checked_in == 2
+    await engine.dispose()
+
+
+@pytest.mark.integration()
+def test_pool_stats_record_checkouts_overflow_and_timeouts():
+    """Test that the pool records connections in use, overflow, wait time and checkouts which timed out."""
+    # Given
+    engine = create_engine(
+        testing_db_info.url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+
+    # When
+    with engine.connect(), engine.connect():
+        stats_while_full = get_pool_stats(engine)
+        with pytest.raises(sqlalchemy_exc.TimeoutError), engine.connect():
+            pass
+
+    # Then
+    assert stats_while_full is not None
+    assert stats_while_full.checked_out == 2
+    assert stats_while_full.overflow == 1
+    stats = get_pool_stats(engine)
+    assert stats is not None
+    assert stats.checked_out == 0
+    assert stats.checkouts == 3
+    assert stats.timeouts == 1
+    assert stats.max_wait_seconds >= 0.1
+    assert stats.total_wait_seconds >= stats.max_wait_seconds
+    engine.dispose()
+
+
+def test_get_pool_stats_of_an_uninstrumented_pool():
+    """Test that there are no stats for pools which are not instrumented."""
+    assert get_pool_stats(create_engine(testing_db_info.url, poolclass=NullPool)) is None
+
+
+@pytest.mark.parametrize(
+    ("max_overflow", "checked_out", "expected_saturation"),
+    [(10, 3, 0.2), (10, 15, 1), (0, 5, 1), (-1, 100, 0)],
+    ids=["partly-used", "saturated", "no-overflow", "unlimited-overflow"],
+)
+def test_get_pool_saturation(max_overflow: int, checked_out: int, expected_saturation: float):
+    """Test pool saturation is the fraction of the pool's connections in use, including those beyond its size."""
+    pool_stats = PoolStats(
+        pool_size=5,
+        max_overflow=max_overflow,
+        checked_out=checked_out,
+        checked_in=0,
+        overflow=max(checked_out - 5, 0),
+        checkouts=checked_out,
+        timeouts=0,
+        total_wait_seconds=0,
+        max_wait_seconds=0,
+    )
+    assert get_pool_saturation(pool_stats) == expected_saturation
@@ -0,0 +1,158 @@
+"""Test read replica routing."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from v1.database.replicas import REPLICATION_LAG_QUERY, ReplicaLagMonitor, ReplicaRouter
+from v1.test_fixtures.clocks import FakeClock
+from v1.test_fixtures.database import testing_async_db_engine, testing_db_engine, testing_db_info
+
+MAX_LAG_SECONDS = 5
+INTERVAL_SECONDS = 1
+# Position up to which a fake replica has replayed write ahead log
+REPLAY_LSN = "0/3000000"
+
+
+def create_unreachable_async_engine() -> AsyncEngine:
+    """Return an engine of a replica which is down."""
+    return create_async_engine(testing_db_info.async_url.replace(f":{testing_db_info.port}/", ":1/"))
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_route_to_replicas_within_the_maximum_lag():
+    """Test that reads are only routed to replicas which are up and within the maximum lag.
+
+    The test database is used as a replica, as a database which is not in recovery has no lag.
+    """
+    # Given
+    unreachable_engine = create_unreachable_async_engine()
+    lag_monitor = ReplicaLagMonitor([testing_async_db_engine, unreachable_engine], INTERVAL_SECONDS)
+    router = ReplicaRouter([testing_async_db_engine, unreachable_engine], lag_monitor, MAX_LAG_SECONDS)
+    replica_before_check = router.choose_replica()
+
+    # When
+    await lag_monitor.check_lags()
+
+    # Then
+    assert replica_before_check is None
+    assert lag_monitor.get_lag_seconds(0) == 0
+    assert lag_monitor.get_lag_seconds(1) is None
+    assert {router.choose_replica() for _ in range(20)} == {testing_async_db_engine}
+    await unreachable_engine.dispose()
+
+
+def test_route_to_the_primary_if_replicas_lag(clock: FakeClock):
+    """Test that replicas which lag, or whose lag is unknown or was last checked too long ago, are not routed to."""
+    # Given
+    lag_monitor = ReplicaLagMonitor([testing_async_db_engine], INTERVAL_SECONDS, clock=clock)
+    router = ReplicaRouter(["replica"], lag_monitor, MAX_LAG_SECONDS)
+
+    # When
+    lag_monitor.record_lag(0, MAX_LAG_SECONDS + 0.1)
+    replica_while_lagging = router.choose_replica()
+    lag_monitor.record_lag(0, MAX_LAG_SECONDS)
+    replica_within_lag = router.choose_replica()
+    lag_monitor.record_lag(0, None)
+    replica_with_unknown_lag = router.choose_replica()
+    lag_monitor.record_lag(0, MAX_LAG_SECONDS)
+    clock.now += INTERVAL_SECONDS * 3 + 0.1
+    replica_after_missed_checks = router.choose_replica()
+
+    # Then
+    assert replica_while_lagging is None
+    assert replica_within_lag == "replica"
+    assert replica_with_unknown_lag is None
+    assert replica_after_missed_checks is None
+
+
+def fake_replica(
+    db_connection: Connection,
+    receive_lsn: str,
+    wal_receiver_status: str | None,
+    last_replayed_at: str,
+) -> None:
+    """Make the connection look like it is to a replica, by functions and a view which are found before pg_catalog's.
+
+    The replica has replayed write ahead log up to REPLAY_LSN. The changes are rolled back with the transaction.
+
+    Keyword arguments:
+    db_connection -- connection to fake a replica on
+    receive_lsn -- position up to which the replica has received write ahead log
+    wal_receiver_status -- status of the replica's WAL receiver or None if it has none
+    last_replayed_at -- SQL expression of the time the replica last replayed a transaction
+    """
+    db_connection.execute(text("CREATE SCHEMA fake_replica"))
+    db_connection.execute(text("SET LOCAL search_path = fake_replica, pg_catalog"))
+    for name, return_type, value in [
+        ("pg_is_in_recovery", "boolean", "true"),
+        ("pg_last_wal_receive_lsn", "pg_lsn", f"'{receive_lsn}'"),
+        ("pg_last_wal_replay_lsn", "pg_lsn", f"'{REPLAY_LSN}'"),
+        ("pg_last_xact_replay_timestamp", "timestamptz", last_replayed_at),
+    ]:
+        db_connection.execute(
+            text(f"CREATE FUNCTION fake_replica.{name}() RETURNS {return_type} RETURN ({value})::{return_type}"),
+        )
+    # The view has no rows if there is no WAL receiver
+    wal_receivers = "WHERE false" if wal_receiver_status is None else ""
+    db_connection.execute(
+        text(
+            f"CREATE VIEW fake_replica.pg_stat_wal_receiver AS SELECT '{wal_receiver_status}'::text AS status {wal_receivers}",
+        ),
+    )
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    ("receive_lsn", "wal_receiver_status", "last_replayed_at", "expected_lag_seconds"),
+    [
+        (REPLAY_LSN, "streaming", "now() - interval '60 seconds'", 0),
+        ("0/4000000", "streaming", "now() - interval '60 seconds'", 60),
+        # The WAL receiver lost its connection to the primary, so nothing more is received and the replica goes stale
+        (REPLAY_LSN, None, "now() - interval '60 seconds'", 60),
+        (REPLAY_LSN, "waiting", "now() - interval '60 seconds'", 60),
+        (REPLAY_LSN, None, "NULL", None),
+    ],
+)
+def test_replication_lag_query(
+    receive_lsn: str,
+    wal_receiver_status: str | None,
+    last_replayed_at: str,
+    expected_lag_seconds: int | None,
+):
+    """Test a replica only has no lag if it has replayed everything it received and is still streaming.
+
+    There is no replica in the test environment, so the test database is made to look like one.
+    """
+    with testing_db_engine.connect() as db_connection:
+        # Given
+        fake_replica(db_connection, receive_lsn, wal_receiver_status, last_replayed_at)
+
+        # When
+        lag_seconds = db_connection.execute(REPLICATION_LAG_QUERY).scalar_one()
+        db_connection.rollback()
+
+    # Then
+    if expected_lag_seconds is None:
+        assert lag_seconds is None
+    else:
+        assert float(lag_seconds) == pytest.approx(expected_lag_seconds, abs=1)
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_lag_monitor_checks_lags_in_the_background():
+    """Test that the lag monitor checks the replicas' lag until it is stopped."""
+    # Given
+    lag_monitor = ReplicaLagMonitor([testing_async_db_engine], interval_seconds=0.05)
+
+    # When
+    lag_monitor.start()
+    await asyncio.sleep(0.2)
+    await lag_monitor.stop()
+
+    # Then
+    assert lag_monitor.get_lag_seconds(0) == 0
@@ -0,0 +1,51 @@
+"""Test database templates module."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import NullPool, create_engine, inspect
+from sqlalchemy_utils import database_exists, drop_database
+
+from v1.database.templates import create_db_from_template, get_database_schema_hash
+from v1.test_fixtures.database import testing_db_info, testing_template_db_info, testing_template_db_name_prefix
+
+
+def test_get_database_schema_hash_changes_when_a_schema_file_changes(tmp_path: Path) -> None:
+    """Test the database schema hash is stable, but changes when a file defining the schema changes."""
+    # Given
+    models_directory = tmp_path / "models"
+    models_directory.mkdir()
+    model_file = models_directory / "users.py"
+    model_file.write_text("class User: ...\n")
+    (models_directory / "README.md").write_text("Not part of the schema.\n")
+
+    # When
+    schema_hash = get_database_schema_hash([models_directory])
+    (models_directory / "README.md").write_text("Still not part of the schema.\n")
+    schema_hash_after_other_file_change = get_database_schema_hash([models_directory])
+    model_file.write_text("class User:\n    email: str\n")
+    schema_hash_after_model_change = get_database_schema_hash([models_directory])
+
+    # Then
+    assert schema_hash_after_other_file_change == schema_hash
+    assert schema_hash_after_model_change != schema_hash
+
+
+@pytest.mark.integration()
+def test_create_db_from_template_clones_the_existing_template_db() -> None:
+    """Test a database created from the template database, which the test session built, has the schema."""
+    # Given
+    db_info_ = testing_db_info.model_copy(update={"name": f"{testing_db_info.name[:-32]}{uuid4().hex}"})
+
+    # When
+    create_db_from_template(db_info_, testing_template_db_info, testing_template_db_name_prefix)
+
+    # Then
+    db_engine = create_engine(db_info_.url, poolclass=NullPool)
+    try:
+        assert database_exists(testing_template_db_info.url)
+        assert "users" in inspect(db_engine).get_table_names()
+    finally:
+        db_engine.dispose()
+        drop_database(db_info_.url)
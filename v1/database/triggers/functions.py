@@ -15,3 +15,20 @@ def trigger_function_modify_updated_at_to_current_timestamp() -> DDL:
             $$ LANGUAGE plpgsql;
         """,
     )
+
+
+def trigger_function_notify_row_id_changed(channel: str) -> DDL:
+    """Return a definition for a trigger function to notify listeners on a channel with the id of a changed row.
+
+    Notifications are only delivered once the transaction commits, so listeners never see uncommitted changes.
+    """
+    return DDL(
+        f"""CREATE OR REPLACE FUNCTION trigger_function__notify_{channel}()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM pg_notify('{channel}', COALESCE(NEW.id, OLD.id)::text);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """,
+    )
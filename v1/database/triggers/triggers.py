@@ -12,3 +12,14 @@ def trigger_modify_updated_at_to_current_timestamp(table_name: str) -> DDL:
             EXECUTE FUNCTION trigger_function__modify_updated_at_to_current_timestamp();
         """,
     )
+
+
+def trigger_notify_row_id_changed(table_name: str, channel: str) -> DDL:
+    """Return a definition for a trigger which notifies listeners on a channel when a row of the table changes."""
+    return DDL(
+        f"""CREATE TRIGGER trigger__notify_{channel}
+            AFTER INSERT OR UPDATE OR DELETE ON {table_name}
+            FOR EACH ROW
+            EXECUTE FUNCTION trigger_function__notify_{channel}();
+        """,
+    )
@@ -0,0 +1,15 @@
+"""Exceptions relating to authentication."""
+
+from v1.exceptions.base import BaseError
+
+
+class IncorrectLoginError(BaseError):
+    """Raise error when a user logs in with an email or password which is not correct."""
+
+
+class InvalidAccessTokenError(BaseError):
+    """Raise error when an access token is missing, malformed, not signed by a known key, expired or revoked."""
+
+    def __init__(self, reason: str) -> None:
+        """Reason the access token is not valid."""
+        self.reason = reason
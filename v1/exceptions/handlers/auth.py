@@ -0,0 +1,26 @@
+"""Exception handlers for authentication."""
+
+from http import HTTPStatus
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from v1.exceptions.auth import IncorrectLoginError, InvalidAccessTokenError
+
+
+async def incorrect_login_exception_handler(_request: Request, _exc: IncorrectLoginError) -> JSONResponse:
+    """Return 401 when the email or password is not correct, without saying which."""
+    return JSONResponse(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        content={"message": "Incorrect email or password."},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def invalid_access_token_exception_handler(_request: Request, exc: InvalidAccessTokenError) -> JSONResponse:
+    """Return 401 when the access token is not valid."""
+    return JSONResponse(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        content={"message": f"Access token is not valid: {exc.reason}."},
+        headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+    )
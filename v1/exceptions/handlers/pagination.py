@@ -0,0 +1,16 @@
+"""Exception handlers for pagination."""
+
+from http import HTTPStatus
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from v1.exceptions.pagination import InvalidCursorError
+
+
+async def invalid_cursor_exception_handler(_request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """Return 400 when pagination cursor is invalid."""
+    return JSONResponse(
+        status_code=HTTPStatus.BAD_REQUEST,
+        content={"message": f"Cursor {exc.cursor} is not valid."},
+    )
@@ -0,0 +1,23 @@
+"""Exception handlers for passwords."""
+
+from http import HTTPStatus
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from v1.exceptions.passwords import PasswordHashingPoolFullError
+
+# Seconds a client should wait before retrying a request rejected because the password hashing pool is full
+PASSWORD_HASHING_RETRY_AFTER_SECONDS = 1
+
+
+async def password_hashing_pool_full_exception_handler(
+    _request: Request,
+    _exc: PasswordHashingPoolFullError,
+) -> JSONResponse:
+    """Return 503 when the password hashing pool is full."""
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={"message": "Too many password operations in progress. Please try again later."},
+        headers={"Retry-After": str(PASSWORD_HASHING_RETRY_AFTER_SECONDS)},
+    )
@@ -5,7 +5,12 @@ from http import HTTPStatus
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
-from v1.exceptions.users import UserAlreadyExistsError, UserHasBeenPreviouslyDeletedError, UserIdDoesNotExistError
+from v1.exceptions.users import (
+    UserAlreadyExistsError,
+    UserEmailUndeliverableError,
+    UserHasBeenPreviouslyDeletedError,
+    UserIdDoesNotExistError,
+)
 
 
 async def user_already_exists_exception_handler(_request: Request, exc: UserAlreadyExistsError) -> JSONResponse:
@@ -16,6 +21,17 @@ async def user_already_exists_exception_handler(_request: Request, exc: UserAlre
     )
 
 
+async def user_email_undeliverable_exception_handler(
+    _request: Request,
+    exc: UserEmailUndeliverableError,
+) -> JSONResponse:
+    """Return 422 when email cannot be delivered to the user's email address."""
+    return JSONResponse(
+        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        content={"message": f"User email {exc.email} cannot receive email. {exc.reason}"},
+    )
+
+
 async def user_id_does_not_exist_exception_handler(_request: Request, exc: UserIdDoesNotExistError) -> JSONResponse:
     """Return 400 when user id does not exists."""
     return JSONResponse(
@@ -0,0 +1,11 @@
+"""Exceptions relating to pagination."""
+
+from v1.exceptions.base import BaseError
+
+
+class InvalidCursorError(BaseError):
+    """Raise error when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str) -> None:
+        """Cursor as provided by the client."""
+        self.cursor = cursor
@@ -0,0 +1,11 @@
+"""Exceptions relating to passwords."""
+
+from v1.exceptions.base import BaseError
+
+
+class PasswordHashingPoolFullError(BaseError):
+    """Raise error when the password hashing pool cannot accept any more work."""
+
+    def __init__(self, queue_depth: int) -> None:
+        """Store the number of hashing tasks waiting for a worker."""
+        self.queue_depth = queue_depth
@@ -22,6 +22,15 @@ class UserIdDoesNotExistError(BaseError):
         self.id = id
 
 
+class UserEmailUndeliverableError(BaseError):
+    """Raise error when email cannot be delivered to the user's email address."""
+
+    def __init__(self, email: str, reason: str) -> None:
+        """Email of the user and the reason it cannot receive email."""
+        self.email = email
+        self.reason = reason
+
+
 class UserHasBeenPreviouslyDeletedError(BaseError):
     """Raise error when user had been previously deleted."""
 
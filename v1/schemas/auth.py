@@ -0,0 +1,40 @@
+"""Authentication schemas."""
+
+from functools import partial
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import AfterValidator, BaseModel
+
+from v1.services.emails import validate_and_normalize_email
+
+# Emails are normalised to match those stored, but not checked for deliverability, as only existing users can log in
+LoginEmail = Annotated[str, AfterValidator(partial(validate_and_normalize_email, check_deliverability=False))]
+
+
+class LoginRequest(BaseModel):
+    """Request model for logging in a user."""
+
+    email: LoginEmail
+    password: str
+
+
+class AccessTokenResponse(BaseModel):
+    """Response model for an access token, as described by OAuth 2.0 (RFC 6749)."""
+
+    access_token: str
+    token_type: Literal["bearer"] = "bearer"
+    # Seconds until the access token expires
+    expires_in: int
+
+
+class AccessTokenClaims(BaseModel):
+    """Claims of an access token, named as registered by JSON Web Token (RFC 7519)."""
+
+    # Id of the user the token was issued to
+    sub: UUID
+    # Unique id of the token, by which it can be revoked
+    jti: str
+    # Unix times the token was issued at and expires at
+    iat: int
+    exp: int
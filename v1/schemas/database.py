@@ -14,8 +14,14 @@ class DatabaseInfo(BaseModel):
     host: str
     port: int
     name: str
+    async_driver: str = "asyncpg"
 
     @property
     def url(self: Self) -> str:
         """Return database connection URL."""
         return f"{self.type_}://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+
+    @property
+    def async_url(self: Self) -> str:
+        """Return database connection URL using the async driver."""
+        return f"{self.type_}+{self.async_driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
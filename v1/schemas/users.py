@@ -1,17 +1,24 @@
 """User schemas."""
 
 from datetime import datetime
+from enum import StrEnum
+from functools import partial
 from typing import Annotated
 from uuid import UUID
 
-from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter
 
 from v1.services.datetime_ import validate_datetime_is_utc_timezone
 from v1.services.emails import validate_and_normalize_email
 
-Email = Annotated[str, AfterValidator(validate_and_normalize_email)]
+# Only the syntax of emails is validated, as checking deliverability may query the DNS, which would block request
+# parsing. The users service checks deliverability when users are created or their email is updated.
+Email = Annotated[str, AfterValidator(partial(validate_and_normalize_email, check_deliverability=False))]
 UtcDatetime = Annotated[datetime, AfterValidator(validate_datetime_is_utc_timezone)]
 
+# Maximum number of users that can be created in a single bulk create request
+BULK_CREATE_USERS_LIMIT = 1000
+
 
 class CreateUserBase(BaseModel):
     """Common fields between create user service and request."""
@@ -51,6 +58,14 @@ class UpdateUserRequest(UpdateUserBase):
     """Request model for updating an existing user."""
 
 
+class UserCursor(BaseModel):
+    """Position of a user in the user listing sort order (i.e. first name, then last name, then id)."""
+
+    first_name: str
+    last_name: str
+    id: UUID
+
+
 class UserResponse(BaseModel):
     """Response model for user."""
 
@@ -64,3 +79,34 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime | None = None
     deleted_at: datetime | None = None
+
+
+class BulkCreateUsersRequest(BaseModel):
+    """Request model for creating many users at once."""
+
+    users: list[CreateUserRequest] = Field(min_length=1, max_length=BULK_CREATE_USERS_LIMIT)
+
+
+class BulkCreateUserStatus(StrEnum):
+    """Outcome of creating a single user of a bulk create request."""
+
+    CREATED = "created"
+    ALREADY_EXISTS = "already_exists"
+    DUPLICATE_IN_REQUEST = "duplicate_in_request"
+
+
+class BulkCreateUserResult(BaseModel):
+    """Result of creating a single user of a bulk create request.
+
+    User is only present if the user was created.
+    """
+
+    email: str
+    status: BulkCreateUserStatus
+    user: UserResponse | None = None
+
+
+# Adapters used to serialize responses straight to JSON (see FastJSONResponse)
+user_response_adapter = TypeAdapter(UserResponse)
+user_responses_adapter = TypeAdapter(list[UserResponse])
+bulk_create_user_results_adapter = TypeAdapter(list[BulkCreateUserResult])
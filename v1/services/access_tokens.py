@@ -0,0 +1,248 @@
+"""Access token services.
+
+Access tokens are JSON Web Tokens (RFC 7519) signed with HMAC SHA-256. They are verified entirely in memory:
+- the token's header is looked up in the cached key set, which maps the encoded header of each key to its secret,
+  so tokens signed with an unknown key or another algorithm are rejected without decoding the header
+- the signature is compared in constant time
+- the expiry and revocation list are checked against the decoded claims, the revocation list being a dict lookup
+
+Tokens are short lived (see ACCESS_TOKEN_TTL_SECONDS), as nothing about the user is read from the database.
+"""
+
+import base64
+import binascii
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from functools import cache
+from typing import Self
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from v1.exceptions.auth import InvalidAccessTokenError
+from v1.schemas.auth import AccessTokenClaims
+from v1.settings import ACCESS_TOKEN_SIGNING_KEYS, ACCESS_TOKEN_TTL_SECONDS, DEBUG_FASTAPI_APP
+
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN_ALGORITHM = "HS256"
+# RFC 7518 requires HS256 keys to be at least as long as the hash output
+MIN_SIGNING_KEY_BYTES = 32
+# Key id of the random key used when no signing keys are set
+EPHEMERAL_KEY_ID = "ephemeral"
+
+
+def encode_base64url(data: bytes) -> str:
+    """Return data encoded as URL-safe base64 without padding, as used by JSON Web Tokens."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_base64url(data: str) -> bytes:
+    """Return data decoded from URL-safe base64 without padding.
+
+    Raise binascii.Error if the data is not valid base64.
+    """
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class AccessTokenKeySet:
+    """Secret keys which sign and verify access tokens, by key id."""
+
+    def __init__(self: Self, keys: dict[str, bytes]) -> None:
+        """Set up the key set. Tokens are signed with the first key and verified with any of them.
+
+        Keyword arguments:
+        keys -- secret keys by key id, in order of preference, each at least MIN_SIGNING_KEY_BYTES long
+        """
+        if not keys:
+            msg = "An access token key set needs at least one key."
+            raise ValueError(msg)
+        for key_id, key in keys.items():
+            if len(key) < MIN_SIGNING_KEY_BYTES:
+                msg = f"Access token signing key {key_id!r} must be at least {MIN_SIGNING_KEY_BYTES} bytes long."
+                raise ValueError(msg)
+        self.signing_key_id = next(iter(keys))
+        self._keys = keys
+        # The header of a token only depends on its key, so tokens are verified by looking up their encoded header
+        self._encoded_headers = {key_id: self.encode_header(key_id) for key_id in keys}
+        self._keys_by_encoded_header = {self._encoded_headers[key_id]: key for key_id, key in keys.items()}
+
+    @classmethod
+    def from_string(cls: type[Self], keys: str) -> Self:
+        """Return key set parsed from comma separated key id and secret pairs, e.g. "2026-10:secret,2026-04:old"."""
+        key_set = {}
+        for key in keys.split(","):
+            key_id, separator, secret = key.strip().partition(":")
+            if not separator or not key_id or not secret:
+                msg = "Access token signing keys must be comma separated key id and secret pairs, e.g. 'key-id:secret'."
+                raise ValueError(msg)
+            key_set[key_id] = secret.encode()
+        return cls(key_set)
+
+    @staticmethod
+    def encode_header(key_id: str) -> str:
+        """Return the encoded header of tokens signed by the key."""
+        header = {"alg": ACCESS_TOKEN_ALGORITHM, "typ": "JWT", "kid": key_id}
+        return encode_base64url(json.dumps(header, separators=(",", ":")).encode())
+
+    def sign(self: Self, claims: AccessTokenClaims) -> str:
+        """Return the claims encoded as a token signed with the signing key."""
+        encoded_claims = encode_base64url(claims.model_dump_json().encode())
+        signing_input = f"{self._encoded_headers[self.signing_key_id]}.{encoded_claims}"
+        signature = hmac.digest(self._keys[self.signing_key_id], signing_input.encode(), hashlib.sha256)
+        return f"{signing_input}.{encode_base64url(signature)}"
+
+    def verify(self: Self, token: str) -> AccessTokenClaims:
+        """Return the claims of the token if it is signed by a key in the key set.
+
+        The expiry of the token is not checked.
+
+        Raise InvalidAccessTokenError if the token is malformed or its signature is not valid.
+        """
+        try:
+            encoded_header, encoded_claims, encoded_signature = token.split(".")
+        except ValueError as e:
+            raise InvalidAccessTokenError(reason="Malformed token") from e
+        key = self._keys_by_encoded_header.get(encoded_header)
+        if key is None:
+            raise InvalidAccessTokenError(reason="Unknown signing key")
+        try:
+            signature = decode_base64url(encoded_signature)
+        except (binascii.Error, ValueError) as e:
+            raise InvalidAccessTokenError(reason="Malformed token") from e
+        signing_input = f"{encoded_header}.{encoded_claims}".encode()
+        if not hmac.compare_digest(signature, hmac.digest(key, signing_input, hashlib.sha256)):
+            raise InvalidAccessTokenError(reason="Invalid signature")
+        try:
+            return AccessTokenClaims.model_validate_json(decode_base64url(encoded_claims))
+        except (binascii.Error, ValueError, ValidationError) as e:
+            raise InvalidAccessTokenError(reason="Malformed token") from e
+
+
+def load_access_token_key_set(keys: str, *, allow_ephemeral_key: bool) -> AccessTokenKeySet:
+    """Return the key set parsed from the keys, or a random key if there are none and that is allowed.
+
+    A random key is only valid in the process which created it, so with several workers most tokens would be rejected.
+
+    Raise ValueError if the keys are not valid, or if there are none and a random key is not allowed.
+
+    Keyword arguments:
+    keys -- comma separated key id and secret pairs, as parsed by `AccessTokenKeySet.from_string`
+    allow_ephemeral_key -- sign with a random key if there are no keys
+    """
+    if keys:
+        return AccessTokenKeySet.from_string(keys)
+    if not allow_ephemeral_key:
+        msg = "ACCESS_TOKEN_SIGNING_KEYS must be set unless DEBUG_FASTAPI_APP is True."
+        raise ValueError(msg)
+    logger.warning(
+        "ACCESS_TOKEN_SIGNING_KEYS is not set, so access tokens are signed with a random key "
+        "and are only valid in the process which issued them.",
+    )
+    return AccessTokenKeySet({EPHEMERAL_KEY_ID: secrets.token_bytes(MIN_SIGNING_KEY_BYTES)})
+
+
+@cache
+def get_access_token_key_set() -> AccessTokenKeySet:
+    """Return the key set from the ACCESS_TOKEN_SIGNING_KEYS setting, parsed once per process.
+
+    A random key is only used when DEBUG_FASTAPI_APP is True.
+    """
+    return load_access_token_key_set(ACCESS_TOKEN_SIGNING_KEYS, allow_ephemeral_key=DEBUG_FASTAPI_APP)
+
+
+class RevokedAccessTokens:
+    """Ids of revoked access tokens, kept until the tokens expire.
+
+    Checking whether a token is revoked is a dict lookup. Expired tokens are pruned whenever a token is revoked.
+    Tokens are only revoked in the process which revoked them.
+    """
+
+    def __init__(self: Self, clock: Callable[[], float] = time.time) -> None:
+        """Set up an empty revocation list.
+
+        Keyword arguments:
+        clock -- returns the current unix time in seconds (default time.time)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._expires_at_by_token_id: dict[str, int] = {}
+        # Revoked token ids ordered by expiry, so expired tokens can be pruned without scanning every token
+        self._expiry_heap: list[tuple[int, str]] = []
+
+    def __len__(self: Self) -> int:
+        """Return the number of revoked tokens which have not been pruned."""
+        return len(self._expires_at_by_token_id)
+
+    def __contains__(self: Self, token_id: str) -> bool:
+        """Return True if the token has been revoked."""
+        return token_id in self._expires_at_by_token_id
+
+    def revoke(self: Self, claims: AccessTokenClaims) -> None:
+        """Revoke the token until it expires."""
+        with self._lock:
+            self._prune()
+            if claims.jti not in self._expires_at_by_token_id:
+                self._expires_at_by_token_id[claims.jti] = claims.exp
+                heapq.heappush(self._expiry_heap, (claims.exp, claims.jti))
+
+    def _prune(self: Self) -> None:
+        """Remove the tokens which have expired, as they are rejected regardless."""
+        now = self._clock()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, token_id = heapq.heappop(self._expiry_heap)
+            del self._expires_at_by_token_id[token_id]
+
+
+revoked_access_tokens = RevokedAccessTokens()
+
+
+def issue_access_token(
+    user_id: UUID,
+    key_set: AccessTokenKeySet | None = None,
+    ttl_seconds: int = ACCESS_TOKEN_TTL_SECONDS,
+    clock: Callable[[], float] = time.time,
+) -> str:
+    """Return a signed access token for the user.
+
+    Keyword arguments:
+    user_id -- id of the user the token is issued to
+    key_set -- signs the token (default the key set from the ACCESS_TOKEN_SIGNING_KEYS setting)
+    ttl_seconds -- seconds until the token expires (default ACCESS_TOKEN_TTL_SECONDS)
+    clock -- returns the current unix time in seconds (default time.time)
+    """
+    issued_at = int(clock())
+    claims = AccessTokenClaims(sub=user_id, jti=uuid.uuid4().hex, iat=issued_at, exp=issued_at + ttl_seconds)
+    return (key_set or get_access_token_key_set()).sign(claims)
+
+
+def verify_access_token(
+    token: str,
+    key_set: AccessTokenKeySet | None = None,
+    revoked_tokens: RevokedAccessTokens = revoked_access_tokens,
+    clock: Callable[[], float] = time.time,
+) -> AccessTokenClaims:
+    """Return the claims of the access token if it is valid, without reading the database.
+
+    Raise InvalidAccessTokenError if the token is malformed, not signed by a key in the key set, expired or revoked.
+
+    Keyword arguments:
+    token -- access token as issued by `issue_access_token`
+    key_set -- verifies the token's signature (default the key set from the ACCESS_TOKEN_SIGNING_KEYS setting)
+    revoked_tokens -- tokens which are no longer valid (default revoked_access_tokens)
+    clock -- returns the current unix time in seconds (default time.time)
+    """
+    claims = (key_set or get_access_token_key_set()).verify(token)
+    if claims.exp <= clock():
+        raise InvalidAccessTokenError(reason="Token has expired")
+    if claims.jti in revoked_tokens:
+        raise InvalidAccessTokenError(reason="Token has been revoked")
+    return claims
@@ -0,0 +1,198 @@
+"""Async users service.
+
+Async equivalents of the functions in the users service, for use with async database sessions.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.models.users import User
+from v1.database.replicas import IS_REPLICA_SESSION
+from v1.exceptions.users import UserAlreadyExistsError, UserHasBeenPreviouslyDeletedError, UserIdDoesNotExistError
+from v1.schemas.users import BulkCreateUserResult, CreateUserService, UpdateUserService, UserCursor
+from v1.services.password_hashing import password_hashing_pool
+from v1.services.passwords import get_unknown_user_hashed_password
+from v1.services.user_cache import UserSnapshot, user_cache
+from v1.services.users import (
+    USERS_EXPORT_BATCH_SIZE,
+    get_bulk_create_user_results,
+    get_new_users,
+    get_unique_emails,
+    insert_users_statement,
+    raise_if_any_email_is_undeliverable,
+    select_users_export,
+    select_users_page,
+    soft_delete_user_statement,
+    update_user_statement,
+)
+from v1.settings import DATABASE_REPLICA_MAX_LAG_SECONDS
+
+
+async def create_user(db_session: AsyncSession, user: CreateUserService) -> User:
+    """Return created user.
+
+    See `create_user` in the users service for details.
+    """
+    # Checking deliverability may query the DNS, so keep it off the event loop
+    await asyncio.to_thread(raise_if_any_email_is_undeliverable, [user.email])
+    # Hashing is CPU bound, so keep it off the event loop
+    hashed_password = await password_hashing_pool.hash_async(user.password)
+    db_user = (await db_session.scalars(insert_users_statement([user], [hashed_password]))).one_or_none()
+    if db_user is None:
+        await db_session.rollback()
+        raise UserAlreadyExistsError(email=user.email)
+    await db_session.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
+
+
+async def create_users(db_session: AsyncSession, users: Sequence[CreateUserService]) -> list[BulkCreateUserResult]:
+    """Return the result of creating each of the given users, in the same order as the given users.
+
+    See `create_users` in the users service for details.
+    """
+    unique_emails = get_unique_emails(users)
+    await asyncio.to_thread(raise_if_any_email_is_undeliverable, unique_emails)
+    existing_emails = set(await db_session.scalars(select(User.email).where(User.email.in_(unique_emails))))
+    new_users = get_new_users(users, existing_emails)
+
+    created_users: Sequence[User] = []
+    if new_users:
+        hashed_passwords = await password_hashing_pool.hash_many_async([user.password for user in new_users])
+        created_users = (await db_session.scalars(insert_users_statement(new_users, hashed_passwords))).all()
+    results = get_bulk_create_user_results(users, created_users)
+    await db_session.commit()
+    user_cache.invalidate(*(result.user.id for result in results if result.user is not None))
+    return results
+
+
+async def get_user_from_id(db_session: AsyncSession, user_id: UUID) -> User | None:
+    """Return user model object from user id."""
+    # Always reload from the database, as async sessions do not expire objects on commit
+    return await db_session.get(User, user_id, populate_existing=True)
+
+
+async def get_user_snapshot_from_id(db_session: AsyncSession, user_id: UUID) -> UserSnapshot | None:
+    """Return snapshot of the user from the user cache, reading the user from the database only if it is not cached."""
+    user_snapshot = user_cache.get(user_id)
+    if user_snapshot is None:
+        # Do not cache the user if it was written while it was being read, as it may be stale
+        generation = user_cache.generation
+        db_user = await get_user_from_id(db_session, user_id)
+        if db_user is None:
+            return None
+        user_snapshot = UserSnapshot.from_user(db_user)
+        # A user read from a replica may already be stale, so only cache it for as long as a replica may lag
+        ttl_seconds = DATABASE_REPLICA_MAX_LAG_SECONDS if db_session.info.get(IS_REPLICA_SESSION) else None
+        user_cache.set(user_id, user_snapshot, ttl_seconds=ttl_seconds, generation=generation)
+    return user_snapshot
+
+
+async def get_user_from_email(db_session: AsyncSession, email: str) -> User | None:
+    """Return user by email."""
+    return (await db_session.execute(select(User).filter_by(email=email))).scalar_one_or_none()
+
+
+async def get_users(
+    db_session: AsyncSession,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: UserCursor | None = None,
+) -> Sequence[User]:
+    """Return users sorted by first, then last name, then id and also based on the pagination restrictions.
+
+    See `select_users_page` in the users service for the pagination arguments.
+    """
+    return (await db_session.scalars(select_users_page(offset, limit, cursor))).all()
+
+
+async def stream_users_export(
+    db_session: AsyncSession,
+    batch_size: int = USERS_EXPORT_BATCH_SIZE,
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    """Yield batches of every user, sorted by id.
+
+    See `stream_users_export` in the users service for details.
+    """
+    result = await db_session.stream(select_users_export().execution_options(yield_per=batch_size))
+    try:
+        async for rows in result.partitions():
+            yield rows
+    finally:
+        await result.close()
+
+
+async def update_user_using_id(db_session: AsyncSession, user_id: UUID, update_user_data: UpdateUserService) -> User:
+    """Return updated user.
+
+    See `update_user_using_id` in the users service for details.
+    """
+    if update_user_data.email is not None:
+        await asyncio.to_thread(raise_if_any_email_is_undeliverable, [update_user_data.email])
+    update_user_dict = update_user_data.model_dump(exclude={"password"}, exclude_unset=True)
+    if update_user_data.password:
+        update_user_dict["hashed_password"] = await password_hashing_pool.hash_async(update_user_data.password)
+
+    if update_user_dict:
+        db_user = (await db_session.scalars(update_user_statement(user_id, update_user_dict))).one_or_none()
+    else:
+        # Nothing to update, so do not modify updated_at
+        db_user = await get_user_from_id(db_session, user_id)
+    if db_user is None:
+        raise UserIdDoesNotExistError(id=user_id)
+    await db_session.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
+
+
+async def is_user_password_correct(db_session: AsyncSession, user: User, password: str) -> bool:
+    """Return True if plain text password matches the user's hashed password.
+
+    See `is_user_password_correct` in the users service for details.
+    """
+    is_correct, upgraded_hashed_password = await password_hashing_pool.verify_and_rehash_async(
+        password,
+        user.hashed_password,
+    )
+    if upgraded_hashed_password is not None:
+        user.hashed_password = upgraded_hashed_password
+        await db_session.commit()
+    return is_correct
+
+
+async def authenticate_user(db_session: AsyncSession, email: str, password: str) -> User | None:
+    """Return the user with the email if the password is correct and they have not been deleted, otherwise None.
+
+    See `authenticate_user` in the users service for details.
+    """
+    db_user = await get_user_from_email(db_session, email)
+    if db_user is None:
+        # The placeholder hash is only created by the first login for an unknown email, but not on the event loop
+        unknown_user_hashed_password = await asyncio.to_thread(get_unknown_user_hashed_password)
+        await password_hashing_pool.is_password_correct_async(password, unknown_user_hashed_password)
+        return None
+    if not await is_user_password_correct(db_session, db_user, password) or db_user.deleted_at is not None:
+        return None
+    return db_user
+
+
+async def soft_delete_user(db_session: AsyncSession, user_id: UUID) -> User:
+    """Return soft deleted user.
+
+    See `soft_delete_user` in the users service for details.
+    """
+    db_user = (await db_session.scalars(soft_delete_user_statement(user_id))).one_or_none()
+    if db_user is None:
+        db_user = await get_user_from_id(db_session, user_id)
+        # Cannot delete a user who has already been deleted
+        if db_user is not None and db_user.deleted_at is not None:
+            raise UserHasBeenPreviouslyDeletedError(email=db_user.email, deleted_at=db_user.deleted_at)
+        raise UserIdDoesNotExistError(id=user_id)
+    await db_session.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
@@ -0,0 +1,135 @@
+"""In-process caching services."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, Self, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point in time metrics of a cache, e.g. to size it from its hit ratio and number of evictions."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class TtlLruCache(Generic[KeyType, ValueType]):
+    """Thread safe, least recently used cache where every entry expires after a time to live (TTL).
+
+    Values are shared between every reader, so only cache immutable values.
+    """
+
+    def __init__(
+        self: Self,
+        ttl_seconds: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Set up an empty cache.
+
+        Keyword arguments:
+        ttl_seconds -- default number of seconds an entry is cached for
+        max_size -- maximum number of entries, after which the least recently used entry is evicted
+        clock -- returns the current time in seconds (default time.monotonic)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Key mapped to its value and the time at which it expires
+        self._entries: OrderedDict[KeyType, tuple[ValueType, float]] = OrderedDict()
+        # Incremented on every invalidation, see `set`
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self: Self) -> int:
+        """Return a number which changes whenever an entry is invalidated."""
+        return self._generation
+
+    def get(self: Self, key: KeyType) -> ValueType | None:
+        """Return the cached value or None if it is not cached or has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def set(
+        self: Self,
+        key: KeyType,
+        value: ValueType,
+        ttl_seconds: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Cache the value, evicting the least recently used entries if the cache is full.
+
+        Keyword arguments:
+        key -- key of the value
+        value -- immutable value to cache
+        ttl_seconds -- number of seconds the value is cached for (default the cache TTL)
+        generation -- generation read before loading the value (default None).
+            If anything was invalidated since, the value may be stale, so it is not cached.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            expires_at = self._clock() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self: Self, *keys: KeyType) -> None:
+        """Remove the keys from the cache, so they are loaded again the next time they are read."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._invalidations += 1
+
+    def invalidate_all(self: Self) -> None:
+        """Remove every entry from the cache, but keep the metrics."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def clear(self: Self) -> None:
+        """Remove all entries and reset the metrics."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def stats(self: Self) -> CacheStats:
+        """Return the current metrics of the cache."""
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                max_size=self.max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+            )
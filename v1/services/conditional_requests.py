@@ -0,0 +1,102 @@
+"""Conditional request services.
+
+Responses carry an ETag and a Last-Modified header. Clients send them back in If-None-Match and If-Modified-Since
+headers and, if the resource has not changed, receive 304 Not Modified without a body.
+See https://www.rfc-editor.org/rfc/rfc9110#name-conditional-requests for details.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Protocol
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+IF_MODIFIED_SINCE_HEADER = "If-Modified-Since"
+
+
+class Versioned(Protocol):
+    """Resource whose version is identified by its id and the time it was last updated."""
+
+    id: object
+    created_at: datetime
+    updated_at: datetime | None
+
+
+@dataclass(frozen=True)
+class ConditionalHeaders:
+    """Version of a response's content, sent in its ETag and Last-Modified headers."""
+
+    # Strong ETag of the current version of the content
+    etag: str
+    # Time the content was last modified or None if it is unknown or does not show whether the content changed
+    last_modified: datetime | None = None
+
+
+def get_last_modified(resource: Versioned) -> datetime:
+    """Return the time the resource was last modified."""
+    return resource.updated_at or resource.created_at
+
+
+def get_etag(resources: Iterable[Versioned]) -> str:
+    """Return a strong ETag for the given resources, in the given order.
+
+    The updated_at column is set by a database trigger on every change, so the ETag changes whenever any of the
+    resources change, or the resources themselves (or their order) change.
+    """
+    digest = hashlib.sha256()
+    for resource in resources:
+        digest.update(f"{resource.id}:{get_last_modified(resource).isoformat()};".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def get_conditional_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    """Return the ETag and Last-Modified headers of a response."""
+    headers = {ETAG_HEADER: etag}
+    if last_modified is not None:
+        headers[LAST_MODIFIED_HEADER] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_etag_matched(if_none_match: str, etag: str) -> bool:
+    """Return True if the ETag is one of the ETags in the If-None-Match header.
+
+    If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+def is_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """Return True if the resource was modified after the If-Modified-Since header.
+
+    HTTP dates only have a precision of seconds. Invalid dates are ignored, so the resource counts as modified.
+    """
+    try:
+        modified_since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if modified_since.tzinfo is None:
+        return True
+    return last_modified.replace(microsecond=0) > modified_since
+
+
+def is_not_modified(
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    etag: str,
+    last_modified: datetime | None,
+) -> bool:
+    """Return True if the client's copy of the resource is up to date, so 304 Not Modified can be returned.
+
+    If-Modified-Since is only used if If-None-Match is not sent, as ETags are more precise.
+    """
+    if if_none_match is not None:
+        return is_etag_matched(if_none_match, etag)
+    if if_modified_since is not None and last_modified is not None:
+        return not is_modified_since(if_modified_since, last_modified)
+    return False
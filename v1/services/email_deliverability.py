@@ -0,0 +1,134 @@
+"""Email deliverability services.
+
+Checking that an email domain can receive email needs a DNS query, which is slow and blocks the caller. Results are
+cached per domain, so the DNS is queried at most once per domain per time to live (TTL). Undeliverable domains are
+cached too (negative caching), but for a shorter time, so a domain which was misconfigured is soon checked again.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol, Self
+
+from email_validator import EmailUndeliverableError
+
+from v1.services.caching import CacheStats, TtlLruCache
+from v1.settings import (
+    EMAIL_DELIVERABILITY_CACHE_MAX_SIZE,
+    EMAIL_DELIVERABILITY_CACHE_NEGATIVE_TTL_SECONDS,
+    EMAIL_DELIVERABILITY_CACHE_TTL_SECONDS,
+    EMAIL_DELIVERABILITY_TIMEOUT_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class DomainDeliverability:
+    """Whether email can be delivered to a domain and, if not, the reason why."""
+
+    is_deliverable: bool
+    reason: str | None = None
+
+
+class DeliverabilityResolver(Protocol):
+    """Check whether email can be delivered to a domain."""
+
+    def __call__(self: Self, ascii_domain: str) -> DomainDeliverability | None:
+        """Return the deliverability of the domain or None if it could not be determined (e.g. a DNS timeout)."""
+        ...
+
+
+class DnsDeliverabilityResolver:
+    """Check deliverability by querying the DNS for the domain's MX, A or AAAA records."""
+
+    def __init__(self: Self, timeout_seconds: int = EMAIL_DELIVERABILITY_TIMEOUT_SECONDS) -> None:
+        """Set up the resolver.
+
+        Keyword arguments:
+        timeout_seconds -- seconds to wait for the DNS to respond (default EMAIL_DELIVERABILITY_TIMEOUT_SECONDS)
+        """
+        self.timeout_seconds = timeout_seconds
+
+    def __call__(self: Self, ascii_domain: str) -> DomainDeliverability | None:
+        """Return the deliverability of the domain or None if the DNS did not respond in time."""
+        # Import lazily as it is slow to import (due to dns.resolver), which is also what email_validator does
+        from email_validator.deliverability import validate_email_deliverability
+
+        try:
+            deliverability_info = validate_email_deliverability(ascii_domain, ascii_domain, self.timeout_seconds)
+        except EmailUndeliverableError as exc:
+            return DomainDeliverability(is_deliverable=False, reason=str(exc))
+        if "unknown-deliverability" in deliverability_info:
+            return None
+        return DomainDeliverability(is_deliverable=True)
+
+
+class EmailDeliverabilityCache:
+    """Least recently used cache of domain deliverability, with a time to live for each domain.
+
+    Concurrent checks of the same uncached domain wait for a single lookup, rather than each querying the DNS.
+    """
+
+    def __init__(
+        self: Self,
+        resolver: DeliverabilityResolver,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Set up an empty cache.
+
+        Keyword arguments:
+        resolver -- checks deliverability of domains which are not cached
+        ttl_seconds -- seconds a deliverable domain is cached for
+        negative_ttl_seconds -- seconds an undeliverable domain is cached for
+        max_size -- maximum number of domains cached, after which the least recently used domain is evicted
+        clock -- returns the current time in seconds (default time.monotonic)
+        """
+        self.resolver = resolver
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._cache: TtlLruCache[str, DomainDeliverability] = TtlLruCache(ttl_seconds, max_size, clock)
+        self._lock = threading.Lock()
+        self._domain_locks: dict[str, threading.Lock] = {}
+
+    def get_deliverability(self: Self, ascii_domain: str) -> DomainDeliverability | None:
+        """Return the deliverability of the domain, resolving it only if it is not cached.
+
+        Return None if the deliverability could not be determined. This is not cached.
+        """
+        with self._lock:
+            domain_lock = self._domain_locks.setdefault(ascii_domain, threading.Lock())
+        # If another thread is resolving the domain, then wait for it and use its result
+        with domain_lock:
+            deliverability = self._cache.get(ascii_domain)
+            if deliverability is None:
+                deliverability = self.resolver(ascii_domain)
+                if deliverability is not None:
+                    ttl_seconds = None if deliverability.is_deliverable else self.negative_ttl_seconds
+                    self._cache.set(ascii_domain, deliverability, ttl_seconds=ttl_seconds)
+        with self._lock:
+            self._domain_locks.pop(ascii_domain, None)
+        return deliverability
+
+    def raise_if_undeliverable(self: Self, ascii_domain: str) -> None:
+        """Raise EmailUndeliverableError if email cannot be delivered to the domain."""
+        deliverability = self.get_deliverability(ascii_domain)
+        if deliverability is not None and not deliverability.is_deliverable:
+            raise EmailUndeliverableError(deliverability.reason)
+
+    def clear(self: Self) -> None:
+        """Remove all domains and reset the metrics."""
+        self._cache.clear()
+
+    def stats(self: Self) -> CacheStats:
+        """Return the current metrics of the cache."""
+        return self._cache.stats()
+
+
+email_deliverability_cache = EmailDeliverabilityCache(
+    resolver=DnsDeliverabilityResolver(),
+    ttl_seconds=EMAIL_DELIVERABILITY_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=EMAIL_DELIVERABILITY_CACHE_NEGATIVE_TTL_SECONDS,
+    max_size=EMAIL_DELIVERABILITY_CACHE_MAX_SIZE,
+)
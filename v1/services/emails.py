@@ -2,6 +2,8 @@
 
 from email_validator import validate_email
 
+from v1.services.email_deliverability import email_deliverability_cache
+
 
 def validate_and_normalize_email(email: str, *, check_deliverability: bool = True) -> str:
     """Return a normalised email if email is a valid email.
@@ -12,7 +14,10 @@ def validate_and_normalize_email(email: str, *, check_deliverability: bool = Tru
     Keyword arguments:
     email -- email needed to be validated
     check_deliverability -- checks ability to send an email to the address.
-        Set it to False to avoid unnecessary DNS queries (default True)
+        DNS results are cached per domain, see the email deliverability service (default True)
     """
-    email_info = validate_email(email, check_deliverability=check_deliverability)
+    # Check deliverability separately, so DNS results can be cached
+    email_info = validate_email(email, check_deliverability=False)
+    if check_deliverability:
+        email_deliverability_cache.raise_if_undeliverable(email_info.ascii_domain)
     return email_info.normalized
@@ -0,0 +1,107 @@
+"""Export services.
+
+Exports are encoded one batch of rows at a time, so a whole table can be streamed to a client while only ever holding
+a single batch in memory.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+from enum import StrEnum
+from typing import Any, Generic, Self, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+class ExportFormat(StrEnum):
+    """Format of an export."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self: Self) -> str:
+        """Return the media type of the format."""
+        return EXPORT_MEDIA_TYPES[self]
+
+
+# Starlette adds the charset to text media types
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class ExportEncoder(Generic[ModelType]):
+    """Encode batches of rows as newline delimited JSON (one object per line) or CSV (with a header line).
+
+    Each row is validated into the model using its attributes, so rows can be ORM objects or result rows.
+    """
+
+    def __init__(self: Self, model: type[ModelType], export_format: ExportFormat) -> None:
+        """Set up the encoder.
+
+        Keyword arguments:
+        model -- pydantic model of a single row, whose fields are exported
+        export_format -- format to encode rows in
+        """
+        self.export_format = export_format
+        self.field_names = list(model.model_fields)
+        self._model_adapter = TypeAdapter(model)
+        self._models_adapter = TypeAdapter(list[model])  # type: ignore[valid-type]
+
+    def encode_header(self: Self) -> bytes:
+        """Return the header of the export, which is empty for NDJSON."""
+        if self.export_format == ExportFormat.NDJSON:
+            return b""
+        return self._encode_csv_rows([dict(zip(self.field_names, self.field_names, strict=True))])
+
+    def encode_rows(self: Self, rows: Sequence[Any]) -> bytes:
+        """Return the rows encoded in the export format."""
+        models = self._models_adapter.validate_python(rows, from_attributes=True)
+        if self.export_format == ExportFormat.NDJSON:
+            return b"".join(self._model_adapter.dump_json(model) + b"\n" for model in models)
+        return self._encode_csv_rows(self._models_adapter.dump_python(models, mode="json"))
+
+    def _encode_csv_rows(self: Self, rows: list[dict[str, Any]]) -> bytes:
+        """Return the rows as CSV lines."""
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=self.field_names).writerows(rows)
+        return buffer.getvalue().encode()
+
+
+def iter_export(
+    batches: Iterable[Sequence[Any]],
+    model: type[BaseModel],
+    export_format: ExportFormat,
+) -> Iterator[bytes]:
+    """Yield the header of the export and then each batch of rows, encoded in the export format.
+
+    Keyword arguments:
+    batches -- batches of rows to export, e.g. partitions of a server-side cursor
+    model -- pydantic model of a single row, whose fields are exported
+    export_format -- format to encode rows in
+    """
+    encoder = ExportEncoder(model, export_format)
+    if header := encoder.encode_header():
+        yield header
+    for rows in batches:
+        yield encoder.encode_rows(rows)
+
+
+async def aiter_export(
+    batches: AsyncIterable[Sequence[Any]],
+    model: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """Yield the header of the export and then each batch of rows, encoded in the export format.
+
+    See `iter_export` for the arguments.
+    """
+    encoder = ExportEncoder(model, export_format)
+    if header := encoder.encode_header():
+        yield header
+    async for rows in batches:
+        yield encoder.encode_rows(rows)
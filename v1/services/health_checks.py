@@ -0,0 +1,120 @@
+"""Health check services.
+
+Load balancers probe the readiness of every worker every few seconds. Each worker pings the database with a hard
+timeout, so a database or connection pool which does not respond fails the probe rather than hanging it. Ping results
+are cached for a short time and concurrent probes wait for the same ping, so probes cannot stampede the database.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Self
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from v1.database.pools import PoolStats, get_pool_saturation
+
+PING_QUERY = text("SELECT 1")
+
+
+@dataclass(frozen=True)
+class DatabasePing:
+    """Result of pinging the database."""
+
+    is_reachable: bool
+    # Seconds taken to check out a connection and run the ping, or until the ping timed out or failed
+    latency_seconds: float
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class Readiness:
+    """Whether the worker can serve traffic, with the checks it is based on."""
+
+    is_ready: bool
+    database: DatabasePing
+    pool: PoolStats | None
+    # Fraction of the pool's connections in use (see `get_pool_saturation`)
+    pool_saturation: float | None
+
+
+async def ping_async_database(engine: AsyncEngine, timeout_seconds: float) -> DatabasePing:
+    """Ping the database through the engine's pool, failing if it takes longer than the timeout."""
+    start_time = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout_seconds), engine.connect() as db_connection:
+            await db_connection.execute(PING_QUERY)
+    except TimeoutError:
+        return DatabasePing(is_reachable=False, latency_seconds=time.perf_counter() - start_time, error="Timed out")
+    except (OSError, SQLAlchemyError) as exc:
+        return DatabasePing(is_reachable=False, latency_seconds=time.perf_counter() - start_time, error=str(exc))
+    return DatabasePing(is_reachable=True, latency_seconds=time.perf_counter() - start_time)
+
+
+async def ping_database(engine: Engine, timeout_seconds: float) -> DatabasePing:
+    """Ping the database through the sync engine's pool in a thread, failing if it takes longer than the timeout.
+
+    A thread cannot be cancelled, so a ping which timed out keeps its thread until the ping completes or fails.
+    """
+
+    def ping() -> None:
+        with engine.connect() as db_connection:
+            db_connection.execute(PING_QUERY)
+
+    start_time = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(ping), timeout_seconds)
+    except TimeoutError:
+        return DatabasePing(is_reachable=False, latency_seconds=time.perf_counter() - start_time, error="Timed out")
+    except (OSError, SQLAlchemyError) as exc:
+        return DatabasePing(is_reachable=False, latency_seconds=time.perf_counter() - start_time, error=str(exc))
+    return DatabasePing(is_reachable=True, latency_seconds=time.perf_counter() - start_time)
+
+
+class CachedDatabasePing:
+    """Ping the database at most once per time to live, sharing the result between concurrent callers."""
+
+    def __init__(
+        self: Self,
+        ping: Callable[[], Awaitable[DatabasePing]],
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Set up the cache with no ping result.
+
+        Keyword arguments:
+        ping -- pings the database
+        ttl_seconds -- seconds a ping result is reused for
+        clock -- returns the current time in seconds (default time.monotonic)
+        """
+        self._ping = ping
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._result: DatabasePing | None = None
+        self._expires_at = 0.0
+
+    async def get(self: Self) -> DatabasePing:
+        """Return the cached ping result, pinging the database if it has expired."""
+        if self._result is not None and self._clock() < self._expires_at:
+            return self._result
+        async with self._lock:
+            # Another caller may have pinged the database while this one was waiting for the lock
+            if self._result is None or self._clock() >= self._expires_at:
+                self._result = await self._ping()
+                self._expires_at = self._clock() + self.ttl_seconds
+            return self._result
+
+
+def get_readiness(database_ping: DatabasePing, pool_stats: PoolStats | None, max_pool_saturation: float) -> Readiness:
+    """Return whether the worker can serve traffic, i.e. the database is reachable and the pool is not saturated."""
+    pool_saturation = None if pool_stats is None else get_pool_saturation(pool_stats)
+    return Readiness(
+        is_ready=database_ping.is_reachable and (pool_saturation is None or pool_saturation < max_pool_saturation),
+        database=database_ping,
+        pool=pool_stats,
+        pool_saturation=pool_saturation,
+    )
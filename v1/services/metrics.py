@@ -0,0 +1,263 @@
+"""Metrics service, exposed in the Prometheus text format.
+
+Request latency is recorded on every request, so recording must not become a point of contention. Each thread records
+into its own shard without taking a lock. Shards are only merged when the metrics are scraped. Metrics are per worker
+process, so each worker has to be scraped (e.g. with a Prometheus target per worker).
+"""
+
+import bisect
+import math
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Self
+
+from v1.database.pools import PoolStats
+from v1.services.password_hashing import PasswordHashingStats
+
+# Content type of the Prometheus text format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds of the request latency histogram buckets, in seconds. Observations above the largest bound are only
+# counted in the +Inf bucket.
+DEFAULT_LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10)
+# Route label of requests which did not match a route, so unknown paths do not each create a new time series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass(frozen=True)
+class RequestLabels:
+    """Labels identifying the time series of a request."""
+
+    method: str
+    # Path template of the route (e.g. /api/v1/users/{user_id}), rather than the path, to bound the number of series
+    route: str
+    status: int
+
+
+@dataclass
+class Histogram:
+    """Number of observations in each bucket (not cumulative), their count and sum."""
+
+    bucket_counts: list[int]
+    count: int = 0
+    sum: float = 0.0
+
+    def merge(self: Self, other: "Histogram") -> None:
+        """Add the observations of the other histogram to this histogram."""
+        self.bucket_counts = [
+            count + other_count for count, other_count in zip(self.bucket_counts, other.bucket_counts, strict=True)
+        ]
+        self.count += other.count
+        self.sum += other.sum
+
+
+class RequestMetrics:
+    """Request latency histograms per method, route and status."""
+
+    def __init__(self: Self, buckets_seconds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS) -> None:
+        """Set up the metrics with no requests recorded.
+
+        Keyword arguments:
+        buckets_seconds -- upper bounds of the latency histogram buckets (default DEFAULT_LATENCY_BUCKETS_SECONDS)
+        """
+        self.buckets_seconds = tuple(sorted(buckets_seconds))
+        self._local = threading.local()
+        # Shard of every thread which has recorded a request. The lock is only taken when a thread records its first
+        # request and when the shards are merged.
+        self._shards: list[dict[RequestLabels, Histogram]] = []
+        self._shards_lock = threading.Lock()
+
+    def observe(self: Self, method: str, route: str, status: int, duration_seconds: float) -> None:
+        """Record a request which took the given number of seconds."""
+        shard = self._get_shard()
+        labels = RequestLabels(method=method, route=route, status=status)
+        histogram = shard.get(labels)
+        if histogram is None:
+            histogram = shard[labels] = Histogram(bucket_counts=[0] * (len(self.buckets_seconds) + 1))
+        histogram.bucket_counts[bisect.bisect_left(self.buckets_seconds, duration_seconds)] += 1
+        histogram.count += 1
+        histogram.sum += duration_seconds
+
+    def collect(self: Self) -> dict[RequestLabels, Histogram]:
+        """Return the histograms of every thread, merged per labels.
+
+        A thread may record a request while it is collected, so the histograms are consistent to within that request.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: dict[RequestLabels, Histogram] = {}
+        for shard in shards:
+            for labels, histogram in shard.copy().items():
+                if labels in merged:
+                    merged[labels].merge(histogram)
+                else:
+                    merged[labels] = Histogram(
+                        bucket_counts=list(histogram.bucket_counts),
+                        count=histogram.count,
+                        sum=histogram.sum,
+                    )
+        return merged
+
+    def reset(self: Self) -> None:
+        """Forget every recorded request (e.g. between tests)."""
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def _get_shard(self: Self) -> dict[RequestLabels, Histogram]:
+        """Return the shard of the current thread, creating it on the thread's first request."""
+        shard: dict[RequestLabels, Histogram] | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+
+@dataclass
+class PrometheusTextWriter:
+    """Write metric families in the Prometheus text exposition format."""
+
+    lines: list[str] = field(default_factory=list)
+
+    def add_metric(
+        self: Self,
+        name: str,
+        metric_type: str,
+        help_text: str,
+        samples: Iterable[tuple[Mapping[str, str], float]],
+    ) -> None:
+        """Add a counter or gauge, with a sample per set of labels."""
+        self._add_metadata(name, metric_type, help_text)
+        self.lines.extend(f"{name}{format_labels(labels)} {format_value(value)}" for labels, value in samples)
+
+    def add_histogram(
+        self: Self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        histograms: Iterable[tuple[Mapping[str, str], Histogram]],
+    ) -> None:
+        """Add a histogram, with cumulative buckets, a count and a sum per set of labels."""
+        self._add_metadata(name, "histogram", help_text)
+        for labels, histogram in histograms:
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip((*buckets, math.inf), histogram.bucket_counts, strict=True):
+                cumulative_count += bucket_count
+                bucket_labels = {**labels, "le": format_value(upper_bound)}
+                self.lines.append(f"{name}_bucket{format_labels(bucket_labels)} {cumulative_count}")
+            self.lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+            self.lines.append(f"{name}_sum{format_labels(labels)} {format_value(histogram.sum)}")
+
+    def render(self: Self) -> str:
+        """Return the metrics as text."""
+        return "\n".join(self.lines) + "\n"
+
+    def _add_metadata(self: Self, name: str, metric_type: str, help_text: str) -> None:
+        """Add the help text and type of a metric family."""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+
+def format_labels(labels: Mapping[str, str]) -> str:
+    """Return labels formatted as {name="value",...}, or an empty string if there are no labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def escape_label_value(value: str) -> str:
+    """Return label value with backslashes, new lines and double quotes escaped."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    """Return sample value formatted as a Prometheus float (e.g. +Inf)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def add_request_metrics(writer: PrometheusTextWriter, metrics: RequestMetrics) -> None:
+    """Add request latency histograms, whose counts are the number of requests per route and status."""
+    writer.add_histogram(
+        "http_request_duration_seconds",
+        "Seconds taken to respond to HTTP requests, per method, route and status.",
+        metrics.buckets_seconds,
+        (
+            ({"method": labels.method, "route": labels.route, "status": str(labels.status)}, histogram)
+            for labels, histogram in sorted(
+                metrics.collect().items(),
+                key=lambda item: (item[0].route, item[0].method, item[0].status),
+            )
+        ),
+    )
+
+
+def add_pool_metrics(writer: PrometheusTextWriter, pool_stats: Mapping[str, PoolStats | None]) -> None:
+    """Add database connection pool metrics, labelled by engine. Engines without pool stats are skipped."""
+    stats_by_engine = [(engine, stats) for engine, stats in pool_stats.items() if stats is not None]
+    for name, metric_type, help_text, attribute in (
+        ("db_pool_size", "gauge", "Number of connections kept open in the pool.", "pool_size"),
+        ("db_pool_checked_out_connections", "gauge", "Number of connections in use.", "checked_out"),
+        ("db_pool_checked_in_connections", "gauge", "Number of connections idle in the pool.", "checked_in"),
+        ("db_pool_overflow_connections", "gauge", "Number of connections opened beyond the pool size.", "overflow"),
+        ("db_pool_checkouts_total", "counter", "Number of connections checked out.", "checkouts"),
+        ("db_pool_checkout_timeouts_total", "counter", "Number of checkouts which timed out.", "timeouts"),
+        (
+            "db_pool_checkout_wait_seconds_total",
+            "counter",
+            "Seconds spent waiting to check out connections.",
+            "total_wait_seconds",
+        ),
+        (
+            "db_pool_checkout_wait_seconds_max",
+            "gauge",
+            "Longest wait to check out a connection.",
+            "max_wait_seconds",
+        ),
+    ):
+        writer.add_metric(
+            name,
+            metric_type,
+            help_text,
+            (({"engine": engine}, getattr(stats, attribute)) for engine, stats in stats_by_engine),
+        )
+
+
+def add_password_hashing_metrics(writer: PrometheusTextWriter, stats: PasswordHashingStats) -> None:
+    """Add password hashing pool metrics."""
+    for name, metric_type, help_text, value in (
+        ("password_hashing_workers", "gauge", "Number of password hashing worker processes.", stats.max_workers),
+        (
+            "password_hashing_max_queue_size",
+            "gauge",
+            "Number of tasks which can wait for a worker.",
+            stats.max_queue_size,
+        ),
+        ("password_hashing_in_flight_tasks", "gauge", "Number of tasks running or queued.", stats.in_flight),
+        ("password_hashing_queued_tasks", "gauge", "Number of tasks waiting for a worker.", stats.queue_depth),
+        ("password_hashing_completed_total", "counter", "Number of completed tasks.", stats.completed),
+        (
+            "password_hashing_rejected_total",
+            "counter",
+            "Number of tasks rejected as the queue was full.",
+            stats.rejected,
+        ),
+        (
+            "password_hashing_latency_seconds_total",
+            "counter",
+            "Seconds from submitting tasks until they completed.",
+            stats.latency_seconds_total,
+        ),
+        (
+            "password_hashing_latency_seconds_max",
+            "gauge",
+            "Longest time from submitting a task until it completed.",
+            stats.latency_seconds_max,
+        ),
+    ):
+        writer.add_metric(name, metric_type, help_text, [({}, value)])
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,46 @@
+"""Pagination services.
+
+Cursors are opaque tokens for keyset pagination. A cursor is the URL-safe base64 encoding of
+a pydantic model holding the sort key of the last item of a page.
+"""
+
+import base64
+import binascii
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from v1.exceptions.pagination import InvalidCursorError
+
+CursorModel = TypeVar("CursorModel", bound=BaseModel)
+
+
+def encode_cursor(cursor: BaseModel) -> str:
+    """Return cursor model encoded as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, cursor_model: type[CursorModel]) -> CursorModel:
+    """Return cursor model decoded from an opaque token.
+
+    Raise InvalidCursorError if the token is not a valid encoding of the cursor model.
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        return cursor_model.model_validate_json(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError, ValidationError) as e:
+        raise InvalidCursorError(cursor=cursor) from e
+
+
+def get_next_cursor(items: Sequence[Any], limit: int, cursor_model: type[BaseModel]) -> str | None:
+    """Return the cursor to the page after the given items or None if the items are the last page.
+
+    Keyword arguments:
+    items -- items of the current page, which have the attributes of the cursor model
+    limit -- maximum number of items requested for the current page
+    cursor_model -- model of the sort key used to paginate the items
+    """
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(cursor_model.model_validate(items[-1], from_attributes=True))
@@ -0,0 +1,244 @@
+"""Password hashing pool service.
+
+Argon2 is deliberately expensive and holds the CPU while hashing. Running it on the request thread starves every other
+request served by the same worker. Instead, hashing and verification run in a dedicated, size limited process pool.
+
+Once the number of hashing tasks waiting for a worker reaches the maximum queue size, new tasks are rejected with
+PasswordHashingPoolFullError, so callers back off rather than queueing an unbounded amount of work. Each password of
+a batch counts as a task, so a large batch fills the queue, rather than slipping past the bound as a few chunks.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Self, TypeVar
+
+from v1.exceptions.passwords import PasswordHashingPoolFullError
+from v1.services.passwords import hash_password, hash_passwords, is_password_correct, verify_and_rehash_password
+from v1.settings import PASSWORD_HASHING_MAX_QUEUE_SIZE, PASSWORD_HASHING_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of passwords hashed by a single task of a batch. Small chunks release the batch's place in the queue
+# gradually as they complete, so other tasks are admitted again before the whole batch has been hashed.
+HASH_MANY_CHUNK_SIZE = 16
+
+ResultType = TypeVar("ResultType")
+
+
+@dataclass(frozen=True)
+class PasswordHashingStats:
+    """Point in time metrics of the password hashing pool.
+
+    Latency is measured from submitting a task until it completes, so it includes the time spent in the queue.
+    Each password of a batch counts as a task.
+    """
+
+    max_workers: int
+    max_queue_size: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    latency_seconds_total: float
+    latency_seconds_max: float
+
+
+class PasswordHashingPool:
+    """Bounded process pool for hashing and verifying passwords.
+
+    Each method has a sync version, which blocks the calling thread, and an async version, which does not block
+    the event loop.
+    """
+
+    def __init__(self: Self, max_workers: int, max_queue_size: int) -> None:
+        """Set up the pool. Worker processes are started on first use.
+
+        Keyword arguments:
+        max_workers -- number of worker processes hashing passwords
+        max_queue_size -- number of tasks which can wait for a worker before new tasks are rejected
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_seconds_total = 0.0
+        self._latency_seconds_max = 0.0
+
+    def start(self: Self) -> ProcessPoolExecutor:
+        """Start the worker processes, if they are not already running, and return their executor."""
+        with self._lock:
+            if self._executor is None:
+                # Spawn, rather than fork, as forking a process which is running threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def shutdown(self: Self) -> None:
+        """Stop the worker processes once their current tasks are complete."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self: Self) -> PasswordHashingStats:
+        """Return the current metrics of the pool."""
+        with self._lock:
+            return PasswordHashingStats(
+                max_workers=self.max_workers,
+                max_queue_size=self.max_queue_size,
+                in_flight=self._in_flight,
+                queue_depth=max(self._in_flight - self.max_workers, 0),
+                completed=self._completed,
+                rejected=self._rejected,
+                latency_seconds_total=self._latency_seconds_total,
+                latency_seconds_max=self._latency_seconds_max,
+            )
+
+    def hash(self: Self, password: str) -> str:
+        """Return hashed password."""
+        return self._submit(hash_password, password).result()
+
+    async def hash_async(self: Self, password: str) -> str:
+        """Return hashed password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    def hash_many(self: Self, passwords: Sequence[str]) -> list[str]:
+        """Return hashed passwords in the same order as the given passwords, hashing them in parallel."""
+        futures = self._submit_chunks(passwords)
+        try:
+            return [hashed_password for future in futures for hashed_password in future.result()]
+        except BaseException:
+            cancel_futures(futures)
+            raise
+
+    async def hash_many_async(self: Self, passwords: Sequence[str]) -> list[str]:
+        """Return hashed passwords in the same order as the given passwords without blocking the event loop."""
+        futures = self._submit_chunks(passwords)
+        try:
+            chunks = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        except BaseException:
+            cancel_futures(futures)
+            raise
+        return [hashed_password for chunk in chunks for hashed_password in chunk]
+
+    def is_password_correct(self: Self, password: str, hashed_password: str) -> bool:
+        """Return True if plain text password matches hashed password."""
+        return self._submit(is_password_correct, password, hashed_password).result()
+
+    async def is_password_correct_async(self: Self, password: str, hashed_password: str) -> bool:
+        """Return True if plain text password matches hashed password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(is_password_correct, password, hashed_password))
+
+    def verify_and_rehash(self: Self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Return whether plain text password matches hashed password and, if required, an upgraded hash.
+
+        See `verify_and_rehash_password` in the passwords service for details.
+        """
+        return self._submit(verify_and_rehash_password, password, hashed_password).result()
+
+    async def verify_and_rehash_async(self: Self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Return whether plain text password matches hashed password and, if required, an upgraded hash.
+
+        Does not block the event loop. See `verify_and_rehash_password` in the passwords service for details.
+        """
+        return await asyncio.wrap_future(self._submit(verify_and_rehash_password, password, hashed_password))
+
+    def _submit_chunks(self: Self, passwords: Sequence[str]) -> list[Future[list[str]]]:
+        """Submit tasks hashing contiguous chunks of the passwords, spread over the workers.
+
+        The whole batch is admitted or rejected at once, so a batch is never left partly submitted.
+
+        Raise PasswordHashingPoolFullError if the queue does not have room for every password.
+        """
+        self._reserve(len(passwords))
+        chunk_size = min(-(-len(passwords) // self.max_workers), HASH_MANY_CHUNK_SIZE) or 1  # Ceiling division
+        chunks = [passwords[start : start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+        start_time = time.perf_counter()
+        futures: list[Future[list[str]]] = []
+        try:
+            for chunk in chunks:
+                futures.append(self._submit_reserved(start_time, len(chunk), hash_passwords, chunk))
+        except BaseException:
+            cancel_futures(futures)
+            # The chunk which failed to submit has released its places, so release those of the chunks after it
+            self._release(sum(len(chunk) for chunk in chunks[len(futures) + 1 :]))
+            raise
+        return futures
+
+    def _submit(self: Self, func: Callable[..., ResultType], *args: Any) -> Future[ResultType]:  # noqa: ANN401
+        """Submit a task to the worker processes.
+
+        Raise PasswordHashingPoolFullError if the queue is full.
+        """
+        self._reserve(1)
+        return self._submit_reserved(time.perf_counter(), 1, func, *args)
+
+    def _reserve(self: Self, number_of_tasks: int) -> None:
+        """Reserve places in the pool for the tasks.
+
+        A batch larger than the whole pool is only admitted when the pool is idle, as it would otherwise never fit.
+
+        Raise PasswordHashingPoolFullError if the queue does not have room for the tasks.
+        """
+        with self._lock:
+            if self._in_flight > 0 and self._in_flight + number_of_tasks > self.max_workers + self.max_queue_size:
+                self._rejected += number_of_tasks
+                queue_depth = max(self._in_flight - self.max_workers, 0)
+                logger.warning("Password hashing pool is full with %s queued tasks", queue_depth)
+                raise PasswordHashingPoolFullError(queue_depth=queue_depth)
+            self._in_flight += number_of_tasks
+
+    def _release(self: Self, number_of_tasks: int) -> None:
+        """Release places reserved for tasks which were not submitted."""
+        with self._lock:
+            self._in_flight -= number_of_tasks
+
+    def _submit_reserved(
+        self: Self,
+        start_time: float,
+        number_of_tasks: int,
+        func: Callable[..., ResultType],
+        *args: Any,  # noqa: ANN401
+    ) -> Future[ResultType]:
+        """Submit a task, counted as the number of tasks already reserved, to the worker processes."""
+        try:
+            future = self.start().submit(func, *args)
+        except BaseException:
+            self._release(number_of_tasks)
+            raise
+        future.add_done_callback(lambda future: self._record_completion(future, start_time, number_of_tasks))
+        return future
+
+    def _record_completion(self: Self, future: Future[Any], start_time: float, number_of_tasks: int) -> None:
+        """Record the metrics of a completed or cancelled task."""
+        latency_seconds = time.perf_counter() - start_time
+        with self._lock:
+            self._in_flight -= number_of_tasks
+            if future.cancelled():
+                return
+            self._completed += number_of_tasks
+            self._latency_seconds_total += latency_seconds * number_of_tasks
+            self._latency_seconds_max = max(self._latency_seconds_max, latency_seconds)
+
+
+def cancel_futures(futures: Sequence[Future[Any]]) -> None:
+    """Cancel the futures which have not started running, e.g. the rest of a batch which failed."""
+    for future in futures:
+        future.cancel()
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=PASSWORD_HASHING_MAX_WORKERS,
+    max_queue_size=PASSWORD_HASHING_MAX_QUEUE_SIZE,
+)
@@ -1,11 +1,41 @@
 """Services relating to passwords."""
+
+import secrets
+from collections.abc import Iterable
+from functools import cache
+
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
 
+from v1.settings import PASSWORD_HASHING_MEMORY_COST_KIB, PASSWORD_HASHING_PARALLELISM, PASSWORD_HASHING_TIME_COST
+
+password_hasher = PasswordHasher(
+    time_cost=PASSWORD_HASHING_TIME_COST,
+    memory_cost=PASSWORD_HASHING_MEMORY_COST_KIB,
+    parallelism=PASSWORD_HASHING_PARALLELISM,
+)
+
 
 def hash_password(password: str) -> str:
     """Return hashed password."""
-    return PasswordHasher().hash(password)
+    return password_hasher.hash(password)
+
+
+@cache
+def get_unknown_user_hashed_password() -> str:
+    """Return the hash of a random password, created once per process.
+
+    Logins for unknown emails verify the password against this hash, so they take as long as those for known emails.
+    """
+    return hash_password(secrets.token_urlsafe())
+
+
+def hash_passwords(passwords: Iterable[str]) -> list[str]:
+    """Return hashed passwords in the same order as the given passwords.
+
+    To hash passwords in parallel, use the password hashing pool instead.
+    """
+    return [hash_password(password) for password in passwords]
 
 
 def is_password_correct(password: str, hashed_password: str) -> bool:
@@ -20,6 +50,20 @@ def is_password_correct(password: str, hashed_password: str) -> bool:
         -- raised if hash is so clearly invalid, that it couldn't be passed to Argon2
     """
     try:
-        return PasswordHasher().verify(hashed_password, password)
+        return password_hasher.verify(hashed_password, password)
     except (InvalidHashError, VerificationError, VerifyMismatchError):
         return False
+
+
+def verify_and_rehash_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Return whether plain text password matches hashed password and, if required, an upgraded hash.
+
+    The upgraded hash is only returned when the password is correct and the hashed password was created with
+    different parameters to the current settings. Store it in place of the old hash, so that changing the hashing
+    parameters does not require a migration.
+    """
+    if not is_password_correct(password, hashed_password):
+        return False, None
+    if password_hasher.check_needs_rehash(hashed_password):
+        return True, hash_password(password)
+    return True, None
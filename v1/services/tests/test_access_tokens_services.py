@@ -0,0 +1,158 @@
+"""Test access token services."""
+
+import hashlib
+import hmac
+import uuid
+from collections.abc import Callable
+
+import pytest
+
+from v1.exceptions.auth import InvalidAccessTokenError
+from v1.services.access_tokens import (
+    EPHEMERAL_KEY_ID,
+    AccessTokenKeySet,
+    RevokedAccessTokens,
+    encode_base64url,
+    issue_access_token,
+    load_access_token_key_set,
+    verify_access_token,
+)
+from v1.test_fixtures.clocks import FakeClock
+
+CURRENT_SECRET = "current-secret-which-is-32-bytes"  # nosec: hardcoded_password_string
+PREVIOUS_SECRET = "previous-secret-which-is-32-byte"  # nosec: hardcoded_password_string
+
+
+@pytest.fixture(name="key_set")
+def fixture_key_set() -> AccessTokenKeySet:
+    """Return a key set which signs with its current key and also verifies with its previous key."""
+    return AccessTokenKeySet.from_string(f"current:{CURRENT_SECRET},previous:{PREVIOUS_SECRET}")
+
+
+def test_issue_and_verify_access_token(key_set: AccessTokenKeySet, clock: FakeClock):
+    """Test an access token is valid until it expires."""
+    # Given
+    user_id = uuid.uuid4()
+    clock.now = 1_000_000
+    revoked_tokens = RevokedAccessTokens(clock)
+
+    # When
+    token = issue_access_token(user_id, key_set, ttl_seconds=60, clock=clock)
+
+    # Then
+    claims = verify_access_token(token, key_set, revoked_tokens, clock)
+    assert claims.sub == user_id
+    assert claims.iat == 1_000_000
+    assert claims.exp == 1_000_060
+
+    clock.now += 60
+    with pytest.raises(InvalidAccessTokenError) as exc_info:
+        verify_access_token(token, key_set, revoked_tokens, clock)
+    assert exc_info.value.reason == "Token has expired"
+
+
+def test_verify_access_token_signed_with_a_previous_key(key_set: AccessTokenKeySet, clock: FakeClock):
+    """Test tokens signed with a key which has been rotated are valid, but those signed with a removed key are not."""
+    # Given
+    token = issue_access_token(uuid.uuid4(), AccessTokenKeySet.from_string(f"previous:{PREVIOUS_SECRET}"), clock=clock)
+
+    # When, Then
+    assert verify_access_token(token, key_set, RevokedAccessTokens(clock), clock) is not None
+    with pytest.raises(InvalidAccessTokenError) as exc_info:
+        verify_access_token(token, AccessTokenKeySet.from_string(f"current:{CURRENT_SECRET}"), clock=clock)
+    assert exc_info.value.reason == "Unknown signing key"
+
+
+@pytest.mark.parametrize(
+    ("tamper", "expected_reason"),
+    [
+        (lambda token: token.rsplit(".", 1)[0] + "." + encode_base64url(b"forged"), "Invalid signature"),
+        (lambda token: AccessTokenKeySet.encode_header("previous") + token[token.index(".") :], "Invalid signature"),
+        (
+            lambda token: encode_base64url(b'{"alg":"none","typ":"JWT"}') + token[token.index(".") :],
+            "Unknown signing key",
+        ),
+        (lambda token: token.rsplit(".", 1)[0], "Malformed token"),
+        (lambda token: token + "$", "Malformed token"),
+        (lambda token: token.split(".")[0] + ".e30." + token.split(".")[2], "Invalid signature"),
+    ],
+)
+def test_verify_tampered_access_token_fails(
+    tamper: Callable[[str], str],
+    expected_reason: str,
+    key_set: AccessTokenKeySet,
+    clock: FakeClock,
+):
+    """Test tokens which have been tampered with are not valid."""
+    # Given
+    token = issue_access_token(uuid.uuid4(), key_set, clock=clock)
+
+    # When, Then
+    with pytest.raises(InvalidAccessTokenError) as exc_info:
+        verify_access_token(tamper(token), key_set, clock=clock)
+    assert exc_info.value.reason == expected_reason
+
+
+def test_verify_access_token_with_invalid_claims_fails(key_set: AccessTokenKeySet, clock: FakeClock):
+    """Test a correctly signed token whose claims are not valid is rejected."""
+    # Given
+    signing_input = f"{AccessTokenKeySet.encode_header('current')}.{encode_base64url(b'{}')}"
+    signature = hmac.digest(CURRENT_SECRET.encode(), signing_input.encode(), hashlib.sha256)
+
+    # When, Then
+    with pytest.raises(InvalidAccessTokenError) as exc_info:
+        verify_access_token(f"{signing_input}.{encode_base64url(signature)}", key_set, clock=clock)
+    assert exc_info.value.reason == "Malformed token"
+
+
+def test_revoked_access_token_fails(key_set: AccessTokenKeySet, clock: FakeClock):
+    """Test revoked tokens are not valid and are forgotten once they expire."""
+    # Given
+    revoked_tokens = RevokedAccessTokens(clock)
+    token = issue_access_token(uuid.uuid4(), key_set, ttl_seconds=60, clock=clock)
+    other_token = issue_access_token(uuid.uuid4(), key_set, ttl_seconds=60, clock=clock)
+
+    # When
+    revoked_tokens.revoke(verify_access_token(token, key_set, revoked_tokens, clock))
+
+    # Then
+    with pytest.raises(InvalidAccessTokenError) as exc_info:
+        verify_access_token(token, key_set, revoked_tokens, clock)
+    assert exc_info.value.reason == "Token has been revoked"
+    assert verify_access_token(other_token, key_set, revoked_tokens, clock) is not None
+
+    # Expired tokens are pruned from the revocation list when another token is revoked
+    clock.now += 60
+    later_token = issue_access_token(uuid.uuid4(), key_set, ttl_seconds=60, clock=clock)
+    revoked_tokens.revoke(verify_access_token(later_token, key_set, revoked_tokens, clock))
+    assert len(revoked_tokens) == 1
+
+
+@pytest.mark.parametrize(
+    "keys",
+    ["", "no-secret", f":{CURRENT_SECRET}", "key-id:", f"a:{CURRENT_SECRET},,b:{PREVIOUS_SECRET}"],
+)
+def test_parse_invalid_access_token_key_set_fails(keys: str):
+    """Test keys must be comma separated key id and secret pairs."""
+    with pytest.raises(ValueError, match="key id and secret pairs"):
+        AccessTokenKeySet.from_string(keys)
+
+
+def test_parse_access_token_key_set_with_a_short_secret_fails():
+    """Test secrets shorter than the minimum are rejected, as they could be guessed."""
+    with pytest.raises(ValueError, match="'previous' must be at least 32 bytes long"):
+        AccessTokenKeySet.from_string(f"current:{CURRENT_SECRET},previous:{PREVIOUS_SECRET[:31]}")
+
+
+def test_load_access_token_key_set(caplog: pytest.LogCaptureFixture):
+    """Test a random key is only used when no keys are set and it is allowed."""
+    # When
+    key_set = load_access_token_key_set(f"current:{CURRENT_SECRET}", allow_ephemeral_key=False)
+    ephemeral_key_set = load_access_token_key_set("", allow_ephemeral_key=True)
+
+    # Then
+    assert key_set.signing_key_id == "current"
+    assert ephemeral_key_set.signing_key_id == EPHEMERAL_KEY_ID
+    assert "ACCESS_TOKEN_SIGNING_KEYS is not set" in caplog.text
+    with pytest.raises(ValueError, match="ACCESS_TOKEN_SIGNING_KEYS must be set"):
+        load_access_token_key_set("", allow_ephemeral_key=False)
@@ -0,0 +1,327 @@
+"""Test async users service."""
+
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from argon2 import PasswordHasher
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.exceptions.users import (
+    UserAlreadyExistsError,
+    UserEmailUndeliverableError,
+    UserHasBeenPreviouslyDeletedError,
+    UserIdDoesNotExistError,
+)
+from v1.schemas.users import BulkCreateUserStatus, CreateUserRequest, CreateUserService, UpdateUserService
+from v1.services.async_users import (
+    authenticate_user,
+    create_user,
+    create_users,
+    get_user_from_email,
+    get_user_from_id,
+    get_user_snapshot_from_id,
+    get_users,
+    is_user_password_correct,
+    soft_delete_user,
+    update_user_using_id,
+)
+from v1.services.email_deliverability import DomainDeliverability, email_deliverability_cache
+from v1.services.passwords import is_password_correct, password_hasher
+from v1.test_fixtures.emails import StubDeliverabilityResolver
+
+
+@pytest.mark.asyncio()
+async def test_create_user(async_db_session: AsyncSession, create_user_request: CreateUserRequest):
+    """Test async service for creating a user."""
+    # Given
+    user = CreateUserService(**create_user_request.model_dump())
+
+    # When
+    db_user = await create_user(async_db_session, user)
+
+    # Then
+    # Verify the user fields
+    assert db_user.id is not None
+    assert db_user.first_name == user.first_name
+    assert db_user.last_name == user.last_name
+    assert db_user.email == user.email
+    assert db_user.hashed_password is not None
+    assert db_user.is_superuser is user.is_superuser
+    # Verify the columns generated by the database are loaded
+    assert db_user.created_at is not None
+    assert db_user.updated_at is not None
+
+    # Verify the database has a record
+    users = (await async_db_session.scalars(select(User).filter_by(email=db_user.email))).all()
+    assert len(users) == 1
+
+
+@pytest.mark.asyncio()
+async def test_create_user_who_already_exists_fails(
+    async_db_session: AsyncSession,
+    create_user_request: CreateUserRequest,
+):
+    """Test async service for creating a user fails when a user with the same email already exists."""
+    # Given
+    existing_user_id = str(UserFactory(email=create_user_request.email).id)
+    await async_db_session.commit()
+    user = CreateUserService(**create_user_request.model_dump())
+
+    # When
+    with pytest.raises(UserAlreadyExistsError):
+        await create_user(async_db_session, user)
+
+    # Then
+    users = (await async_db_session.scalars(select(User).filter_by(email=user.email))).all()
+    assert len(users) == 1
+    assert str(users[0].id) == existing_user_id
+
+
+@pytest.mark.asyncio()
+async def test_create_user_with_an_undeliverable_email_fails(
+    async_db_session: AsyncSession,
+    create_user_request: CreateUserRequest,
+    stub_deliverability_resolver: StubDeliverabilityResolver,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test async service checks deliverability off the event loop, as it may query the DNS."""
+    # Given
+    user = CreateUserService(**{**create_user_request.model_dump(), "email": "mary.magdela@elpaso-university.com"})
+    resolver_threads = []
+
+    def resolve(ascii_domain: str) -> DomainDeliverability:
+        resolver_threads.append(threading.current_thread())
+        return stub_deliverability_resolver(ascii_domain)
+
+    monkeypatch.setattr(email_deliverability_cache, "resolver", resolve)
+
+    # When
+    with pytest.raises(UserEmailUndeliverableError):
+        await create_user(async_db_session, user)
+    with pytest.raises(UserEmailUndeliverableError):
+        await update_user_using_id(async_db_session, uuid.uuid4(), UpdateUserService(email="mary@elpaso-college.com"))
+
+    # Then
+    assert len(resolver_threads) == 2
+    assert threading.current_thread() not in resolver_threads
+    users = (await async_db_session.scalars(select(User).filter_by(email=user.email))).all()
+    assert users == []
+
+
+@pytest.mark.asyncio()
+async def test_create_users(async_db_session: AsyncSession, create_user_request: CreateUserRequest):
+    """Test async service for creating many users at once."""
+    # Given
+    existing_user = UserFactory()
+    await async_db_session.commit()
+    new_user = CreateUserService(**create_user_request.model_dump())
+    existing_user_request = CreateUserService(
+        **{**create_user_request.model_dump(), "email": existing_user.email},
+    )
+
+    # When
+    results = await create_users(async_db_session, [new_user, existing_user_request, new_user])
+
+    # Then
+    assert [result.status for result in results] == [
+        BulkCreateUserStatus.CREATED,
+        BulkCreateUserStatus.ALREADY_EXISTS,
+        BulkCreateUserStatus.DUPLICATE_IN_REQUEST,
+    ]
+    assert results[0].user is not None
+    assert results[0].user.email == new_user.email
+    users = (await async_db_session.scalars(select(User).filter_by(email=new_user.email))).all()
+    assert len(users) == 1
+
+
+@pytest.mark.asyncio()
+async def test_get_user_from_id(async_db_session: AsyncSession):
+    """Test async service for getting a user from an id."""
+    # Given
+    user = UserFactory()
+    UserFactory()
+    await async_db_session.commit()
+
+    # When
+    db_user = await get_user_from_id(async_db_session, user_id=user.id)
+    db_user_from_random_id = await get_user_from_id(async_db_session, user_id=uuid.uuid4())
+
+    # Then
+    assert db_user is not None
+    assert str(db_user.id) == str(user.id)
+    assert db_user.email == user.email
+    assert db_user_from_random_id is None
+
+
+@pytest.mark.asyncio()
+async def test_get_user_snapshot_from_id(async_db_session: AsyncSession):
+    """Test async service for reading a user snapshot is served from the user cache until the user is deleted."""
+    # Given
+    user = UserFactory(first_name="Mary", last_name="Magdela")
+    await async_db_session.commit()
+    user_id = uuid.UUID(user.id)
+
+    # When
+    user_snapshot = await get_user_snapshot_from_id(async_db_session, user_id)
+    cached_user_snapshot = await get_user_snapshot_from_id(async_db_session, user_id)
+
+    # Then
+    assert user_snapshot is not None
+    assert user_snapshot.first_name == "Mary"
+    assert cached_user_snapshot is user_snapshot
+    # Verify soft deleting the user through the users service invalidates the cache
+    await soft_delete_user(async_db_session, user_id)
+    deleted_user_snapshot = await get_user_snapshot_from_id(async_db_session, user_id)
+    assert deleted_user_snapshot is not None
+    assert deleted_user_snapshot.deleted_at is not None
+
+
+@pytest.mark.asyncio()
+async def test_get_user_from_email(async_db_session: AsyncSession):
+    """Test async service for getting a user from an email."""
+    # Given
+    user = UserFactory()
+    UserFactory()
+    await async_db_session.commit()
+
+    # When
+    db_user = await get_user_from_email(async_db_session, email=user.email)
+    db_user_from_random_email = await get_user_from_email(async_db_session, email="jane.doe@yahoo.com")
+
+    # Then
+    assert db_user is not None
+    assert str(db_user.id) == str(user.id)
+    assert db_user.email == user.email
+    assert db_user_from_random_email is None
+
+
+@pytest.mark.asyncio()
+async def test_get_users(async_db_session: AsyncSession):
+    """Test async service for getting users."""
+    # Given
+    UserFactory.create_batch(30)
+    await async_db_session.commit()
+    expected_users = (
+        await async_db_session.scalars(
+            select(User).order_by(User.first_name.asc(), User.last_name.asc(), User.id.asc()),
+        )
+    ).all()
+
+    # When
+    page_1_db_users = await get_users(async_db_session, offset=0, limit=20)
+    page_2_db_users = await get_users(async_db_session, offset=20, limit=20)
+
+    # Then
+    assert len(page_1_db_users) == 20
+    assert len(page_2_db_users) == 10
+    assert [*page_1_db_users, *page_2_db_users] == list(expected_users)
+
+
+@pytest.mark.asyncio()
+async def test_update_user(async_db_session: AsyncSession):
+    """Test async service for updating a user."""
+    # Given
+    user = UserFactory(first_name="Mary", last_name="Magdela", is_superuser=False)
+    await async_db_session.commit()
+    user_hashed_password = user.hashed_password
+
+    # When
+    user_update = UpdateUserService(last_name="Salvae", password="MySuperCoolPassword@789!!")
+    updated_user = await update_user_using_id(async_db_session, user_id=user.id, update_user_data=user_update)
+
+    # Then
+    db_user = await get_user_from_id(async_db_session, user_id=user.id)
+    assert db_user is not None
+    assert updated_user is db_user
+    # Verify fields on user that should not be changed
+    assert db_user.first_name == "Mary"
+    assert db_user.is_superuser is False
+    assert db_user.deleted_at is None
+    # Verify fields on user that should be changed
+    assert db_user.last_name == "Salvae"
+    assert db_user.hashed_password != user_hashed_password
+
+
+@pytest.mark.asyncio()
+async def test_is_user_password_correct(async_db_session: AsyncSession):
+    """Test async service for verifying a user's password upgrades a hash created with outdated parameters."""
+    # Given a user whose password was hashed with cheaper parameters than the current settings
+    outdated_hashed_password = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("MyPassword37!")
+    user = UserFactory(hashed_password=outdated_hashed_password)
+    await async_db_session.commit()
+
+    # When
+    is_correct = await is_user_password_correct(async_db_session, user, "MyPassword37!")
+
+    # Then
+    assert is_correct is True
+    db_user = await get_user_from_id(async_db_session, user_id=user.id)
+    assert db_user is not None
+    assert password_hasher.check_needs_rehash(db_user.hashed_password) is False
+    assert is_password_correct("MyPassword37!", db_user.hashed_password) is True
+
+
+@pytest.mark.asyncio()
+async def test_authenticate_user(async_db_session: AsyncSession):
+    """Test only users who have not been deleted can authenticate with the async service, using their password."""
+    # Given
+    user = UserFactory()
+    deleted_user = UserFactory(deleted_at=datetime.now(timezone.utc))
+    await async_db_session.commit()
+
+    # When, Then
+    assert (await authenticate_user(async_db_session, user.email, UserFactory.password)).email == user.email
+    assert await authenticate_user(async_db_session, user.email, "=TopSecRET42") is None
+    assert await authenticate_user(async_db_session, "unknown.user@gmail.com", UserFactory.password) is None
+    assert await authenticate_user(async_db_session, deleted_user.email, UserFactory.password) is None
+
+
+@pytest.mark.asyncio()
+async def test_soft_delete_user(async_db_session: AsyncSession):
+    """Test async service for soft deleting a user."""
+    # Given
+    user = UserFactory()
+    await async_db_session.commit()
+    # Allow for slight variance between system clock and database clock (i.e. use timedelta)
+    datetime_before_request = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    # When
+    await soft_delete_user(async_db_session, user.id)
+    datetime_after_request = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    # Then
+    db_user = await get_user_from_id(async_db_session, user_id=user.id)
+    assert db_user is not None
+    assert db_user.deleted_at is not None
+    assert db_user.deleted_at > datetime_before_request
+    assert db_user.deleted_at < datetime_after_request
+
+
+@pytest.mark.asyncio()
+async def test_soft_delete_user_with_a_user_id_which_does_not_match_any_users_fails(async_db_session: AsyncSession):
+    """Test async service for soft deleting a user who does not exist fails."""
+    with pytest.raises(UserIdDoesNotExistError):
+        await soft_delete_user(async_db_session, uuid.uuid4())
+
+
+@pytest.mark.asyncio()
+async def test_soft_delete_user_who_has_been_previously_deleted_fails(async_db_session: AsyncSession):
+    """Test async service for soft deleting a user who has been previously deleted fails."""
+    # Given
+    user_deleted_at = datetime(2009, 1, 27, 3, 4, 52, 63870, tzinfo=timezone.utc)
+    user = UserFactory(deleted_at=user_deleted_at)
+    await async_db_session.commit()
+
+    # When
+    with pytest.raises(UserHasBeenPreviouslyDeletedError):
+        await soft_delete_user(async_db_session, user.id)
+
+    # Then
+    db_user = await get_user_from_id(async_db_session, user_id=user.id)
+    assert db_user is not None
+    assert db_user.deleted_at == user_deleted_at
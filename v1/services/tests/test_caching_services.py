@@ -0,0 +1,94 @@
+"""Test in-process caching services."""
+
+import pytest
+
+from v1.services.caching import CacheStats, TtlLruCache
+from v1.test_fixtures.clocks import FakeClock
+
+
+@pytest.fixture()
+def cache(clock: FakeClock) -> TtlLruCache[str, int]:
+    """Return an empty cache which holds two entries for 60 seconds."""
+    return TtlLruCache(ttl_seconds=60, max_size=2, clock=clock)
+
+
+def test_get_and_set(cache: TtlLruCache[str, int]):
+    """Test cached values are returned and missing values are counted as misses."""
+    cache.set("one", 1)
+
+    assert cache.get("one") == 1
+    assert cache.get("two") is None
+    assert cache.stats() == CacheStats(size=1, max_size=2, hits=1, misses=1, evictions=0, invalidations=0)
+
+
+def test_get_expired_value(cache: TtlLruCache[str, int], clock: FakeClock):
+    """Test values expire after the cache's time to live, or the time to live they were set with."""
+    cache.set("one", 1)
+    cache.set("two", 2, ttl_seconds=10)
+
+    clock.now = 10
+    assert cache.get("one") == 1
+    assert cache.get("two") is None
+
+    clock.now = 60
+    assert cache.get("one") is None
+    assert cache.stats().size == 0
+
+
+def test_set_evicts_least_recently_used_value(cache: TtlLruCache[str, int]):
+    """Test the least recently used value is evicted once the cache is full."""
+    # Given a full cache, where "one" is the least recently used value
+    cache.set("one", 1)
+    cache.set("two", 2)
+    cache.get("one")
+
+    # When
+    cache.set("three", 3)
+
+    # Then
+    assert cache.get("two") is None
+    assert cache.get("one") == 1
+    assert cache.get("three") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_invalidate(cache: TtlLruCache[str, int]):
+    """Test invalidated values are removed and change the generation."""
+    cache.set("one", 1)
+    cache.set("two", 2)
+    generation = cache.generation
+
+    cache.invalidate("one", "three")
+
+    assert cache.get("one") is None
+    assert cache.get("two") == 2
+    assert cache.generation != generation
+    assert cache.stats().invalidations == 1
+
+
+def test_invalidate_all(cache: TtlLruCache[str, int]):
+    """Test invalidating all values removes them, but keeps the metrics."""
+    cache.set("one", 1)
+    cache.set("two", 2)
+    cache.get("one")
+
+    cache.invalidate_all()
+
+    assert cache.get("one") is None
+    assert cache.stats() == CacheStats(size=0, max_size=2, hits=1, misses=1, evictions=0, invalidations=2)
+
+
+def test_set_with_an_outdated_generation(cache: TtlLruCache[str, int]):
+    """Test a value loaded before an invalidation is not cached, as it may be stale."""
+    # Given a value was loaded and then invalidated before it was cached
+    generation = cache.generation
+    cache.invalidate("one")
+
+    # When
+    cache.set("one", 1, generation=generation)
+
+    # Then
+    assert cache.get("one") is None
+    # Verify a value loaded after the invalidation is cached
+    cache.set("one", 1, generation=cache.generation)
+    assert cache.get("one") == 1
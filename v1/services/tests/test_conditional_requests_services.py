@@ -0,0 +1,102 @@
+"""Test conditional request services."""
+
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from v1.services.conditional_requests import (
+    get_conditional_headers,
+    get_etag,
+    get_last_modified,
+    is_not_modified,
+)
+
+LAST_MODIFIED = datetime(2026, 10, 18, 13, 0, 0, 500000, tzinfo=timezone.utc)
+LAST_MODIFIED_HTTP_DATE = "Sun, 18 Oct 2026 13:00:00 GMT"
+
+
+@dataclass(frozen=True)
+class Resource:
+    """Versioned resource."""
+
+    id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime | None
+
+
+def create_resource(updated_at: datetime | None = LAST_MODIFIED) -> Resource:
+    """Return a resource with a random id."""
+    return Resource(id=uuid.uuid4(), created_at=LAST_MODIFIED - timedelta(days=1), updated_at=updated_at)
+
+
+def test_get_last_modified_falls_back_to_created_at() -> None:
+    """Test that the last modified time is the updated time or, if never updated, the created time."""
+    resource = create_resource()
+
+    assert get_last_modified(resource) == LAST_MODIFIED
+    assert get_last_modified(replace(resource, updated_at=None)) == resource.created_at
+
+
+def test_get_etag_is_strong_and_changes_with_the_resources() -> None:
+    """Test that the ETag is a strong ETag which only changes when the resources or their order change."""
+    resource_1 = create_resource()
+    resource_2 = create_resource()
+
+    etag = get_etag([resource_1, resource_2])
+
+    assert etag.startswith('"')
+    assert etag.endswith('"')
+    assert get_etag([resource_1, resource_2]) == etag
+    assert get_etag([resource_2, resource_1]) != etag
+    assert get_etag([resource_1]) != etag
+    assert get_etag([replace(resource_1, updated_at=LAST_MODIFIED + timedelta(microseconds=1)), resource_2]) != etag
+
+
+def test_get_conditional_headers() -> None:
+    """Test that Last-Modified is an HTTP date in GMT, and is omitted if unknown."""
+    assert get_conditional_headers('"abc"', LAST_MODIFIED) == {
+        "ETag": '"abc"',
+        "Last-Modified": LAST_MODIFIED_HTTP_DATE,
+    }
+    assert get_conditional_headers('"abc"', LAST_MODIFIED.astimezone(timezone(timedelta(hours=10)))) == {
+        "ETag": '"abc"',
+        "Last-Modified": LAST_MODIFIED_HTTP_DATE,
+    }
+    assert get_conditional_headers('"abc"', None) == {"ETag": '"abc"'}
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "if_modified_since", "expected_is_not_modified"),
+    [
+        (None, None, False),
+        ('"abc"', None, True),
+        ('"xyz", W/"abc"', None, True),
+        ("*", None, True),
+        ('"xyz"', None, False),
+        # If-None-Match takes precedence over If-Modified-Since
+        ('"xyz"', LAST_MODIFIED_HTTP_DATE, False),
+        (None, LAST_MODIFIED_HTTP_DATE, True),
+        (None, "Sun, 18 Oct 2026 14:00:00 GMT", True),
+        (None, "Sun, 18 Oct 2026 12:59:59 GMT", False),
+        (None, "not a date", False),
+        (None, "Sun, 18 Oct 2026 13:00:00", False),
+    ],
+    ids=[
+        "no-conditions",
+        "etag-matches",
+        "etag-in-list-matches",
+        "any-etag",
+        "etag-does-not-match",
+        "etag-precedence",
+        "not-modified-since",
+        "not-modified-since-later",
+        "modified-since",
+        "invalid-date",
+        "date-without-timezone",
+    ],
+)
+def test_is_not_modified(if_none_match: str | None, if_modified_since: str | None, expected_is_not_modified: bool):
+    """Test that If-None-Match and If-Modified-Since are evaluated against the resource's ETag and last modified."""
+    assert is_not_modified(if_none_match, if_modified_since, '"abc"', LAST_MODIFIED) is expected_is_not_modified
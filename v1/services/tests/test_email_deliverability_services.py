@@ -0,0 +1,151 @@
+"""Test email deliverability services."""
+
+import threading
+import time
+
+import pytest
+from email_validator import EmailUndeliverableError
+from pytest_mock import MockerFixture
+
+from v1.services.email_deliverability import (
+    DnsDeliverabilityResolver,
+    DomainDeliverability,
+    EmailDeliverabilityCache,
+)
+from v1.test_fixtures.clocks import FakeClock
+from v1.test_fixtures.emails import StubDeliverabilityResolver
+
+
+@pytest.fixture()
+def resolver() -> StubDeliverabilityResolver:
+    """Return a stub resolver which treats gmail.com as the only deliverable domain."""
+    return StubDeliverabilityResolver(deliverable_domains={"gmail.com"})
+
+
+@pytest.fixture()
+def cache(resolver: StubDeliverabilityResolver, clock: FakeClock) -> EmailDeliverabilityCache:
+    """Return an empty cache with a short time to live for undeliverable domains."""
+    return EmailDeliverabilityCache(resolver, ttl_seconds=60, negative_ttl_seconds=10, max_size=2, clock=clock)
+
+
+def test_get_deliverability_resolves_each_domain_once(
+    cache: EmailDeliverabilityCache,
+    resolver: StubDeliverabilityResolver,
+):
+    """Test a domain is resolved once and then served from the cache."""
+    # When
+    deliverabilities = [cache.get_deliverability("gmail.com") for _ in range(3)]
+
+    # Then
+    assert deliverabilities == [DomainDeliverability(is_deliverable=True)] * 3
+    assert resolver.resolved_domains == ["gmail.com"]
+    stats = cache.stats()
+    assert (stats.size, stats.hits, stats.misses, stats.evictions) == (1, 2, 1, 0)
+
+
+def test_get_deliverability_resolves_domains_again_after_their_time_to_live(
+    cache: EmailDeliverabilityCache,
+    resolver: StubDeliverabilityResolver,
+    clock: FakeClock,
+):
+    """Test deliverable domains are cached for the TTL and undeliverable domains for the negative TTL."""
+    # Given
+    cache.get_deliverability("gmail.com")
+    cache.get_deliverability("example.tld")
+
+    # When the negative TTL has passed
+    clock.now = 10
+    cache.get_deliverability("gmail.com")
+    cache.get_deliverability("example.tld")
+    # Then only the undeliverable domain is resolved again
+    assert resolver.resolved_domains == ["gmail.com", "example.tld", "example.tld"]
+
+    # When the TTL has passed
+    clock.now = 60
+    cache.get_deliverability("gmail.com")
+    # Then the deliverable domain is resolved again
+    assert resolver.resolved_domains == ["gmail.com", "example.tld", "example.tld", "gmail.com"]
+
+
+def test_get_deliverability_evicts_least_recently_used_domain(
+    cache: EmailDeliverabilityCache,
+    resolver: StubDeliverabilityResolver,
+):
+    """Test the least recently used domain is evicted once the cache is full."""
+    # Given a full cache, where yahoo.com is the least recently used domain
+    cache.get_deliverability("yahoo.com")
+    cache.get_deliverability("gmail.com")
+
+    # When
+    cache.get_deliverability("example.tld")
+    cache.get_deliverability("gmail.com")
+    cache.get_deliverability("yahoo.com")
+
+    # Then
+    assert resolver.resolved_domains == ["yahoo.com", "gmail.com", "example.tld", "yahoo.com"]
+    assert cache.stats().evictions == 2
+    assert cache.stats().size == 2
+
+
+def test_get_deliverability_does_not_cache_unknown_deliverability(clock: FakeClock, mocker: MockerFixture):
+    """Test a domain whose deliverability could not be determined (e.g. DNS timeout) is resolved again."""
+    resolver = mocker.Mock(return_value=None)
+    cache = EmailDeliverabilityCache(resolver, ttl_seconds=60, negative_ttl_seconds=10, max_size=2, clock=clock)
+
+    assert cache.get_deliverability("gmail.com") is None
+    assert cache.get_deliverability("gmail.com") is None
+    assert resolver.call_count == 2
+
+
+def test_get_deliverability_resolves_a_domain_once_when_checked_concurrently(clock: FakeClock):
+    """Test concurrent checks of an uncached domain wait for a single lookup."""
+    # Given a slow resolver
+    resolver = StubDeliverabilityResolver(deliverable_domains={"gmail.com"})
+
+    def slow_resolver(ascii_domain: str) -> DomainDeliverability:
+        time.sleep(0.1)
+        return resolver(ascii_domain)
+
+    cache = EmailDeliverabilityCache(slow_resolver, ttl_seconds=60, negative_ttl_seconds=10, max_size=2, clock=clock)
+
+    # When
+    threads = [threading.Thread(target=cache.get_deliverability, args=("gmail.com",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then
+    assert resolver.resolved_domains == ["gmail.com"]
+
+
+def test_raise_if_undeliverable(cache: EmailDeliverabilityCache):
+    """Test an error is raised only for undeliverable domains."""
+    cache.raise_if_undeliverable("gmail.com")
+    with pytest.raises(EmailUndeliverableError, match="The domain name example.tld does not exist."):
+        cache.raise_if_undeliverable("example.tld")
+
+
+@pytest.mark.parametrize(
+    ("deliverability_info", "side_effect", "expected_deliverability"),
+    [
+        ({"mx": [(10, "mx.gmail.com")], "mx_fallback_type": None}, None, DomainDeliverability(is_deliverable=True)),
+        ({"unknown-deliverability": "timeout"}, None, None),
+        (None, EmailUndeliverableError("No MX"), DomainDeliverability(is_deliverable=False, reason="No MX")),
+    ],
+)
+def test_dns_deliverability_resolver(
+    mocker: MockerFixture,
+    deliverability_info: dict | None,
+    side_effect: Exception | None,
+    expected_deliverability: DomainDeliverability | None,
+):
+    """Test the DNS resolver maps DNS results to deliverability."""
+    mock_validate_email_deliverability = mocker.patch(
+        "email_validator.deliverability.validate_email_deliverability",
+        return_value=deliverability_info,
+        side_effect=side_effect,
+    )
+
+    assert DnsDeliverabilityResolver(timeout_seconds=3)("gmail.com") == expected_deliverability
+    mock_validate_email_deliverability.assert_called_once_with("gmail.com", "gmail.com", 3)
@@ -4,6 +4,7 @@ import pytest
 from email_validator import EmailNotValidError, EmailSyntaxError, EmailUndeliverableError
 
 from v1.services.emails import validate_and_normalize_email
+from v1.test_fixtures.emails import StubDeliverabilityResolver
 
 
 @pytest.mark.parametrize(
@@ -64,3 +65,24 @@ def test_validate_and_normalize_email_with_invalid_emails(email: str) -> None:
 
     with pytest.raises(EmailSyntaxError):
         validate_and_normalize_email(email, check_deliverability=True)
+
+
+def test_validate_and_normalize_email_checks_deliverability_once_per_domain(
+    stub_deliverability_resolver: StubDeliverabilityResolver,
+) -> None:
+    """Test validating many emails with the same domain only checks the domain's deliverability once."""
+    validate_and_normalize_email("john.smith@gmail.com")
+    validate_and_normalize_email("jane.smith@gmail.com")
+    for _ in range(2):
+        with pytest.raises(EmailUndeliverableError):
+            validate_and_normalize_email("Abc@example.tld")
+
+    assert stub_deliverability_resolver.resolved_domains == ["gmail.com", "example.tld"]
+
+
+def test_validate_and_normalize_email_without_checking_deliverability(
+    stub_deliverability_resolver: StubDeliverabilityResolver,
+) -> None:
+    """Test validating an email without checking deliverability does not resolve the domain."""
+    assert validate_and_normalize_email("Abc@example.tld", check_deliverability=False) == "Abc@example.tld"
+    assert stub_deliverability_resolver.resolved_domains == []
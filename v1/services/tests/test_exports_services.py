@@ -0,0 +1,96 @@
+"""Test export services."""
+
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from v1.services.exports import ExportEncoder, ExportFormat, aiter_export, iter_export
+
+
+class Row(BaseModel):
+    """Exported row."""
+
+    name: str
+    count: int
+    created_at: datetime
+    deleted_at: datetime | None = None
+
+
+ROWS = [
+    SimpleNamespace(name="Zoë", count=1, created_at=datetime(2026, 10, 18, tzinfo=timezone.utc), deleted_at=None),
+    SimpleNamespace(
+        name='Quote " and, comma',
+        count=2,
+        created_at=datetime(2026, 10, 18, 1, tzinfo=timezone.utc),
+        deleted_at=datetime(2026, 10, 18, 2, tzinfo=timezone.utc),
+    ),
+]
+
+
+def test_encode_rows_as_ndjson():
+    """Test that each row is encoded as a JSON object on its own line."""
+    # Given
+    encoder = ExportEncoder(Row, ExportFormat.NDJSON)
+
+    # When
+    header = encoder.encode_header()
+    lines = encoder.encode_rows(ROWS).decode().splitlines()
+
+    # Then
+    assert header == b""
+    assert [json.loads(line) for line in lines] == [
+        {"name": "Zoë", "count": 1, "created_at": "2026-10-18T00:00:00Z", "deleted_at": None},
+        {
+            "name": 'Quote " and, comma',
+            "count": 2,
+            "created_at": "2026-10-18T01:00:00Z",
+            "deleted_at": "2026-10-18T02:00:00Z",
+        },
+    ]
+
+
+def test_encode_rows_as_csv():
+    """Test that the header and rows are encoded as CSV lines, quoting values where needed."""
+    # Given
+    encoder = ExportEncoder(Row, ExportFormat.CSV)
+
+    # When
+    export = encoder.encode_header() + encoder.encode_rows(ROWS)
+
+    # Then
+    assert export.decode().splitlines() == [
+        "name,count,created_at,deleted_at",
+        "Zoë,1,2026-10-18T00:00:00Z,",
+        '"Quote "" and, comma",2,2026-10-18T01:00:00Z,2026-10-18T02:00:00Z',
+    ]
+
+
+@pytest.mark.parametrize(
+    ("export_format", "expected_export"),
+    [(ExportFormat.NDJSON, b""), (ExportFormat.CSV, b"name,count,created_at,deleted_at\r\n")],
+    ids=["ndjson", "csv"],
+)
+def test_iter_export_without_rows(export_format: ExportFormat, expected_export: bytes):
+    """Test that exporting no rows only yields the header, if the format has one."""
+    assert b"".join(iter_export([], Row, export_format)) == expected_export
+
+
+@pytest.mark.asyncio()
+async def test_aiter_export_yields_each_batch():
+    """Test that the async export yields the header and then a chunk for each batch."""
+
+    # Given
+    async def batches() -> AsyncIterator[list[SimpleNamespace]]:
+        yield ROWS[:1]
+        yield ROWS[1:]
+
+    # When
+    chunks = [chunk async for chunk in aiter_export(batches(), Row, ExportFormat.CSV)]
+
+    # Then
+    assert len(chunks) == 3
+    assert b"".join(chunks) == b"".join(iter_export([ROWS[:1], ROWS[1:]], Row, ExportFormat.CSV))
@@ -0,0 +1,106 @@
+"""Test health check services."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from v1.database.pools import PoolStats
+from v1.services.health_checks import (
+    CachedDatabasePing,
+    DatabasePing,
+    get_readiness,
+    ping_async_database,
+    ping_database,
+)
+from v1.test_fixtures.clocks import FakeClock
+from v1.test_fixtures.database import testing_async_db_engine, testing_db_engine, testing_db_info
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_ping_database():
+    """Test pinging a reachable database with sync and async engines."""
+    # When
+    database_ping = await ping_database(testing_db_engine, timeout_seconds=5)
+    async_database_ping = await ping_async_database(testing_async_db_engine, timeout_seconds=5)
+
+    # Then
+    assert database_ping.is_reachable is True
+    assert async_database_ping.is_reachable is True
+    assert async_database_ping.error is None
+
+
+@pytest.mark.asyncio()
+async def test_ping_unreachable_database():
+    """Test pinging a database which is down or does not answer in time."""
+    # Given
+    unreachable_engine = create_async_engine(testing_db_info.async_url.replace(f":{testing_db_info.port}/", ":1/"))
+
+    # When
+    unreachable_database_ping = await ping_async_database(unreachable_engine, timeout_seconds=5)
+    timed_out_database_ping = await ping_async_database(testing_async_db_engine, timeout_seconds=0)
+
+    # Then
+    assert unreachable_database_ping.is_reachable is False
+    assert unreachable_database_ping.error is not None
+    assert timed_out_database_ping == DatabasePing(
+        is_reachable=False,
+        latency_seconds=timed_out_database_ping.latency_seconds,
+        error="Timed out",
+    )
+    await unreachable_engine.dispose()
+
+
+@pytest.mark.asyncio()
+async def test_cached_database_ping(clock: FakeClock):
+    """Test concurrent callers share a single ping, which is reused until it expires."""
+    # Given
+    number_of_pings = 0
+
+    async def ping() -> DatabasePing:
+        nonlocal number_of_pings
+        number_of_pings += 1
+        await asyncio.sleep(0.01)
+        return DatabasePing(is_reachable=True, latency_seconds=0.01)
+
+    cached_database_ping = CachedDatabasePing(ping, ttl_seconds=2, clock=clock)
+
+    # When
+    concurrent_pings = await asyncio.gather(*(cached_database_ping.get() for _ in range(10)))
+    number_of_pings_before_expiry = number_of_pings
+    clock.now += 2
+    await cached_database_ping.get()
+
+    # Then
+    assert len(set(concurrent_pings)) == 1
+    assert number_of_pings_before_expiry == 1
+    assert number_of_pings == 2
+
+
+@pytest.mark.parametrize(
+    ("is_reachable", "checked_out", "expected_is_ready"),
+    [(True, 14, True), (True, 15, False), (False, 0, False)],
+    ids=["ready", "pool-saturated", "database-unreachable"],
+)
+def test_get_readiness(*, is_reachable: bool, checked_out: int, expected_is_ready: bool):
+    """Test the worker is only ready if the database is reachable and the pool is not saturated."""
+    # Given
+    pool_stats = PoolStats(
+        pool_size=5,
+        max_overflow=10,
+        checked_out=checked_out,
+        checked_in=0,
+        overflow=max(checked_out - 5, 0),
+        checkouts=checked_out,
+        timeouts=0,
+        total_wait_seconds=0,
+        max_wait_seconds=0,
+    )
+
+    # When
+    readiness = get_readiness(DatabasePing(is_reachable=is_reachable, latency_seconds=0.001), pool_stats, 1)
+
+    # Then
+    assert readiness.is_ready is expected_is_ready
+    assert readiness.pool_saturation == checked_out / 15
@@ -0,0 +1,114 @@
+"""Test metrics services."""
+
+import threading
+
+from v1.database.pools import PoolStats
+from v1.services.metrics import (
+    Histogram,
+    PrometheusTextWriter,
+    RequestLabels,
+    RequestMetrics,
+    add_pool_metrics,
+    add_request_metrics,
+    format_labels,
+)
+
+
+def test_request_metrics_observe():
+    """Test requests are counted in the bucket of the smallest upper bound which is at least their latency."""
+    # Given
+    metrics = RequestMetrics(buckets_seconds=[0.1, 0.01, 1])
+
+    # When
+    for duration_seconds in (0.005, 0.01, 0.5, 3):
+        metrics.observe("GET", "/users/{user_id}", 200, duration_seconds)
+    metrics.observe("GET", "/users/{user_id}", 404, 0.05)
+
+    # Then
+    assert metrics.collect() == {
+        RequestLabels("GET", "/users/{user_id}", 200): Histogram(bucket_counts=[2, 0, 1, 1], count=4, sum=3.515),
+        RequestLabels("GET", "/users/{user_id}", 404): Histogram(bucket_counts=[0, 1, 0, 0], count=1, sum=0.05),
+    }
+
+
+def test_request_metrics_collect_merges_threads():
+    """Test requests recorded by several threads are merged when collected, and forgotten once reset."""
+    # Given
+    metrics = RequestMetrics(buckets_seconds=[1])
+    threads = [
+        threading.Thread(target=lambda: [metrics.observe("POST", "/users", 201, 0.5) for _ in range(1000)])
+        for _ in range(4)
+    ]
+
+    # When
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then
+    assert metrics.collect()[RequestLabels("POST", "/users", 201)].bucket_counts == [4000, 0]
+    metrics.reset()
+    assert metrics.collect() == {}
+
+
+def test_add_request_metrics():
+    """Test request histograms are written with cumulative buckets."""
+    # Given
+    metrics = RequestMetrics(buckets_seconds=[0.1, 1])
+    metrics.observe("GET", "/users", 200, 0.05)
+    metrics.observe("GET", "/users", 200, 0.5)
+    writer = PrometheusTextWriter()
+
+    # When
+    add_request_metrics(writer, metrics)
+
+    # Then
+    assert writer.render().splitlines() == [
+        "# HELP http_request_duration_seconds Seconds taken to respond to HTTP requests, per method, route and status.",
+        "# TYPE http_request_duration_seconds histogram",
+        'http_request_duration_seconds_bucket{method="GET",route="/users",status="200",le="0.1"} 1',
+        'http_request_duration_seconds_bucket{method="GET",route="/users",status="200",le="1"} 2',
+        'http_request_duration_seconds_bucket{method="GET",route="/users",status="200",le="+Inf"} 2',
+        'http_request_duration_seconds_count{method="GET",route="/users",status="200"} 2',
+        'http_request_duration_seconds_sum{method="GET",route="/users",status="200"} 0.55',
+    ]
+
+
+def test_add_pool_metrics():
+    """Test pool metrics are labelled by engine and engines without pool stats are skipped."""
+    # Given
+    pool_stats = PoolStats(
+        pool_size=5,
+        max_overflow=10,
+        checked_out=2,
+        checked_in=3,
+        overflow=0,
+        checkouts=10,
+        timeouts=1,
+        total_wait_seconds=0.5,
+        max_wait_seconds=0.25,
+    )
+    writer = PrometheusTextWriter()
+
+    # When
+    add_pool_metrics(writer, {"sync": pool_stats, "async": None})
+
+    # Then
+    samples = [line for line in writer.render().splitlines() if not line.startswith("#")]
+    assert samples == [
+        'db_pool_size{engine="sync"} 5',
+        'db_pool_checked_out_connections{engine="sync"} 2',
+        'db_pool_checked_in_connections{engine="sync"} 3',
+        'db_pool_overflow_connections{engine="sync"} 0',
+        'db_pool_checkouts_total{engine="sync"} 10',
+        'db_pool_checkout_timeouts_total{engine="sync"} 1',
+        'db_pool_checkout_wait_seconds_total{engine="sync"} 0.5',
+        'db_pool_checkout_wait_seconds_max{engine="sync"} 0.25',
+    ]
+
+
+def test_format_labels():
+    """Test label values are escaped."""
+    assert format_labels({}) == ""
+    assert format_labels({"route": 'a\\b"c\nd', "status": "200"}) == '{route="a\\\\b\\"c\\nd",status="200"}'
@@ -0,0 +1,47 @@
+"""Test pagination services."""
+
+import uuid
+
+import pytest
+
+from v1.exceptions.pagination import InvalidCursorError
+from v1.schemas.users import UserCursor
+from v1.services.pagination import decode_cursor, encode_cursor, get_next_cursor
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        UserCursor(first_name="Fulton", last_name="Sheen", id=uuid.uuid4()),
+        UserCursor(first_name="Zoë", last_name="O'Brien-Ñúñez", id=uuid.uuid4()),
+        UserCursor(first_name="", last_name="", id=uuid.uuid4()),
+    ],
+    ids=["ascii", "unicode", "empty-names"],
+)
+def test_encode_and_decode_cursor(cursor: UserCursor) -> None:
+    """Test that an encoded cursor is opaque, URL-safe and decodes to the original cursor."""
+    encoded_cursor = encode_cursor(cursor)
+
+    assert "Sheen" not in encoded_cursor
+    assert all(character.isalnum() or character in "-_" for character in encoded_cursor)
+    assert decode_cursor(encoded_cursor, UserCursor) == cursor
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-base64!", "bm90LWpzb24", "eyJmaXJzdF9uYW1lIjogIkZ1bHRvbiJ9", ""],
+    ids=["not-base64", "not-json", "missing-fields", "empty"],
+)
+def test_decode_cursor_with_invalid_cursors(cursor: str) -> None:
+    """Test that decoding an invalid cursor raises InvalidCursorError."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, UserCursor)
+
+
+def test_get_next_cursor() -> None:
+    """Test that the next cursor points to the last item of a full page and is None for the last page."""
+    users = [UserCursor(first_name="Mary", last_name=f"Magdela {i}", id=uuid.uuid4()) for i in range(3)]
+
+    assert decode_cursor(get_next_cursor(users, 3, UserCursor) or "", UserCursor) == users[-1]
+    assert get_next_cursor(users, 4, UserCursor) is None
+    assert get_next_cursor([], 4, UserCursor) is None
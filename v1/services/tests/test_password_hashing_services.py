@@ -0,0 +1,171 @@
+"""Test password hashing pool services."""
+
+from collections.abc import Iterator
+from concurrent.futures import Future
+from typing import Any
+
+import pytest
+from argon2 import PasswordHasher
+from pytest_mock import MockerFixture
+
+from v1.exceptions.passwords import PasswordHashingPoolFullError
+from v1.services.password_hashing import PasswordHashingPool
+from v1.services.passwords import hash_password, is_password_correct
+
+
+@pytest.fixture()
+def password_hashing_pool() -> Iterator[PasswordHashingPool]:
+    """Yield a password hashing pool with two workers and shut it down afterwards."""
+    pool = PasswordHashingPool(max_workers=2, max_queue_size=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_hash(password_hashing_pool: PasswordHashingPool) -> None:
+    """Test hashing a password in the pool."""
+    hashed_password = password_hashing_pool.hash("MyPassword37!")
+
+    assert is_password_correct("MyPassword37!", hashed_password) is True
+    assert password_hashing_pool.stats().completed == 1
+
+
+@pytest.mark.asyncio()
+async def test_hash_async(password_hashing_pool: PasswordHashingPool) -> None:
+    """Test hashing a password in the pool without blocking the event loop."""
+    hashed_password = await password_hashing_pool.hash_async("MyPassword37!")
+
+    assert is_password_correct("MyPassword37!", hashed_password) is True
+
+
+@pytest.mark.parametrize("number_of_passwords", [0, 1, 3, 5])
+def test_hash_many(password_hashing_pool: PasswordHashingPool, number_of_passwords: int) -> None:
+    """Test hashing many passwords in the pool returns their hashes in the same order."""
+    passwords = [f"MyPassword{number}!" for number in range(number_of_passwords)]
+
+    hashed_passwords = password_hashing_pool.hash_many(passwords)
+
+    assert len(hashed_passwords) == number_of_passwords
+    assert password_hashing_pool.stats().completed == number_of_passwords
+    for password, hashed_password in zip(passwords, hashed_passwords, strict=True):
+        assert is_password_correct(password, hashed_password) is True
+
+
+@pytest.mark.asyncio()
+async def test_hash_many_async(password_hashing_pool: PasswordHashingPool) -> None:
+    """Test hashing many passwords in the pool without blocking the event loop."""
+    passwords = ["MyPassword37!", "=TopSecRET42", "^12aErT"]
+
+    hashed_passwords = await password_hashing_pool.hash_many_async(passwords)
+
+    for password, hashed_password in zip(passwords, hashed_passwords, strict=True):
+        assert is_password_correct(password, hashed_password) is True
+
+
+@pytest.mark.asyncio()
+async def test_is_password_correct(password_hashing_pool: PasswordHashingPool) -> None:
+    """Test verifying passwords in the pool, both blocking and without blocking the event loop."""
+    hashed_password = password_hashing_pool.hash("MyPassword37!")
+
+    assert password_hashing_pool.is_password_correct("MyPassword37!", hashed_password) is True
+    assert await password_hashing_pool.is_password_correct_async("=TopSecRET42", hashed_password) is False
+
+
+@pytest.mark.asyncio()
+async def test_verify_and_rehash(password_hashing_pool: PasswordHashingPool) -> None:
+    """Test verifying passwords in the pool upgrades hashes created with outdated parameters."""
+    outdated_hashed_password = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("MyPassword37!")
+
+    is_correct, upgraded_hashed_password = password_hashing_pool.verify_and_rehash(
+        "MyPassword37!",
+        outdated_hashed_password,
+    )
+    assert is_correct is True
+    assert upgraded_hashed_password is not None
+    assert await password_hashing_pool.verify_and_rehash_async("MyPassword37!", upgraded_hashed_password) == (
+        True,
+        None,
+    )
+
+
+def test_hash_when_pool_is_full() -> None:
+    """Test hashing is rejected once every worker is busy and the queue is full."""
+    # Given a pool with one worker and no room in the queue
+    pool = PasswordHashingPool(max_workers=1, max_queue_size=0)
+    try:
+        pool.start()
+        # When a second password is submitted while the first one is being hashed
+        future = pool._submit(hash_password, "MyPassword37!")  # noqa: SLF001
+        with pytest.raises(PasswordHashingPoolFullError):
+            pool.hash("=TopSecRET42")
+        future.result()
+    finally:
+        pool.shutdown()
+
+    # Then the rejection is recorded
+    stats = pool.stats()
+    assert stats.rejected == 1
+    assert stats.completed == 1
+    assert stats.in_flight == 0
+    assert stats.latency_seconds_total > 0
+
+
+def test_hash_many_when_pool_is_full() -> None:
+    """Test each password of a batch counts towards the queue, so a batch which does not fit is rejected at once."""
+    # Given a pool with one busy worker and room for two queued tasks
+    pool = PasswordHashingPool(max_workers=1, max_queue_size=2)
+    try:
+        pool.start()
+        future = pool._submit(hash_password, "MyPassword37!")  # noqa: SLF001
+
+        # When a batch of three passwords is submitted
+        with pytest.raises(PasswordHashingPoolFullError):
+            pool.hash_many(["=TopSecRET42", "^12aErT", "MyPassword38!"])
+
+        # Then the batch is rejected, but a batch which fits is not
+        assert pool.stats().rejected == 3
+        assert len(pool.hash_many(["=TopSecRET42", "^12aErT"])) == 2
+        future.result()
+    finally:
+        pool.shutdown()
+    assert pool.stats().in_flight == 0
+
+
+def test_hash_many_larger_than_pool_is_admitted_when_idle() -> None:
+    """Test a batch larger than the pool is admitted when the pool is idle and counts as a task per password."""
+    pool = PasswordHashingPool(max_workers=1, max_queue_size=1)
+    try:
+        futures = pool._submit_chunks([f"MyPassword{number}!" for number in range(4)])  # noqa: SLF001
+        assert pool.stats().in_flight == 4
+        with pytest.raises(PasswordHashingPoolFullError):
+            pool.hash("=TopSecRET42")
+        assert [len(future.result()) for future in futures] == [4]
+    finally:
+        pool.shutdown()
+    assert pool.stats().completed == 4
+
+
+def test_hash_many_cancels_the_batch_if_a_chunk_cannot_be_submitted(mocker: MockerFixture) -> None:
+    """Test the chunks of a batch already submitted are cancelled, and the batch's places released, on failure."""
+    # Given a pool whose executor fails to submit the second chunk
+    pool = PasswordHashingPool(max_workers=2, max_queue_size=8)
+    pool.start()
+    submitted_futures: list[Future[Any]] = []
+
+    def submit(*_args: Any) -> Future[Any]:  # noqa: ANN401
+        if submitted_futures:
+            raise RuntimeError
+        submitted_futures.append(Future())
+        return submitted_futures[-1]
+
+    mocker.patch.object(pool._executor, "submit", side_effect=submit)  # noqa: SLF001
+    try:
+        # When
+        with pytest.raises(RuntimeError):
+            pool.hash_many([f"MyPassword{number}!" for number in range(6)])
+
+        # Then
+        assert submitted_futures[0].cancelled()
+        assert pool.stats().in_flight == 0
+        assert pool.stats().completed == 0
+    finally:
+        pool.shutdown()
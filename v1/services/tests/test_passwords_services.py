@@ -1,8 +1,15 @@
 """Test common module services."""
 
 import pytest
+from argon2 import PasswordHasher
 
-from v1.services.passwords import hash_password, is_password_correct
+from v1.services.passwords import (
+    hash_password,
+    hash_passwords,
+    is_password_correct,
+    password_hasher,
+    verify_and_rehash_password,
+)
 
 
 @pytest.mark.parametrize(
@@ -19,6 +26,19 @@ def test_hash_password(password: str) -> None:
     assert password != hashed_password
 
 
+def test_hash_passwords() -> None:
+    """Test hashing many passwords returns their hashes in the same order."""
+    passwords = ["MyPassword37!", "=TopSecRET42", "^12aErT", "MyPassword37!"]
+
+    hashed_passwords = hash_passwords(passwords)
+
+    assert len(hashed_passwords) == len(passwords)
+    for password, hashed_password in zip(passwords, hashed_passwords, strict=True):
+        assert is_password_correct(password, hashed_password) is True
+    # Verify that the same password is hashed with a different salt
+    assert hashed_passwords[0] != hashed_passwords[3]
+
+
 matching_password_hashed_list = [
     (
         "MyPassword37!",
@@ -72,3 +92,28 @@ def test_is_password_correct_with_password_which_does_not_match_hashed_password(
 ) -> None:
     """Test whether is_correct_password detects a password that does not match a hashed passwored correctly."""
     assert is_password_correct(password, hashed_password) is False
+
+
+def test_verify_and_rehash_password_with_current_parameters() -> None:
+    """Test a hash created with the current parameters is verified without being upgraded."""
+    hashed_password = hash_password("MyPassword37!")
+
+    assert verify_and_rehash_password("MyPassword37!", hashed_password) == (True, None)
+    assert verify_and_rehash_password("=TopSecRET42", hashed_password) == (False, None)
+
+
+def test_verify_and_rehash_password_with_outdated_parameters() -> None:
+    """Test a hash created with outdated parameters is upgraded once its password is verified."""
+    # Given a hash created with cheaper parameters than the current settings
+    outdated_hashed_password = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("MyPassword37!")
+
+    # When
+    is_correct, upgraded_hashed_password = verify_and_rehash_password("MyPassword37!", outdated_hashed_password)
+
+    # Then
+    assert is_correct is True
+    assert upgraded_hashed_password is not None
+    assert password_hasher.check_needs_rehash(upgraded_hashed_password) is False
+    assert is_password_correct("MyPassword37!", upgraded_hashed_password) is True
+    # Verify an incorrect password does not produce an upgraded hash
+    assert verify_and_rehash_password("=TopSecRET42", outdated_hashed_password) == (False, None)
@@ -0,0 +1,54 @@
+"""Micro-benchmark hot service functions, called for every user created, logged in, authenticated or validated.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from v1.services.access_tokens import issue_access_token, verify_access_token
+from v1.services.datetime_ import validate_datetime_is_utc_timezone
+from v1.services.emails import validate_and_normalize_email
+from v1.services.passwords import hash_password, is_password_correct
+from v1.test_fixtures.benchmarks import MicroBenchmarkResult
+
+MicroBenchmark = Callable[[Callable[[], Any]], MicroBenchmarkResult]
+PASSWORD = "MyNotSecurePassword123!"  # nosec: hardcoded_password_string
+
+
+@pytest.mark.benchmark()
+def test_hash_password_benchmark(micro_benchmark: MicroBenchmark):
+    """Benchmark hashing a password with the configured argon2 parameters."""
+    micro_benchmark(lambda: hash_password(PASSWORD))
+
+
+@pytest.mark.benchmark()
+def test_is_password_correct_benchmark(micro_benchmark: MicroBenchmark):
+    """Benchmark verifying a correct password with the configured argon2 parameters."""
+    hashed_password = hash_password(PASSWORD)
+    micro_benchmark(lambda: is_password_correct(PASSWORD, hashed_password))
+
+
+@pytest.mark.benchmark()
+def test_validate_and_normalize_email_benchmark(micro_benchmark: MicroBenchmark):
+    """Benchmark validating an email whose domain deliverability is cached."""
+    micro_benchmark(lambda: validate_and_normalize_email("Mary.Magdela@Gmail.com"))
+
+
+@pytest.mark.benchmark()
+def test_validate_datetime_is_utc_timezone_benchmark(micro_benchmark: MicroBenchmark):
+    """Benchmark validating a UTC datetime."""
+    now = datetime.now(timezone.utc)
+    micro_benchmark(lambda: validate_datetime_is_utc_timezone(now))
+
+
+@pytest.mark.benchmark()
+def test_verify_access_token_benchmark(micro_benchmark: MicroBenchmark):
+    """Benchmark verifying an access token, which is done in memory for every authenticated request."""
+    access_token = issue_access_token(uuid4())
+    micro_benchmark(lambda: verify_access_token(access_token))
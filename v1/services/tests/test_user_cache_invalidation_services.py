@@ -0,0 +1,166 @@
+"""Test user cache invalidation services."""
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from asyncpg.exceptions import ConnectionDoesNotExistError
+from pytest_mock import MockerFixture
+from sqlalchemy import delete, insert, update
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.services import user_cache_invalidation
+from v1.services.user_cache import UserSnapshot, user_cache
+from v1.services.user_cache_invalidation import UserCacheInvalidationListener
+from v1.test_fixtures.database import testing_db_engine, testing_db_info
+
+# Seconds to wait for a notification to be delivered
+NOTIFICATION_TIMEOUT_SECONDS = 5
+
+
+def cache_user(user_id: uuid.UUID) -> None:
+    """Add a snapshot of a user to the user cache."""
+    user_snapshot = UserSnapshot(
+        id=user_id,
+        first_name="Mary",
+        last_name="Magdela",
+        email="mary.magdela@gmail.com",
+        is_superuser=False,
+        created_at=datetime.now(timezone.utc),
+        updated_at=None,
+        deleted_at=None,
+    )
+    user_cache.set(user_id, user_snapshot)
+
+
+async def wait_until_evicted(user_id: uuid.UUID) -> None:
+    """Wait until the user has been evicted from the user cache."""
+    async with asyncio.timeout(NOTIFICATION_TIMEOUT_SECONDS):
+        while user_cache.get(user_id) is not None:
+            await asyncio.sleep(0.01)
+
+
+@pytest_asyncio.fixture()
+async def listener() -> AsyncIterator[UserCacheInvalidationListener]:
+    """Yield a listener which is listening for changed users in the test database."""
+    listener = UserCacheInvalidationListener(dsn=testing_db_info.url)
+    listener.start()
+    async with asyncio.timeout(NOTIFICATION_TIMEOUT_SECONDS):
+        await listener.listening.wait()
+    yield listener
+    await listener.stop()
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_listener_evicts_users_changed_by_other_processes(listener: UserCacheInvalidationListener):
+    """Test users inserted, updated or deleted in a committed transaction are evicted from the user cache."""
+    # Given a user committed by another process (i.e. not through the users service)
+    user = UserFactory.build(hashed_password="not-a-real-hash")  # nosec: hardcoded_password
+    user_id = uuid.UUID(user.id)
+    for statement in [
+        insert(User).values(user.to_dict()),
+        update(User).where(User.id == user_id).values(first_name="Martha"),
+        delete(User).where(User.id == user_id),
+    ]:
+        cache_user(user_id)
+
+        # When
+        with testing_db_engine.begin() as db_connection:
+            db_connection.execute(statement)
+
+        # Then
+        await wait_until_evicted(user_id)
+
+    assert listener.listening.is_set()
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_listener_ignores_uncommitted_changes(listener: UserCacheInvalidationListener):
+    """Test users changed in a transaction which is rolled back stay in the user cache."""
+    # Given
+    user_id = uuid.uuid4()
+    cache_user(user_id)
+
+    # When
+    with testing_db_engine.connect() as db_connection:
+        user = UserFactory.build(id=str(user_id), hashed_password="not-a-real-hash")  # nosec: hardcoded_password
+        db_connection.execute(insert(User).values(user.to_dict()))
+        db_connection.rollback()
+    await asyncio.sleep(0.2)
+
+    # Then
+    assert user_cache.get(user_id) is not None
+    assert listener.listening.is_set()
+
+
+@pytest.mark.asyncio()
+async def test_listener_invalidates_all_users_when_it_reconnects(listener: UserCacheInvalidationListener):
+    """Test the whole user cache is invalidated after reconnecting, as notifications may have been missed."""
+    # Given
+    user_id = uuid.uuid4()
+    cache_user(user_id)
+
+    # When the listening connection is terminated
+    with testing_db_engine.begin() as db_connection:
+        db_connection.exec_driver_sql(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE query LIKE 'LISTEN%%' AND pid <> pg_backend_pid()",
+        )
+
+    # Then
+    await wait_until_evicted(user_id)
+    async with asyncio.timeout(NOTIFICATION_TIMEOUT_SECONDS):
+        await listener.listening.wait()
+
+
+@pytest.mark.asyncio()
+async def test_listener_reconnects_after_an_unexpected_error(
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Test the listener logs errors which are not connection errors and reconnects, rather than stopping."""
+    # Given
+    mocker.patch.object(user_cache_invalidation, "RECONNECT_DELAY_SECONDS", 0)
+    listener = UserCacheInvalidationListener(dsn=testing_db_info.url)
+    errors = [ConnectionDoesNotExistError("connection was closed"), RuntimeError("bug")]
+
+    async def listen_until_disconnected() -> None:
+        if errors:
+            raise errors.pop(0)
+        listener.listening.set()
+        await asyncio.Event().wait()
+
+    mocker.patch.object(listener, "_listen_until_disconnected", side_effect=listen_until_disconnected)
+
+    # When
+    listener.start()
+    try:
+        async with asyncio.timeout(NOTIFICATION_TIMEOUT_SECONDS):
+            await listener.listening.wait()
+    finally:
+        await listener.stop()
+
+    # Then
+    assert "User cache invalidation listener failed" in caplog.text
+    assert "connection was closed" in caplog.text
+    assert "RuntimeError: bug" in caplog.text
+
+
+def test_listener_ignores_invalid_user_ids():
+    """Test notifications which are not user ids do not evict anything."""
+    # Given
+    user_id = uuid.uuid4()
+    cache_user(user_id)
+    listener = UserCacheInvalidationListener(dsn=testing_db_info.url)
+
+    # When
+    listener.invalidate(None, 1, "users_changed", "not-a-user-id")  # type: ignore[arg-type]
+
+    # Then
+    assert user_cache.get(user_id) is not None
@@ -0,0 +1,59 @@
+"""Benchmark the memory used to export users.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.schemas.users import UserResponse
+from v1.services.exports import ExportFormat, iter_export
+from v1.services.users import stream_users_export
+
+NUMBER_OF_USERS = 1_000_000
+# Maximum growth of the resident set size while exporting. Holding every user in memory would take over a gigabyte.
+MAX_RSS_GROWTH_BYTES = 64 * 1024 * 1024
+
+
+def get_rss_bytes() -> int:
+    """Return the current resident set size of this process in bytes (Linux only)."""
+    resident_pages = int(Path("/proc/self/statm").read_text().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.benchmark()
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+def test_exporting_users_uses_constant_memory(db_session: Session, export_format: ExportFormat):
+    """Test that exporting a million users does not hold them all in memory."""
+    # Given
+    # Copy a factory user a million times in the database, as building each user in Python would dominate setup time
+    user = UserFactory(hashed_password="not-a-real-hash")  # nosec: hardcoded_password_funcarg
+    db_session.flush()
+    db_session.execute(
+        text(
+            "INSERT INTO users (id, first_name, last_name, email, hashed_password, is_superuser, created_at) "
+            "SELECT gen_random_uuid(), first_name, last_name || n, n || email, hashed_password, is_superuser, "
+            "created_at FROM users CROSS JOIN generate_series(2, :number_of_users) AS n WHERE id = :id",
+        ),
+        {"number_of_users": NUMBER_OF_USERS, "id": user.id},
+    )
+    db_session.commit()
+    rss_before_export = get_rss_bytes()
+
+    # When
+    number_of_lines = 0
+    max_rss = rss_before_export
+    for chunk in iter_export(stream_users_export(db_session), UserResponse, export_format):
+        number_of_lines += chunk.count(b"\n")
+        max_rss = max(max_rss, get_rss_bytes())
+
+    # Then
+    header_lines = 1 if export_format == ExportFormat.CSV else 0
+    assert number_of_lines == NUMBER_OF_USERS + header_lines
+    assert max_rss - rss_before_export < MAX_RSS_GROWTH_BYTES, f"RSS grew by {max_rss - rss_before_export} bytes"
@@ -0,0 +1,70 @@
+"""Benchmark keyset (cursor) pagination against offset pagination for the users service.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.schemas.users import UserCursor
+from v1.services.users import get_users
+
+NUMBER_OF_USERS = 20_000
+PAGE_SIZE = 100
+REPEATS = 7
+# Maximum allowed ratio between the latency of the deepest and the shallowest page
+FLAT_LATENCY_TOLERANCE = 3
+
+
+def get_median_latency(func: Callable[[], Any]) -> float:
+    """Return the median latency in seconds of calling func, after a warmup call."""
+    func()
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+@pytest.mark.benchmark()
+def test_keyset_pagination_latency_is_flat_across_page_depth(db_session: Session):
+    """Test that fetching a deep page using a cursor is about as fast as fetching a shallow page."""
+    # Given
+    # Skip hashing passwords, as it would dominate the setup time
+    users = UserFactory.build_batch(NUMBER_OF_USERS, hashed_password="not-a-real-hash")  # nosec: hardcoded_password
+    db_session.execute(insert(User), [user.to_dict() for user in users])
+    db_session.commit()
+    deep_offset = NUMBER_OF_USERS - PAGE_SIZE
+    shallow_cursor = UserCursor.model_validate(get_users(db_session, limit=1)[0], from_attributes=True)
+    deep_cursor = UserCursor.model_validate(
+        get_users(db_session, offset=deep_offset - 1, limit=1)[0],
+        from_attributes=True,
+    )
+
+    # When
+    latencies = {
+        "offset-shallow": get_median_latency(lambda: get_users(db_session, offset=1, limit=PAGE_SIZE)),
+        "offset-deep": get_median_latency(lambda: get_users(db_session, offset=deep_offset, limit=PAGE_SIZE)),
+        "cursor-shallow": get_median_latency(lambda: get_users(db_session, limit=PAGE_SIZE, cursor=shallow_cursor)),
+        "cursor-deep": get_median_latency(lambda: get_users(db_session, limit=PAGE_SIZE, cursor=deep_cursor)),
+    }
+
+    # Then
+    # Verify that both pagination styles return the same deep page
+    assert get_users(db_session, offset=deep_offset, limit=PAGE_SIZE) == get_users(
+        db_session,
+        limit=PAGE_SIZE,
+        cursor=deep_cursor,
+    )
+    # Verify that the cursor latency does not grow with the page depth
+    assert latencies["cursor-deep"] < latencies["cursor-shallow"] * FLAT_LATENCY_TOLERANCE, latencies
@@ -6,21 +6,43 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import pytest
-from sqlalchemy import select
+from argon2 import PasswordHasher
+from pytest_mock import MockerFixture
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from v1.database.models.test_factories.users import UserFactory
 from v1.database.models.users import User
-from v1.exceptions.users import UserHasBeenPreviouslyDeletedError
-from v1.schemas.users import CreateUserRequest, CreateUserService, UpdateUserService
+from v1.database.replicas import IS_REPLICA_SESSION
+from v1.exceptions.users import (
+    UserAlreadyExistsError,
+    UserEmailUndeliverableError,
+    UserHasBeenPreviouslyDeletedError,
+    UserIdDoesNotExistError,
+)
+from v1.schemas.users import (
+    BulkCreateUserStatus,
+    CreateUserRequest,
+    CreateUserService,
+    UpdateUserService,
+    UserCursor,
+)
+from v1.services.passwords import is_password_correct, password_hasher
+from v1.services.user_cache import user_cache
 from v1.services.users import (
+    authenticate_user,
     create_user,
+    create_users,
     get_user_from_email,
     get_user_from_id,
+    get_user_snapshot_from_id,
     get_users,
+    is_user_password_correct,
     soft_delete_user,
     update_user_using_id,
 )
+from v1.settings import DATABASE_REPLICA_MAX_LAG_SECONDS
+from v1.test_fixtures.emails import StubDeliverabilityResolver
 
 
 def test_create_user(db_session: Session, create_user_request: CreateUserRequest):
@@ -47,6 +69,93 @@ def test_create_user(db_session: Session, create_user_request: CreateUserRequest
     assert users[0].to_dict() == db_user.to_dict()
 
 
+def test_create_user_who_already_exists_fails(db_session: Session, create_user_request: CreateUserRequest):
+    """Test service for creating a user fails when a user with the same email already exists."""
+    # Given
+    existing_user = UserFactory(email=create_user_request.email)
+    db_session.commit()
+    user = CreateUserService(**create_user_request.model_dump())
+
+    # When
+    with pytest.raises(UserAlreadyExistsError):
+        create_user(db_session, user)
+
+    # Then
+    # Verify the existing user has not been changed
+    users = db_session.scalars(select(User).filter_by(email=user.email)).all()
+    assert len(users) == 1
+    assert users[0].id == existing_user.id
+    assert users[0].first_name == existing_user.first_name
+
+
+def test_create_user_with_an_undeliverable_email_fails(
+    db_session: Session,
+    create_user_request: CreateUserRequest,
+    stub_deliverability_resolver: StubDeliverabilityResolver,
+):
+    """Test deliverability is checked by the service rather than when the user is parsed, and fails if undeliverable."""
+    # Given
+    user = CreateUserService(**{**create_user_request.model_dump(), "email": "mary.magdela@elpaso-university.com"})
+    resolved_domains_when_parsed = list(stub_deliverability_resolver.resolved_domains)
+
+    # When
+    with pytest.raises(UserEmailUndeliverableError) as exc_info:
+        create_user(db_session, user)
+
+    # Then
+    assert resolved_domains_when_parsed == []
+    assert exc_info.value.email == "mary.magdela@elpaso-university.com"
+    assert exc_info.value.reason == "The domain name elpaso-university.com does not exist."
+    assert db_session.scalars(select(User).filter_by(email=user.email)).all() == []
+    # Bulk create checks every email before creating any user
+    with pytest.raises(UserEmailUndeliverableError):
+        create_users(db_session, [CreateUserService(**create_user_request.model_dump()), user])
+    assert db_session.scalars(select(User).filter_by(email=create_user_request.email)).all() == []
+
+
+def test_create_users(db_session: Session, create_user_request: CreateUserRequest):
+    """Test service for creating many users at once."""
+    # Given
+    existing_user = UserFactory()
+    db_session.commit()
+    new_user_1 = CreateUserService(**create_user_request.model_dump())
+    new_user_2 = CreateUserService(**{**create_user_request.model_dump(), "email": "mary.magdela@gmail.com"})
+    existing_user_request = CreateUserService(
+        **{**create_user_request.model_dump(), "email": existing_user.email},
+    )
+
+    # When
+    results = create_users(db_session, [new_user_1, existing_user_request, new_user_2, new_user_1])
+
+    # Then
+    # Verify the results are in the same order as the given users
+    assert [result.email for result in results] == [
+        new_user_1.email,
+        existing_user.email,
+        new_user_2.email,
+        new_user_1.email,
+    ]
+    assert [result.status for result in results] == [
+        BulkCreateUserStatus.CREATED,
+        BulkCreateUserStatus.ALREADY_EXISTS,
+        BulkCreateUserStatus.CREATED,
+        BulkCreateUserStatus.DUPLICATE_IN_REQUEST,
+    ]
+    # Verify that only created users are in the results
+    assert results[0].user is not None
+    assert results[0].user.first_name == new_user_1.first_name
+    assert results[0].user.created_at is not None
+    assert results[1].user is None
+    assert results[2].user is not None
+    assert results[3].user is None
+
+    # Verify the database has a single record for each created user with the hashed password
+    for new_user in [new_user_1, new_user_2]:
+        db_users = db_session.scalars(select(User).filter_by(email=new_user.email)).all()
+        assert len(db_users) == 1
+        assert is_password_correct(new_user.password, db_users[0].hashed_password) is True
+
+
 def test_get_user_from_id(db_session: Session):
     """Test service for getting a user from an id."""
     # Given
@@ -76,6 +185,49 @@ def test_get_user_from_id_using_an_id_that_does_not_match_any_user(db_session: S
     assert db_user is None
 
 
+def test_get_user_snapshot_from_id(db_session: Session):
+    """Test reading a user snapshot is served from the user cache until the user is updated."""
+    # Given
+    user = UserFactory(first_name="Mary", last_name="Magdela")
+    db_session.commit()
+
+    # When
+    user_snapshot = get_user_snapshot_from_id(db_session, user.id)
+    # Change the user without going through the users service, so the cache is not invalidated
+    db_session.execute(update(User).where(User.id == user.id).values(first_name="Martha"))
+    cached_user_snapshot = get_user_snapshot_from_id(db_session, user.id)
+
+    # Then
+    assert user_snapshot is not None
+    assert (user_snapshot.id, user_snapshot.first_name) == (user.id, "Mary")
+    assert cached_user_snapshot is user_snapshot
+    assert user_cache.stats().hits == 1
+    # Verify updating the user through the users service invalidates the cache
+    update_user_using_id(db_session, user_id=user.id, update_user_data=UpdateUserService(last_name="Salvae"))
+    updated_user_snapshot = get_user_snapshot_from_id(db_session, user.id)
+    assert updated_user_snapshot is not None
+    assert (updated_user_snapshot.first_name, updated_user_snapshot.last_name) == ("Martha", "Salvae")
+    # Verify users who do not exist are not cached
+    assert get_user_snapshot_from_id(db_session, uuid.uuid4()) is None
+    assert user_cache.stats().size == 1
+
+
+def test_get_user_snapshot_from_id_read_from_a_replica(db_session: Session, mocker: MockerFixture):
+    """Test users read from a replica are only cached for as long as the replica may lag behind the primary."""
+    # Given
+    user = UserFactory()
+    db_session.commit()
+    db_session.info[IS_REPLICA_SESSION] = True
+    cache_set_spy = mocker.spy(user_cache, "set")
+
+    # When
+    get_user_snapshot_from_id(db_session, user.id)
+
+    # Then
+    cache_set_spy.assert_called_once()
+    assert cache_set_spy.call_args.kwargs["ttl_seconds"] == DATABASE_REPLICA_MAX_LAG_SECONDS
+
+
 def test_get_user_from_email(db_session: Session):
     """Test service for getting a user from an email."""
     # Given
@@ -183,6 +335,36 @@ def test_get_users(db_session: Session):
     assert page_2_of_2_db_users[99].to_dict() == page_4_of_4_db_users[49].to_dict()
 
 
+def test_get_users_using_a_cursor(db_session: Session):
+    """Test service for getting users using keyset pagination."""
+    # Given
+    # Users with the same first and last names are sorted by id
+    UserFactory.create_batch(10, first_name="Mary", last_name="Magdela")
+    UserFactory.create_batch(20)
+    db_session.commit()
+    expected_users = get_users(db_session, limit=30)
+
+    # When
+    page_1_db_users = get_users(db_session, limit=12)
+    page_2_db_users = get_users(
+        db_session,
+        limit=12,
+        cursor=UserCursor.model_validate(page_1_db_users[-1], from_attributes=True),
+    )
+    page_3_db_users = get_users(
+        db_session,
+        limit=12,
+        cursor=UserCursor.model_validate(page_2_db_users[-1], from_attributes=True),
+    )
+
+    # Then
+    assert len(page_1_db_users) == 12
+    assert len(page_2_db_users) == 12
+    assert len(page_3_db_users) == 6
+    # Verify that combining the pages matches the full set of users, without any users repeated
+    assert [*page_1_db_users, *page_2_db_users, *page_3_db_users] == list(expected_users)
+
+
 def test_get_users_when_no_users_are_present(db_session: Session):
     """Test getting users when no users are present in the database."""
     # When
@@ -214,12 +396,16 @@ def test_update_user(db_session: Session):  # pylint: disable=too-many-statement
     user_1_update = UpdateUserService(last_name="Salvae", is_superuser=True)
     user_2_update = UpdateUserService(email="flora123solace@yahoo.com")
     user_3_update = UpdateUserService(password="MySuperCoolPassword@789!!")
-    update_user_using_id(db_session, user_id=user_1.id, update_user_data=user_1_update)
-    update_user_using_id(db_session, user_id=user_2.id, update_user_data=user_2_update)
-    update_user_using_id(db_session, user_id=user_3.id, update_user_data=user_3_update)
+    updated_user_1 = update_user_using_id(db_session, user_id=user_1.id, update_user_data=user_1_update)
+    updated_user_2 = update_user_using_id(db_session, user_id=user_2.id, update_user_data=user_2_update)
+    updated_user_3 = update_user_using_id(db_session, user_id=user_3.id, update_user_data=user_3_update)
     datetime_after_request = datetime.now(timezone.utc) + timedelta(minutes=1)
 
     # Then
+    # Verify the returned users match the database
+    for updated_user in [updated_user_1, updated_user_2, updated_user_3]:
+        assert updated_user.to_dict() == db_session.get(User, updated_user.id).to_dict()
+
     # Verify fields on user 1 that should not be changed
     db_user_1 = db_session.get(User, user_1.id)
     assert db_user_1 is not None
@@ -266,6 +452,86 @@ def test_update_user(db_session: Session):  # pylint: disable=too-many-statement
     assert db_user_3.updated_at < datetime_after_request
 
 
+def test_update_user_with_no_fields_to_update(db_session: Session):
+    """Test updating a user with no fields returns the user without modifying them."""
+    # Given
+    user = UserFactory(first_name="Mary", last_name="Magdela")
+    db_session.commit()
+    user_updated_at = user.updated_at
+
+    # When
+    db_user = update_user_using_id(db_session, user_id=user.id, update_user_data=UpdateUserService())
+
+    # Then
+    assert db_user.id == user.id
+    assert db_user.first_name == "Mary"
+    assert db_user.updated_at == user_updated_at
+
+
+def test_update_user_with_an_undeliverable_email_fails(db_session: Session):
+    """Test updating a user's email to one which cannot receive email fails without modifying the user."""
+    # Given
+    user = UserFactory(email="mary.magdela@gmail.com")
+    db_session.commit()
+
+    # When
+    with pytest.raises(UserEmailUndeliverableError):
+        update_user_using_id(
+            db_session,
+            user_id=user.id,
+            update_user_data=UpdateUserService(email="mary.magdela@elpaso-university.com"),
+        )
+
+    # Then
+    db_session.expire_all()
+    assert db_session.get(User, user.id).email == "mary.magdela@gmail.com"
+
+
+@pytest.mark.parametrize("update_user_data", [UpdateUserService(first_name="Mary"), UpdateUserService()])
+def test_update_user_with_a_user_id_which_does_not_match_any_users_fails(
+    db_session: Session,
+    update_user_data: UpdateUserService,
+):
+    """Test updating a user who does not exist fails."""
+    with pytest.raises(UserIdDoesNotExistError):
+        update_user_using_id(db_session, user_id=uuid.uuid4(), update_user_data=update_user_data)
+
+
+def test_is_user_password_correct(db_session: Session):
+    """Test verifying a user's password upgrades a hash created with outdated hashing parameters."""
+    # Given a user whose password was hashed with cheaper parameters than the current settings
+    outdated_hashed_password = PasswordHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("MyPassword37!")
+    user = UserFactory(hashed_password=outdated_hashed_password)
+    db_session.commit()
+
+    # When an incorrect password is given
+    # Then verification fails and the hash is not changed
+    assert is_user_password_correct(db_session, user, "=TopSecRET42") is False
+    assert db_session.get(User, user.id).hashed_password == outdated_hashed_password
+
+    # When the correct password is given
+    # Then verification succeeds and the hash is upgraded
+    assert is_user_password_correct(db_session, user, "MyPassword37!") is True
+    db_user = db_session.get(User, user.id)
+    assert db_user.hashed_password != outdated_hashed_password
+    assert password_hasher.check_needs_rehash(db_user.hashed_password) is False
+    assert is_password_correct("MyPassword37!", db_user.hashed_password) is True
+
+
+def test_authenticate_user(db_session: Session):
+    """Test only users who have not been deleted can authenticate, and only with their correct password."""
+    # Given
+    user = UserFactory()
+    deleted_user = UserFactory(deleted_at=datetime.now(timezone.utc))
+    db_session.commit()
+
+    # When, Then
+    assert authenticate_user(db_session, user.email, UserFactory.password).email == user.email
+    assert authenticate_user(db_session, user.email, "=TopSecRET42") is None
+    assert authenticate_user(db_session, "unknown.user@gmail.com", UserFactory.password) is None
+    assert authenticate_user(db_session, deleted_user.email, UserFactory.password) is None
+
+
 def test_soft_delete_user(db_session: Session):
     """Test soft deleting a user."""
     # Given
@@ -276,7 +542,7 @@ def test_soft_delete_user(db_session: Session):
     datetime_before_request = datetime.now(timezone.utc) - timedelta(minutes=1)
 
     # When
-    soft_delete_user(db_session, user)
+    soft_delete_user(db_session, user.id)
     datetime_after_request = datetime.now(timezone.utc) + timedelta(minutes=1)
 
     # Then
@@ -297,6 +563,12 @@ def test_soft_delete_user(db_session: Session):
     assert db_user.deleted_at < datetime_after_request
 
 
+def test_soft_delete_user_with_a_user_id_which_does_not_match_any_users_fails(db_session: Session):
+    """Test soft deleting a user who does not exist fails."""
+    with pytest.raises(UserIdDoesNotExistError):
+        soft_delete_user(db_session, uuid.uuid4())
+
+
 def test_soft_delete_user_who_has_been_previously_deleted_fails(db_session: Session):
     """Test soft deleting a user who has been previously deleted fails."""
     # Given
@@ -306,7 +578,7 @@ def test_soft_delete_user_who_has_been_previously_deleted_fails(db_session: Sess
 
     # When
     with pytest.raises(UserHasBeenPreviouslyDeletedError):
-        soft_delete_user(db_session, user)
+        soft_delete_user(db_session, user.id)
 
     # Then
     db_user = db_session.get(User, user.id)
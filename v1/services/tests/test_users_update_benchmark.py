@@ -0,0 +1,114 @@
+"""Benchmark updating and soft deleting users with UPDATE ... RETURNING against update-then-reload.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.exceptions.users import UserIdDoesNotExistError
+from v1.schemas.users import UpdateUserService
+from v1.services.users import get_user_from_id, soft_delete_user, update_user_using_id
+
+NUMBER_OF_USERS = 200
+# Hashed password of the benchmarked users, which skips hashing, as it would dominate the setup time
+NOT_A_REAL_HASHED_PASSWORD = "not-a-real-hash"  # nosec: hardcoded_password_string
+
+
+@contextmanager
+def count_statements(db_session: Session) -> Iterator[list[str]]:
+    """Yield a list which collects every SQL statement sent to the database by the session."""
+    statements: list[str] = []
+
+    def collect_statement(*args: Any) -> None:  # noqa: ANN401
+        statements.append(args[2])
+
+    db_connection = db_session.connection()
+    event.listen(db_connection, "before_cursor_execute", collect_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(db_connection, "before_cursor_execute", collect_statement)
+
+
+def update_then_reload_user(db_session: Session, user_id: UUID, update_user_data: UpdateUserService) -> User:
+    """Update a user the way the PATCH endpoint used to: load, update, commit and then load again."""
+    if get_user_from_id(db_session, user_id) is None:
+        raise UserIdDoesNotExistError(id=user_id)
+    update_user_dict = update_user_data.model_dump(exclude_unset=True)
+    db_session.execute(update(User).where(User.id == user_id).values(**update_user_dict))
+    db_session.commit()
+    db_user = get_user_from_id(db_session, user_id)
+    # Serialise the response, which reloads the user after the commit expired it
+    db_user.to_dict()  # type: ignore[union-attr]
+    return db_user  # type: ignore[return-value]
+
+
+def get_latency_and_statements(
+    db_session: Session,
+    user_ids: list[UUID],
+    func: Callable[[UUID], Any],
+) -> tuple[float, float]:
+    """Return the median latency in seconds and the mean number of statements of calling func for each user id."""
+    latencies = []
+    with count_statements(db_session) as statements:
+        for user_id in user_ids:
+            start = time.perf_counter()
+            func(user_id)
+            latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies), len(statements) / len(user_ids)
+
+
+@pytest.mark.benchmark()
+def test_update_returning_reduces_round_trips(db_session: Session):
+    """Test that updating and soft deleting with UPDATE ... RETURNING needs fewer round trips than reloading."""
+    # Given
+    users = UserFactory.create_batch(NUMBER_OF_USERS * 2, hashed_password=NOT_A_REAL_HASHED_PASSWORD)
+    db_session.commit()
+    user_ids = [UUID(str(user.id)) for user in users]
+    update_user_data = UpdateUserService(last_name="Salvae")
+    delete_user_data = UpdateUserService(deleted_at=datetime.now(timezone.utc))
+
+    # When
+    results = {
+        "update-then-reload": get_latency_and_statements(
+            db_session,
+            user_ids[:NUMBER_OF_USERS],
+            lambda user_id: update_then_reload_user(db_session, user_id, update_user_data),
+        ),
+        "update-returning": get_latency_and_statements(
+            db_session,
+            user_ids[NUMBER_OF_USERS:],
+            lambda user_id: update_user_using_id(db_session, user_id, update_user_data).to_dict(),
+        ),
+        "soft-delete-then-reload": get_latency_and_statements(
+            db_session,
+            user_ids[:NUMBER_OF_USERS],
+            lambda user_id: update_then_reload_user(db_session, user_id, delete_user_data),
+        ),
+        "soft-delete-returning": get_latency_and_statements(
+            db_session,
+            user_ids[NUMBER_OF_USERS:],
+            lambda user_id: soft_delete_user(db_session, user_id).to_dict(),
+        ),
+    }
+
+    # Then
+    for operation in ["update", "soft-delete"]:
+        _reload_latency, reload_statements = results[f"{operation}-then-reload"]
+        _returning_latency, returning_statements = results[f"{operation}-returning"]
+        # Verify that the returning statement replaces the load before and the reload after the update.
+        # Latency is reported rather than asserted, as against a local database it is dominated by the commit.
+        assert returning_statements <= reload_statements - 2, results
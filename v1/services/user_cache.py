@@ -0,0 +1,52 @@
+"""In-process cache of users.
+
+Users are read far more often than they change, so reading a user by id is served from a cache. Cached users are
+immutable snapshots rather than ORM objects, so they can be safely shared between requests and sessions.
+
+Every write to a user in the users service invalidates the user's entry. Writes made by other processes are
+invalidated by the user cache invalidation listener. If invalidations are missed (e.g. the listener is disabled),
+then the time to live (TTL) bounds how stale a cached user can be.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Self
+from uuid import UUID
+
+from v1.database.models.users import User
+from v1.services.caching import TtlLruCache
+from v1.settings import USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable copy of a user's public fields at the time they were read from the database."""
+
+    id: UUID
+    first_name: str
+    last_name: str
+    email: str
+    is_superuser: bool
+    created_at: datetime
+    updated_at: datetime | None
+    deleted_at: datetime | None
+
+    @classmethod
+    def from_user(cls: type[Self], user: User) -> Self:
+        """Return snapshot of the user database model."""
+        return cls(
+            id=UUID(str(user.id)),
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+            deleted_at=user.deleted_at,
+        )
+
+
+user_cache: TtlLruCache[UUID, UserSnapshot] = TtlLruCache(
+    ttl_seconds=USER_CACHE_TTL_SECONDS,
+    max_size=USER_CACHE_MAX_SIZE,
+)
@@ -1,62 +1,328 @@
 """Users service."""
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, update
+from email_validator import EmailUndeliverableError
+from sqlalchemy import Row, Select, Update, select, tuple_, update
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.orm import Session
 
 from v1.database.models.users import User
-from v1.exceptions.users import UserHasBeenPreviouslyDeletedError
-from v1.schemas.users import CreateUserService, UpdateUserService
-from v1.services import passwords as common_services
+from v1.database.replicas import IS_REPLICA_SESSION
+from v1.exceptions.users import (
+    UserAlreadyExistsError,
+    UserEmailUndeliverableError,
+    UserHasBeenPreviouslyDeletedError,
+    UserIdDoesNotExistError,
+)
+from v1.schemas.users import (
+    BulkCreateUserResult,
+    BulkCreateUserStatus,
+    CreateUserService,
+    UpdateUserService,
+    UserCursor,
+    UserResponse,
+)
+from v1.services.emails import validate_and_normalize_email
+from v1.services.password_hashing import password_hashing_pool
+from v1.services.passwords import get_unknown_user_hashed_password
+from v1.services.user_cache import UserSnapshot, user_cache
+from v1.settings import DATABASE_REPLICA_MAX_LAG_SECONDS
+
+# Number of users fetched from the server-side cursor at a time when exporting users
+USERS_EXPORT_BATCH_SIZE = 1000
+
+
+def raise_if_any_email_is_undeliverable(emails: Iterable[str]) -> None:
+    """Raise UserEmailUndeliverableError if email cannot be delivered to any of the emails.
+
+    This may query the DNS, which blocks until it responds, so async callers run it in a thread. Results are cached
+    per domain (see the email deliverability service).
+    """
+    for email in emails:
+        try:
+            validate_and_normalize_email(email)
+        except EmailUndeliverableError as e:
+            raise UserEmailUndeliverableError(email=email, reason=str(e)) from e
 
 
 def create_user(db_session: Session, user: CreateUserService) -> User:
-    """Return created user."""
-    hashed_password = common_services.hash_password(user.password)
-    db_user = User(hashed_password=hashed_password, **user.model_dump(exclude={"password"}))
-    db_session.add(db_user)
+    """Return created user.
+
+    The user is inserted and returned in a single round trip. An existing email is detected by the insert itself,
+    rather than a prior select, so concurrent requests for the same email cannot race each other.
+
+    Raise UserEmailUndeliverableError if email cannot be delivered to the user's email.
+    Raise UserAlreadyExistsError if a user with the same email already exists.
+    """
+    raise_if_any_email_is_undeliverable([user.email])
+    hashed_password = password_hashing_pool.hash(user.password)
+    db_user = db_session.scalars(insert_users_statement([user], [hashed_password])).one_or_none()
+    if db_user is None:
+        db_session.rollback()
+        raise UserAlreadyExistsError(email=user.email)
+    # Detach the user, so committing does not expire it and reading it afterwards does not query the database again
+    db_session.expunge(db_user)
     db_session.commit()
+    user_cache.invalidate(db_user.id)
     return db_user
 
 
+def get_unique_emails(users: Sequence[CreateUserService]) -> list[str]:
+    """Return emails of the given users without duplicates, in the order they first appear."""
+    return list(dict.fromkeys(user.email for user in users))
+
+
+def get_new_users(users: Sequence[CreateUserService], existing_emails: set[str]) -> list[CreateUserService]:
+    """Return the first occurrence of each user whose email is not one of the existing emails."""
+    new_users = []
+    seen_emails = set(existing_emails)
+    for user in users:
+        if user.email not in seen_emails:
+            new_users.append(user)
+            seen_emails.add(user.email)
+    return new_users
+
+
+def insert_users_statement(users: Sequence[CreateUserService], hashed_passwords: Sequence[str]) -> Insert:
+    """Return a single multi-row insert statement for the given users, which returns the inserted users.
+
+    Users whose email already exists in the database are skipped rather than failing the whole statement.
+    """
+    rows = [
+        {"hashed_password": hashed_password, **user.model_dump(exclude={"password"})}
+        for user, hashed_password in zip(users, hashed_passwords, strict=True)
+    ]
+    return insert(User).values(rows).on_conflict_do_nothing(index_elements=[User.email]).returning(User)
+
+
+def get_bulk_create_user_results(
+    users: Sequence[CreateUserService],
+    created_users: Sequence[User],
+) -> list[BulkCreateUserResult]:
+    """Return the result of creating each of the given users, in the same order as the given users.
+
+    A user is created for the first occurrence of each email, if it did not already exist in the database.
+    """
+    email_to_created_user = {created_user.email: created_user for created_user in created_users}
+    results = []
+    seen_emails = set()
+    for user in users:
+        created_user = email_to_created_user.get(user.email)
+        if user.email in seen_emails:
+            result = BulkCreateUserResult(email=user.email, status=BulkCreateUserStatus.DUPLICATE_IN_REQUEST)
+        elif created_user is None:
+            result = BulkCreateUserResult(email=user.email, status=BulkCreateUserStatus.ALREADY_EXISTS)
+        else:
+            result = BulkCreateUserResult(
+                email=user.email,
+                status=BulkCreateUserStatus.CREATED,
+                user=UserResponse.model_validate(created_user, from_attributes=True),
+            )
+        seen_emails.add(user.email)
+        results.append(result)
+    return results
+
+
+def create_users(db_session: Session, users: Sequence[CreateUserService]) -> list[BulkCreateUserResult]:
+    """Return the result of creating each of the given users, in the same order as the given users.
+
+    Existing emails are found with a single query and the new users are created with a single multi-row insert.
+    Users with an email that already exists, or that is repeated within the given users, are not created.
+
+    Raise UserEmailUndeliverableError if email cannot be delivered to any of the users' emails.
+    """
+    unique_emails = get_unique_emails(users)
+    raise_if_any_email_is_undeliverable(unique_emails)
+    existing_emails = set(db_session.scalars(select(User.email).where(User.email.in_(unique_emails))))
+    new_users = get_new_users(users, existing_emails)
+
+    created_users: Sequence[User] = []
+    if new_users:
+        hashed_passwords = password_hashing_pool.hash_many([user.password for user in new_users])
+        created_users = db_session.scalars(insert_users_statement(new_users, hashed_passwords)).all()
+    # Read the created users before committing, as committing expires them
+    results = get_bulk_create_user_results(users, created_users)
+    db_session.commit()
+    user_cache.invalidate(*(result.user.id for result in results if result.user is not None))
+    return results
+
+
 def get_user_from_id(db_session: Session, user_id: UUID) -> User | None:
     """Return user model object from user id."""
     return db_session.get(User, user_id)
 
 
+def get_user_snapshot_from_id(db_session: Session, user_id: UUID) -> UserSnapshot | None:
+    """Return snapshot of the user from the user cache, reading the user from the database only if it is not cached."""
+    user_snapshot = user_cache.get(user_id)
+    if user_snapshot is None:
+        # Do not cache the user if it was written while it was being read, as it may be stale
+        generation = user_cache.generation
+        db_user = get_user_from_id(db_session, user_id)
+        if db_user is None:
+            return None
+        user_snapshot = UserSnapshot.from_user(db_user)
+        # A user read from a replica may already be stale, so only cache it for as long as a replica may lag
+        ttl_seconds = DATABASE_REPLICA_MAX_LAG_SECONDS if db_session.info.get(IS_REPLICA_SESSION) else None
+        user_cache.set(user_id, user_snapshot, ttl_seconds=ttl_seconds, generation=generation)
+    return user_snapshot
+
+
 def get_user_from_email(db_session: Session, email: str) -> User | None:
     """Return user by email."""
     return db_session.execute(select(User).filter_by(email=email)).scalar_one_or_none()
 
 
-def get_users(db_session: Session, offset: int = 0, limit: int = 100) -> Sequence[User]:
-    """Return users sorted by first, then last name, then id and also based on the offset and limit restriction."""
-    return db_session.scalars(
-        select(User).order_by(User.first_name.asc(), User.last_name.asc(), User.id.asc()).offset(offset).limit(limit),
-    ).all()
+def select_users_page(offset: int = 0, limit: int = 100, cursor: UserCursor | None = None) -> Select[tuple[User]]:
+    """Return query for users sorted by first, then last name, then id and restricted by the pagination arguments.
+
+    Keyword arguments:
+    offset -- number of users to skip (default 0)
+    limit -- maximum number of users to return (default 100)
+    cursor -- only return users which are sorted after this position (default None).
+        Unlike the offset, the database does not need to read the skipped users, so it is fast for deep pages.
+    """
+    query = select(User).order_by(User.first_name.asc(), User.last_name.asc(), User.id.asc())
+    if cursor is not None:
+        query = query.where(
+            tuple_(User.first_name, User.last_name, User.id) > tuple_(cursor.first_name, cursor.last_name, cursor.id),
+        )
+    return query.offset(offset).limit(limit)
+
+
+def get_users(
+    db_session: Session,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: UserCursor | None = None,
+) -> Sequence[User]:
+    """Return users sorted by first, then last name, then id and also based on the pagination restrictions.
 
+    See `select_users_page` for the pagination arguments.
+    """
+    return db_session.scalars(select_users_page(offset, limit, cursor)).all()
 
-def update_user_using_id(db_session: Session, user_id: UUID, update_user_data: UpdateUserService) -> None:
-    """Update user."""
+
+def select_users_export() -> Select[Any]:
+    """Return query for the user response columns of every user, sorted by id.
+
+    Rows are not loaded as ORM objects, so they do not accumulate in the session, and the hashed password is never
+    read. Sorting by the primary key lets the database return rows from its index without sorting the whole table.
+    """
+    return select(*(getattr(User, field_name) for field_name in UserResponse.model_fields)).order_by(User.id)
+
+
+def stream_users_export(
+    db_session: Session,
+    batch_size: int = USERS_EXPORT_BATCH_SIZE,
+) -> Iterator[Sequence[Row[Any]]]:
+    """Yield batches of every user, sorted by id.
+
+    Users are fetched with a server-side cursor, so only a single batch is held in memory however many users there are.
+
+    Keyword arguments:
+    db_session -- database session, which must stay open until every batch is read
+    batch_size -- number of users in each batch (default USERS_EXPORT_BATCH_SIZE)
+    """
+    result = db_session.execute(select_users_export().execution_options(yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def update_user_statement(user_id: UUID, update_user_dict: dict[str, Any]) -> Update:
+    """Return a statement which updates the user and returns the updated user.
+
+    The updated user is reloaded from the returned row, so the existence check, the update and loading the response
+    happen in a single round trip.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_user_dict)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+
+
+def update_user_using_id(db_session: Session, user_id: UUID, update_user_data: UpdateUserService) -> User:
+    """Return updated user.
+
+    Raise UserEmailUndeliverableError if email cannot be delivered to the updated email.
+    Raise UserIdDoesNotExistError if no user has the user id.
+    """
+    if update_user_data.email is not None:
+        raise_if_any_email_is_undeliverable([update_user_data.email])
     update_user_dict = update_user_data.model_dump(exclude={"password"}, exclude_unset=True)
     if update_user_data.password:
-        update_user_dict["hashed_password"] = common_services.hash_password(update_user_data.password)
+        update_user_dict["hashed_password"] = password_hashing_pool.hash(update_user_data.password)
 
-    db_session.execute(update(User).where(User.id == user_id).values(**update_user_dict))
+    if update_user_dict:
+        db_user = db_session.scalars(update_user_statement(user_id, update_user_dict)).one_or_none()
+    else:
+        # Nothing to update, so do not modify updated_at
+        db_user = get_user_from_id(db_session, user_id)
+    if db_user is None:
+        raise UserIdDoesNotExistError(id=user_id)
+    # Detach the user, so committing does not expire it and reading it afterwards does not query the database again
+    db_session.expunge(db_user)
     db_session.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
 
 
-def soft_delete_user(db_session: Session, user: User) -> None:
-    """Soft delete a user using user id."""
-    # Cannot delete a user who has already been deleted
-    if user.deleted_at is not None:
-        raise UserHasBeenPreviouslyDeletedError(email=user.email, deleted_at=user.deleted_at)
+def is_user_password_correct(db_session: Session, user: User, password: str) -> bool:
+    """Return True if plain text password matches the user's hashed password.
 
-    update_user_using_id(
-        db_session,
-        user.id,
-        update_user_data=UpdateUserService(deleted_at=datetime.now(timezone.utc)),
-    )
+    If the hashed password was created with outdated hashing parameters, then replace it with an upgraded hash.
+    """
+    is_correct, upgraded_hashed_password = password_hashing_pool.verify_and_rehash(password, user.hashed_password)
+    if upgraded_hashed_password is not None:
+        user.hashed_password = upgraded_hashed_password
+        db_session.commit()
+    return is_correct
+
+
+def authenticate_user(db_session: Session, email: str, password: str) -> User | None:
+    """Return the user with the email if the password is correct and they have not been deleted, otherwise None.
+
+    The password is verified even if no user has the email, so the time taken does not reveal which emails are used.
+    """
+    db_user = get_user_from_email(db_session, email)
+    if db_user is None:
+        password_hashing_pool.is_password_correct(password, get_unknown_user_hashed_password())
+        return None
+    if not is_user_password_correct(db_session, db_user, password) or db_user.deleted_at is not None:
+        return None
+    return db_user
+
+
+def soft_delete_user_statement(user_id: UUID) -> Update:
+    """Return a statement which soft deletes the user, if they have not already been deleted, and returns the user."""
+    return update_user_statement(user_id, {"deleted_at": datetime.now(timezone.utc)}).where(User.deleted_at.is_(None))
+
+
+def soft_delete_user(db_session: Session, user_id: UUID) -> User:
+    """Return soft deleted user.
+
+    The user is deleted in a single round trip. The user is only read again to find out why nothing was deleted.
+
+    Raise UserIdDoesNotExistError if no user has the user id.
+    Raise UserHasBeenPreviouslyDeletedError if the user has already been deleted.
+    """
+    db_user = db_session.scalars(soft_delete_user_statement(user_id)).one_or_none()
+    if db_user is None:
+        db_user = get_user_from_id(db_session, user_id)
+        # Cannot delete a user who has already been deleted
+        if db_user is not None and db_user.deleted_at is not None:
+            raise UserHasBeenPreviouslyDeletedError(email=db_user.email, deleted_at=db_user.deleted_at)
+        raise UserIdDoesNotExistError(id=user_id)
+    db_session.expunge(db_user)
+    db_session.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
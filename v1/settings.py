@@ -6,7 +6,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from v1.schemas.database import DatabaseInfo
-from v1.utils.utils import convert_string_to_bool
+from v1.utils.utils import convert_string_to_bool, convert_string_to_hosts
 
 ENV_FILEPATH = Path(__file__).resolve().parent / ".env"
 load_dotenv(dotenv_path=ENV_FILEPATH)
@@ -14,6 +14,9 @@ load_dotenv(dotenv_path=ENV_FILEPATH)
 # Database settings
 DEBUG_DATABASE = convert_string_to_bool(os.getenv("DEBUG_DATABASE", default="False"))
 DEBUG_TEST_DATABASE = convert_string_to_bool(os.getenv("DEBUG_TEST_DATABASE", default="True"))
+# USE_ASYNC_DATABASE serves the API with async route handlers and async database sessions.
+# Set it to False to fall back to the sync route handlers (e.g. to A/B test throughput).
+USE_ASYNC_DATABASE = convert_string_to_bool(os.getenv("USE_ASYNC_DATABASE", default="True"))
 
 db_info = DatabaseInfo(
     type_=os.getenv("DATABASE_TYPE", default="postgresql"),
@@ -22,9 +25,99 @@ db_info = DatabaseInfo(
     host=os.getenv("DATABASE_HOST", default="localhost"),
     port=int(os.getenv("DATABASE_PORT", default="5432")),
     name=os.getenv("DATABASE_NAME", default="quiz"),
+    async_driver=os.getenv("DATABASE_ASYNC_DRIVER", default="asyncpg"),
 )
 
+# Read replica settings
+# Comma separated replica hosts, each with an optional port (e.g. "replica-1:5432,replica-2"). Replicas use the same
+# user, password and database name as the primary. GET endpoints read from a replica, if one is configured.
+db_replica_infos = [
+    db_info.model_copy(update={"host": host, "port": port})
+    for host, port in convert_string_to_hosts(os.getenv("DATABASE_REPLICA_HOSTS", default=""), db_info.port)
+]
+# Replicas lagging behind the primary by more than this are not read from. A client which has just written also reads
+# from the primary for this long, so it reads its own writes.
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", default="5"))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS", default="1"),
+)
+
+# Database query instrumentation settings
+# Requests executing more statements, spending more seconds executing statements or executing the same statement more
+# times (e.g. N+1 queries) than these budgets are logged.
+DATABASE_REQUEST_QUERY_COUNT_BUDGET = int(os.getenv("DATABASE_REQUEST_QUERY_COUNT_BUDGET", default="10"))
+DATABASE_REQUEST_QUERY_SECONDS_BUDGET = float(os.getenv("DATABASE_REQUEST_QUERY_SECONDS_BUDGET", default="0.1"))
+DATABASE_REQUEST_REPEATED_QUERY_BUDGET = int(os.getenv("DATABASE_REQUEST_REPEATED_QUERY_BUDGET", default="3"))
+# Send the number of statements and the time spent executing them to clients in a Server-Timing header.
+USE_SERVER_TIMING_HEADER = convert_string_to_bool(os.getenv("USE_SERVER_TIMING_HEADER", default="True"))
+
+# Database connection pool settings
+# Each worker process keeps up to DATABASE_POOL_SIZE connections open and opens up to DATABASE_POOL_MAX_OVERFLOW more
+# under load. Requests wait up to DATABASE_POOL_TIMEOUT_SECONDS for a connection before failing.
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", default="5"))
+DATABASE_POOL_MAX_OVERFLOW = int(os.getenv("DATABASE_POOL_MAX_OVERFLOW", default="10"))
+DATABASE_POOL_TIMEOUT_SECONDS = float(os.getenv("DATABASE_POOL_TIMEOUT_SECONDS", default="30"))
+# Connections older than this are replaced, before a server or proxy closes them (-1 to never replace connections).
+DATABASE_POOL_RECYCLE_SECONDS = int(os.getenv("DATABASE_POOL_RECYCLE_SECONDS", default="1800"))
+# Ping idle connections when they are checked out, so connections closed by the server are replaced transparently.
+DATABASE_POOL_PRE_PING = convert_string_to_bool(os.getenv("DATABASE_POOL_PRE_PING", default="True"))
+# Number of connections opened on startup, so the first requests do not wait to connect. At most the pool size.
+DATABASE_POOL_WARMUP_SIZE = int(os.getenv("DATABASE_POOL_WARMUP_SIZE", default=str(DATABASE_POOL_SIZE)))
+
+# Health check settings
+# Readiness probes ping the database, failing if the ping takes longer than the timeout. Ping results are reused for
+# HEALTH_CHECK_CACHE_SECONDS, so frequent probes from load balancers do not load the database.
+HEALTH_CHECK_DATABASE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_DATABASE_TIMEOUT_SECONDS", default="1"))
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv("HEALTH_CHECK_CACHE_SECONDS", default="2"))
+# The worker is not ready once this fraction of its connection pool (including overflow) is in use.
+HEALTH_CHECK_MAX_POOL_SATURATION = float(os.getenv("HEALTH_CHECK_MAX_POOL_SATURATION", default="1"))
+
+# Password hashing settings
+# Argon2 hashing runs in a dedicated process pool with a bounded number of workers and queued hashes.
+# Once the queue is full, requests which need to hash a password are rejected with 503 Service Unavailable.
+PASSWORD_HASHING_MAX_WORKERS = int(os.getenv("PASSWORD_HASHING_MAX_WORKERS", default=str(os.cpu_count() or 1)))
+PASSWORD_HASHING_MAX_QUEUE_SIZE = int(os.getenv("PASSWORD_HASHING_MAX_QUEUE_SIZE", default="64"))
+# Argon2 cost parameters. Defaults are the argon2-cffi defaults (RFC 9106 low memory profile).
+# Use `make calibrate-password-hashing` to find parameters which suit the server hardware.
+# Existing hashes are upgraded to new parameters the next time their password is verified.
+PASSWORD_HASHING_TIME_COST = int(os.getenv("PASSWORD_HASHING_TIME_COST", default="3"))
+PASSWORD_HASHING_MEMORY_COST_KIB = int(os.getenv("PASSWORD_HASHING_MEMORY_COST_KIB", default="65536"))
+PASSWORD_HASHING_PARALLELISM = int(os.getenv("PASSWORD_HASHING_PARALLELISM", default="4"))
+
+# Email settings
+# Email deliverability is checked with a DNS query per domain. Results are cached for a time to live (TTL).
+# Undeliverable domains are cached for a shorter time, so a domain which was misconfigured is soon checked again.
+EMAIL_DELIVERABILITY_TIMEOUT_SECONDS = int(os.getenv("EMAIL_DELIVERABILITY_TIMEOUT_SECONDS", default="15"))
+EMAIL_DELIVERABILITY_CACHE_TTL_SECONDS = float(os.getenv("EMAIL_DELIVERABILITY_CACHE_TTL_SECONDS", default="3600"))
+EMAIL_DELIVERABILITY_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv("EMAIL_DELIVERABILITY_CACHE_NEGATIVE_TTL_SECONDS", default="300"),
+)
+EMAIL_DELIVERABILITY_CACHE_MAX_SIZE = int(os.getenv("EMAIL_DELIVERABILITY_CACHE_MAX_SIZE", default="10000"))
+
+# User cache settings
+# Users read by id are cached in each process. The TTL bounds how stale a user can be if invalidations are missed.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", default="60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", default="10000"))
+# LISTEN for users changed by any process (via a database trigger) and evict them from this process's user cache.
+USER_CACHE_LISTEN_FOR_INVALIDATIONS = convert_string_to_bool(
+    os.getenv("USER_CACHE_LISTEN_FOR_INVALIDATIONS", default="True"),
+)
+
+# Access token settings
+# Comma separated key id and secret pairs, e.g. "2026-10:secret,2026-04:previous-secret". Tokens are signed with the
+# first key and verified with any of them, so a key can be rotated by putting its replacement first.
+# Secrets must be at least 32 bytes long. The app fails to start if no keys are set, unless DEBUG_FASTAPI_APP is True,
+# in which case each process signs with a random key, so tokens are only valid in the process which issued them.
+ACCESS_TOKEN_SIGNING_KEYS = os.getenv("ACCESS_TOKEN_SIGNING_KEYS", default="")
+# Access tokens are short lived, as they are verified without the database, so a user's changes (e.g. deletion) and
+# revocations made in other processes only take effect once their tokens expire.
+ACCESS_TOKEN_TTL_SECONDS = int(os.getenv("ACCESS_TOKEN_TTL_SECONDS", default="900"))
+
 # FastAPI application settings
 APP_TITLE = os.getenv("APP_TITLE", default="Math Quiz")
 # DEBUG_FASTAPI_APP provides debug traceback on server errors.
 DEBUG_FASTAPI_APP = convert_string_to_bool(os.getenv("DEBUG_FASTAPI_APP", default="True"))
+
+# Test settings
+# Micro-benchmarks fail if they are more than this fraction slower than their baseline saved on the same machine.
+MICRO_BENCHMARK_TOLERANCE = float(os.getenv("MICRO_BENCHMARK_TOLERANCE", default="0.5"))
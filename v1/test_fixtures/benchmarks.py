@@ -0,0 +1,197 @@
+"""Micro-benchmark related test fixtures.
+
+Each micro-benchmark is warmed up, then timed over several rounds. Each round calls the function enough times to take
+at least MIN_ROUND_SECONDS, so fast functions are not lost in the timer's resolution. The garbage collector is paused
+while timing, like timeit.
+
+A benchmark fails if its fastest round is more than MICRO_BENCHMARK_TOLERANCE slower than the median round of the
+baseline saved on the same machine and python version. Comparing the fastest round with the median round means a run
+slowed by other processes, or a baseline which was unusually fast, does not fail a benchmark. The baseline only
+changes when it is saved on request, so gradual slowdowns over many runs add up until they fail.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+
+To save the results as the baseline (in MICRO_BENCHMARK_BASELINE_FILEPATH, which is specific to the machine, so not
+committed), do:
+pytest -m "benchmark" --save-benchmark-baseline
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Self
+
+import pytest
+
+from v1.settings import MICRO_BENCHMARK_TOLERANCE
+
+MICRO_BENCHMARK_BASELINE_FILEPATH = Path(__file__).resolve().parents[2] / "data" / "benchmarks" / "baseline.json"
+SAVE_BASELINE_OPTION = "--save-benchmark-baseline"
+WARMUP_SECONDS = 0.1
+ROUNDS = 15
+MIN_ROUND_SECONDS = 0.02
+
+
+@dataclass(frozen=True)
+class MicroBenchmarkResult:
+    """Seconds taken per call of a benchmarked function, over all rounds."""
+
+    rounds: int
+    iterations_per_round: int
+    median_seconds: float
+    min_seconds: float
+    stdev_seconds: float
+
+
+def get_environment() -> dict[str, Any]:
+    """Return the machine and python version, as benchmark results are only comparable within the same environment."""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def measure(
+    func: Callable[[], Any],
+    rounds: int = ROUNDS,
+    min_round_seconds: float = MIN_ROUND_SECONDS,
+    warmup_seconds: float = WARMUP_SECONDS,
+) -> MicroBenchmarkResult:
+    """Return the seconds taken per call of the function, after warming it up.
+
+    Keyword arguments:
+    func -- function to benchmark
+    rounds -- number of rounds timed (default ROUNDS)
+    min_round_seconds -- each round calls the function enough times to take at least this long
+        (default MIN_ROUND_SECONDS)
+    warmup_seconds -- the function is called for this long before timing, e.g. to fill caches (default WARMUP_SECONDS)
+    """
+    warmup_deadline = time.perf_counter() + warmup_seconds
+    func()
+    while time.perf_counter() < warmup_deadline:
+        func()
+
+    def time_round(iterations: int) -> float:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return time.perf_counter() - start_time
+
+    is_gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        iterations = 1
+        while time_round(iterations) < min_round_seconds:
+            iterations *= 2
+        seconds_per_call = [time_round(iterations) / iterations for _ in range(rounds)]
+    finally:
+        if is_gc_enabled:
+            gc.enable()
+    return MicroBenchmarkResult(
+        rounds=rounds,
+        iterations_per_round=iterations,
+        median_seconds=statistics.median(seconds_per_call),
+        min_seconds=min(seconds_per_call),
+        stdev_seconds=statistics.stdev(seconds_per_call) if rounds > 1 else 0.0,
+    )
+
+
+@dataclass
+class MicroBenchmarkResults:
+    """Baseline results saved in the same environment, if any, and results of the current run, by benchmark name."""
+
+    environment: dict[str, Any]
+    baseline: dict[str, MicroBenchmarkResult] = field(default_factory=dict)
+    current: dict[str, MicroBenchmarkResult] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls: type[Self], filepath: Path, environment: dict[str, Any]) -> Self:
+        """Return results with the baseline loaded from the file, unless it was saved in another environment."""
+        if not filepath.exists():
+            return cls(environment)
+        saved_results = json.loads(filepath.read_text())
+        if saved_results["environment"] != environment:
+            return cls(environment)
+        baseline = {name: MicroBenchmarkResult(**result) for name, result in saved_results["results"].items()}
+        return cls(environment, baseline)
+
+    def record(self: Self, name: str, result: MicroBenchmarkResult, tolerance: float) -> str | None:
+        """Record the benchmark's result and return a description of the regression if it is slower than the baseline.
+
+        The fastest round of the result is compared with the median round of the baseline result.
+        """
+        self.current[name] = result
+        baseline_result = self.baseline.get(name)
+        if baseline_result is not None and result.min_seconds > baseline_result.median_seconds * (1 + tolerance):
+            return (
+                f"{name} took at least {result.min_seconds * 1_000_000:.2f} us per call, "
+                f"{result.min_seconds / baseline_result.median_seconds - 1:.0%} slower than the baseline "
+                f"({baseline_result.median_seconds * 1_000_000:.2f} us per call)"
+            )
+        return None
+
+    def save_baseline(self: Self, filepath: Path) -> None:
+        """Save the results of the current run as the baseline, keeping the baseline of benchmarks which did not run."""
+        results = {**self.baseline, **self.current}
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(
+            json.dumps(
+                {
+                    "environment": self.environment,
+                    "results": {name: asdict(result) for name, result in sorted(results.items())},
+                },
+                indent=2,
+            )
+            + "\n",
+        )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to save the micro-benchmark results as the baseline."""
+    parser.addoption(
+        SAVE_BASELINE_OPTION,
+        action="store_true",
+        help="save the micro-benchmark results as the baseline, rather than failing benchmarks slower than it",
+    )
+
+
+@pytest.fixture(scope="session")
+def micro_benchmark_results(request: pytest.FixtureRequest) -> Iterator[MicroBenchmarkResults]:
+    """Yield the baseline results and, if requested, save the results of this run as the baseline at the end."""
+    results = MicroBenchmarkResults.load(MICRO_BENCHMARK_BASELINE_FILEPATH, get_environment())
+    yield results
+    if request.config.getoption(SAVE_BASELINE_OPTION) and results.current:
+        results.save_baseline(MICRO_BENCHMARK_BASELINE_FILEPATH)
+
+
+@pytest.fixture()
+def micro_benchmark(
+    request: pytest.FixtureRequest,
+    micro_benchmark_results: MicroBenchmarkResults,
+) -> Callable[[Callable[[], Any]], MicroBenchmarkResult]:
+    """Return a function which benchmarks a function, failing the test if it is slower than the baseline.
+
+    Benchmarks do not fail while the baseline is being saved.
+
+    Example:
+        micro_benchmark(lambda: validate_datetime_is_utc_timezone(now))
+    """
+    is_saving_baseline = request.config.getoption(SAVE_BASELINE_OPTION)
+
+    def benchmark(func: Callable[[], Any]) -> MicroBenchmarkResult:
+        result = measure(func)
+        regression = micro_benchmark_results.record(request.node.nodeid, result, MICRO_BENCHMARK_TOLERANCE)
+        if regression is not None and not is_saving_baseline:
+            pytest.fail(regression)
+        return result
+
+    return benchmark
@@ -3,19 +3,22 @@
 The test client will have all the required dependencies (e.g. database) overridden with the test equivalent.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from main import main_app
-from v1.views.base import get_db_session
+from main import create_app
+from v1.views.base import get_async_db_session, get_async_read_db_session, get_db_session, get_read_db_session
 
 
 @pytest.fixture()
 def fastapi_test_client(db_session: Generator[Session, None, None]):
-    """Test FastAPI client.
+    """Test FastAPI client for the app serving the sync endpoints.
 
     Use this to make requests to endpoints.
     Example:
@@ -25,6 +28,26 @@ def fastapi_test_client(db_session: Generator[Session, None, None]):
     def override_get_db_session() -> Generator[Generator[Session, None, None], None, None]:
         yield db_session
 
-    main_app.dependency_overrides[get_db_session] = override_get_db_session
-    yield TestClient(main_app)
-    del main_app.dependency_overrides[get_db_session]
+    app = create_app(use_async_database=False)
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_db_session] = override_get_db_session
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture()
+async def async_fastapi_test_client(async_db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+    """Test async FastAPI client for the app serving the async endpoints.
+
+    Use this to make requests to endpoints.
+    Example:
+        await async_fastapi_test_client.get("/health-check")
+    """
+
+    async def override_get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+        yield async_db_session
+
+    app = create_app(use_async_database=True)
+    app.dependency_overrides[get_async_db_session] = override_get_async_db_session
+    app.dependency_overrides[get_async_read_db_session] = override_get_async_db_session
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,23 @@
+"""Clock related test fixtures."""
+
+from typing import Self
+
+import pytest
+
+
+class FakeClock:
+    """Clock which only moves when told to, for testing anything that expires."""
+
+    def __init__(self: Self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self: Self) -> float:
+        """Return the current time in seconds."""
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    """Return a clock which only moves when told to."""
+    return FakeClock()
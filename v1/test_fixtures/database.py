@@ -1,50 +1,74 @@
 """Database related test fixtures.
 
+Each test session (i.e. each pytest-xdist worker) clones the template database (see the database templates module)
+into its own database, which is much faster than creating the schema, so setup time does not grow with the number of
+models.
+
 Based on: https://stackoverflow.com/a/67348153/5702056
 """
 
-from collections.abc import Generator
+import os
+from collections.abc import AsyncGenerator, Generator
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import RootTransaction, create_engine, event, text
+import pytest_asyncio
+from sqlalchemy import NullPool, RootTransaction, create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy_utils import create_database, database_exists, drop_database
+from sqlalchemy_utils import database_exists, drop_database
 
-from v1.database.models.base import SqlAlchemyBase
+from v1.database.instrumentation import instrument_engine
 from v1.database.models.test_factories.base import BaseFactory
+from v1.database.templates import create_db_from_template, get_template_db_info, get_template_db_name_prefix
 from v1.settings import DEBUG_TEST_DATABASE, db_info
 from v1.utils.utils import get_subclasses_of_class_from_package_recursively
 
+testing_template_db_name_prefix = get_template_db_name_prefix(db_info.name)
+testing_template_db_info = get_template_db_info(db_info)
 testing_db_info = db_info
-testing_db_info.name = f"test-{testing_db_info.name}-{uuid4().hex}"
+# Name the database after the pytest-xdist worker, so each worker of a test run has its own database
+testing_db_info.name = f"test-{testing_db_info.name}-{os.getenv('PYTEST_XDIST_WORKER', 'main')}-{uuid4().hex}"
 testing_db_engine = create_engine(url=testing_db_info.url, echo=DEBUG_TEST_DATABASE)
 TestingDbSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=testing_db_engine)
+# Every async test runs in its own event loop, so do not pool connections between tests
+testing_async_db_engine = create_async_engine(
+    url=testing_db_info.async_url,
+    echo=DEBUG_TEST_DATABASE,
+    poolclass=NullPool,
+)
+instrument_engine(testing_db_engine)
+instrument_engine(testing_async_db_engine)
+
+
+# Find the database model factories once, rather than walking the package for every test
+database_model_factories = get_subclasses_of_class_from_package_recursively(
+    parent_class=BaseFactory,
+    package="v1.database.models.test_factories",
+)
 
 
 def add_database_model_factories_to_db_session(provided_db_session: Session) -> None:
     """Add all database model factories to the provided database session."""
-    # Get database model factories
-    factory_models = get_subclasses_of_class_from_package_recursively(
-        parent_class=BaseFactory,
-        package="v1.database.models.test_factories",
-    )
-    for factory_ in factory_models:
+    for factory_ in database_model_factories:
         factory_._meta.sqlalchemy_session = provided_db_session  # pylint: disable=protected-access
 
 
 @pytest.fixture(scope="session", autouse=True)
 def _testing_db() -> Generator[None, None, None]:
-    """Create a test database."""
+    """Create the test database from the template database and drop it at the end of the test session."""
     # If database already exists, drop and create a fresh one again
     if database_exists(testing_db_info.url):
         drop_database(testing_db_info.url)
 
-    create_database(url=testing_db_info.url)
-
-    SqlAlchemyBase.metadata.create_all(bind=testing_db_engine)
+    create_db_from_template(
+        testing_db_info,
+        testing_template_db_info,
+        testing_template_db_name_prefix,
+        echo=DEBUG_TEST_DATABASE,
+    )
     yield
-    SqlAlchemyBase.metadata.drop_all(bind=testing_db_engine)
+    testing_db_engine.dispose()
     drop_database(testing_db_info.url)
 
 
@@ -83,3 +107,32 @@ def fixture_db_session(_testing_db: Generator[None, None, None]):
     db_session.close()
     db_transaction.rollback()
     db_connection.close()
+
+
+@pytest_asyncio.fixture(name="async_db_session")
+async def fixture_async_db_session(_testing_db: Generator[None, None, None]) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a test async database session.
+
+    Application code calling session.commit() only releases a savepoint,
+    so the overall transaction can be rolled back at the end.
+    Factories are attached to the underlying sync session; call `await async_db_session.commit()` to persist them.
+    """
+    async with testing_async_db_engine.connect() as db_connection:
+        db_transaction = await db_connection.begin()
+        db_session = AsyncSession(
+            bind=db_connection,
+            autoflush=False,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        # Set database timezone to UTC
+        await db_session.execute(text("SET TIME ZONE 'UTC'"))
+        # Attach factories to the current session
+        add_database_model_factories_to_db_session(db_session.sync_session)
+
+        yield db_session
+
+        # Rollback the overall transaction, restoring the state before the test ran.
+        await db_session.close()
+        await db_transaction.rollback()
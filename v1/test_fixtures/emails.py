@@ -0,0 +1,37 @@
+"""Email related test fixtures."""
+
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+import pytest
+
+from v1.services.email_deliverability import DomainDeliverability, email_deliverability_cache
+
+# Domains used by tests which are treated as being able to receive email
+DELIVERABLE_TEST_DOMAINS = frozenset({"gmail.com", "yahoo.com", "test-example.com", "tru-test.com"})
+
+
+class StubDeliverabilityResolver:
+    """Resolve deliverability from a fixed set of domains, without querying the DNS."""
+
+    def __init__(self: Self, deliverable_domains: Iterable[str] = DELIVERABLE_TEST_DOMAINS) -> None:
+        """Any domain which is not in deliverable domains is undeliverable."""
+        self.deliverable_domains = frozenset(deliverable_domains)
+        self.resolved_domains: list[str] = []
+
+    def __call__(self: Self, ascii_domain: str) -> DomainDeliverability:
+        """Return the deliverability of the domain."""
+        self.resolved_domains.append(ascii_domain)
+        if ascii_domain in self.deliverable_domains:
+            return DomainDeliverability(is_deliverable=True)
+        return DomainDeliverability(is_deliverable=False, reason=f"The domain name {ascii_domain} does not exist.")
+
+
+@pytest.fixture(autouse=True)
+def stub_deliverability_resolver(monkeypatch: pytest.MonkeyPatch) -> Iterator[StubDeliverabilityResolver]:
+    """Check email deliverability against a stub resolver, so tests do not depend on the DNS."""
+    resolver = StubDeliverabilityResolver()
+    monkeypatch.setattr(email_deliverability_cache, "resolver", resolver)
+    email_deliverability_cache.clear()
+    yield resolver
+    email_deliverability_cache.clear()
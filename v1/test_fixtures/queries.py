@@ -0,0 +1,46 @@
+"""Database query related test fixtures."""
+
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+
+from v1.database.instrumentation import QueryStats, track_queries
+
+# Statements issued by the test database sessions to roll back each test, rather than by the code under test
+TEST_TRANSACTION_STATEMENT_PREFIXES = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+def count_queries(query_stats: QueryStats) -> int:
+    """Return the number of statements recorded in the query stats, excluding those of the test transaction."""
+    return sum(
+        count
+        for statement, count in query_stats.statement_counts.items()
+        if not statement.startswith(TEST_TRANSACTION_STATEMENT_PREFIXES)
+    )
+
+
+@contextmanager
+def assert_query_count_context(expected_count: int) -> Iterator[QueryStats]:
+    """Assert the code run within the context executes the expected number of statements."""
+    with track_queries() as query_stats:
+        yield query_stats
+    statements = "\n".join(
+        f"{count} x {statement}"
+        for statement, count in query_stats.statement_counts.items()
+        if not statement.startswith(TEST_TRANSACTION_STATEMENT_PREFIXES)
+    )
+    assert (
+        count_queries(query_stats) == expected_count
+    ), f"Expected {expected_count} queries, but {count_queries(query_stats)} were executed:\n{statements}"
+
+
+@pytest.fixture()
+def assert_query_count() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """Return a context manager asserting the number of statements executed within it, to pin an endpoint's queries.
+
+    Example:
+        with assert_query_count(1):
+            fastapi_test_client.get("/api/v1/users")
+    """
+    return assert_query_count_context
@@ -0,0 +1,82 @@
+"""Tests for micro-benchmark test fixtures."""
+
+from pathlib import Path
+
+from v1.test_fixtures.benchmarks import MicroBenchmarkResult, MicroBenchmarkResults, measure
+
+ENVIRONMENT = {"node": "test", "machine": "x86_64", "cpu_count": 4, "python": "3.11.7"}
+
+
+def get_result(median_seconds: float, min_seconds: float | None = None) -> MicroBenchmarkResult:
+    """Return a benchmark result whose median and fastest rounds took the given seconds per call."""
+    return MicroBenchmarkResult(
+        rounds=5,
+        iterations_per_round=100,
+        median_seconds=median_seconds,
+        min_seconds=median_seconds if min_seconds is None else min_seconds,
+        stdev_seconds=median_seconds / 10,
+    )
+
+
+def test_measure():
+    """Test each round calls the function enough times to take at least the minimum round time."""
+    # Given
+    calls = []
+
+    # When
+    result = measure(lambda: calls.append(1), rounds=3, min_round_seconds=0.001, warmup_seconds=0)
+
+    # Then
+    assert result.rounds == 3
+    assert result.iterations_per_round > 1
+    assert len(calls) > 3 * result.iterations_per_round
+    assert 0 < result.min_seconds <= result.median_seconds
+
+
+def test_micro_benchmark_results_compare_with_baseline_in_same_environment(tmp_path: Path):
+    """Test benchmarks slower than the baseline beyond the tolerance regress, and saving replaces the baseline."""
+    # Given
+    filepath = tmp_path / "baseline.json"
+    baseline_results = MicroBenchmarkResults(
+        ENVIRONMENT,
+        current={"fast": get_result(1), "noisy": get_result(1), "not-run": get_result(3)},
+    )
+    baseline_results.save_baseline(filepath)
+
+    # When
+    results = MicroBenchmarkResults.load(filepath, ENVIRONMENT)
+    fast_regression = results.record("fast", get_result(1.6), tolerance=0.5)
+    noisy_regression = results.record("noisy", get_result(2, min_seconds=1.4), tolerance=0.5)
+    new_regression = results.record("new", get_result(2), tolerance=0.5)
+    results.save_baseline(filepath)
+
+    # Then
+    assert fast_regression is not None
+    assert "60% slower than the baseline" in fast_regression
+    assert noisy_regression is None
+    assert new_regression is None
+    assert MicroBenchmarkResults.load(filepath, ENVIRONMENT).baseline == {
+        "fast": get_result(1.6),
+        "new": get_result(2),
+        "noisy": get_result(2, min_seconds=1.4),
+        "not-run": get_result(3),
+    }
+    assert MicroBenchmarkResults.load(filepath, {**ENVIRONMENT, "cpu_count": 8}).baseline == {}
+
+
+def test_micro_benchmark_results_catch_gradual_slowdowns(tmp_path: Path):
+    """Test runs which are each within the tolerance regress once they add up, as the baseline is not replaced."""
+    # Given
+    filepath = tmp_path / "baseline.json"
+    MicroBenchmarkResults(ENVIRONMENT, current={"slowing": get_result(1)}).save_baseline(filepath)
+
+    # When
+    regressions = [
+        MicroBenchmarkResults.load(filepath, ENVIRONMENT).record("slowing", get_result(seconds), tolerance=0.5)
+        for seconds in (1.2, 1.4, 1.6)
+    ]
+
+    # Then
+    assert regressions[:2] == [None, None]
+    assert regressions[2] is not None
+    assert "60% slower than the baseline" in regressions[2]
@@ -1,8 +1,11 @@
 """Database related test fixtures."""
 
+from collections.abc import Iterator
+
 import pytest
 
 from v1.schemas.users import CreateUserRequest
+from v1.services.user_cache import user_cache
 
 
 @pytest.fixture()
@@ -15,3 +18,11 @@ def create_user_request() -> CreateUserRequest:
         is_superuser=False,
         password="David@512BC!",  # nosec: hardcoded_password_funcarg
     )
+
+
+@pytest.fixture(autouse=True)
+def _clear_user_cache() -> Iterator[None]:
+    """Start every test with an empty user cache, as database changes are rolled back between tests."""
+    user_cache.clear()
+    yield
+    user_cache.clear()
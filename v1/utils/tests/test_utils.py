@@ -15,6 +15,7 @@ from v1.test_fixtures.sample_package.omnivores.birds.peacock import African, Ind
 from v1.test_fixtures.sample_package.sea_animals import BlueWhale, Dolphin, SeaAnimal, Whale
 from v1.utils.utils import (
     convert_string_to_bool,
+    convert_string_to_hosts,
     get_class_variables,
     get_classes_from_package_recursively,
     get_subclasses_of_class_from_package_recursively,
@@ -33,6 +34,20 @@ def test_convert_string_to_bool_for_false_cases(bool_as_str: str) -> None:
     assert convert_string_to_bool(bool_as_str) is False
 
 
+@pytest.mark.parametrize(
+    ("hosts_as_str", "expected_hosts"),
+    [
+        ("", []),
+        ("replica", [("replica", 5432)]),
+        ("replica-1:5433, replica-2,", [("replica-1", 5433), ("replica-2", 5432)]),
+    ],
+    ids=["empty", "without-port", "many"],
+)
+def test_convert_string_to_hosts(hosts_as_str: str, expected_hosts: list[tuple[str, int]]) -> None:
+    """Test convert comma separated hosts, with optional ports, to hosts and ports."""
+    assert convert_string_to_hosts(hosts_as_str, default_port=5432) == expected_hosts
+
+
 def test_get_class_variables_for_regular_class(complex_regular_class: type) -> None:
     """Test get_class_variables function for a regular but complex class as well as it's instance."""
     expected_class_variables = {"created_at", "updated_at", "deleted_at", "created_by", "updated_by", "deleted_by"}
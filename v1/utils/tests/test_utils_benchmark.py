@@ -0,0 +1,22 @@
+"""Micro-benchmark utils.
+
+Benchmarks are excluded from the default test run. To run them, do:
+pytest -m "benchmark"
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from v1.test_fixtures.benchmarks import MicroBenchmarkResult
+from v1.utils.utils import get_class_variables
+
+
+@pytest.mark.benchmark()
+def test_get_class_variables_benchmark(
+    micro_benchmark: Callable[[Callable[[], Any]], MicroBenchmarkResult],
+    complex_dataclass: type,
+):
+    """Benchmark getting the class variables of a dataclass."""
+    micro_benchmark(lambda: get_class_variables(complex_dataclass))
@@ -3,6 +3,7 @@
 import importlib
 import inspect
 import pkgutil
+from functools import cache
 
 
 def convert_string_to_bool(bool_as_str: str) -> bool:
@@ -10,6 +11,21 @@ def convert_string_to_bool(bool_as_str: str) -> bool:
     return bool_as_str.lower() in ["true", "t", "yes", "y", "1"]
 
 
+def convert_string_to_hosts(hosts_as_str: str, default_port: int) -> list[tuple[str, int]]:
+    """Convert a comma separated string of hosts, each with an optional port, to a list of hosts and ports.
+
+    Example:
+    >>> convert_string_to_hosts("replica-1:5433, replica-2", default_port=5432)
+    ... [("replica-1", 5433), ("replica-2", 5432)]
+    """
+    hosts = []
+    for host_as_str in hosts_as_str.split(","):
+        if host_as_str.strip():
+            host, _, port = host_as_str.strip().partition(":")
+            hosts.append((host, int(port) if port else default_port))
+    return hosts
+
+
 def get_class_variables(cls_or_instance: type | object) -> set[str]:
     """Return a set of attribute names that are considered to be class-level variables that are not private.
 
@@ -40,6 +56,9 @@ def get_class_variables(cls_or_instance: type | object) -> set[str]:
 def get_classes_from_package_recursively(package: str) -> list[type]:
     """Return a list of classes inside a given package (recurse thorugh any sub-packages).
 
+    Packages are only walked, and their modules imported, the first time they are searched. Modules added to a package
+    afterwards are not found.
+
     Keyword arguments:
     package -- package represented as a string. Must not be relative.
 
@@ -48,13 +67,19 @@ def get_classes_from_package_recursively(package: str) -> list[type]:
     >>> classes
     ... [SqlAlchemyBase, TimeAudit, Users, etc...]
     """
-    classes_in_package = []
+    return list(_get_classes_from_package_recursively(package))
+
+
+@cache
+def _get_classes_from_package_recursively(package: str) -> tuple[type, ...]:
+    """Return the classes inside a given package. See `get_classes_from_package_recursively` for details."""
+    classes_in_package: list[type] = []
     # Go through the modules in the package
     for _importer, module_name, is_package in pkgutil.iter_modules(importlib.import_module(package).__path__):
         full_module_name = f"{package}.{module_name}"
         # Recurse through any sub-packages
         if is_package:
-            classes_in_subpackage = get_classes_from_package_recursively(package=full_module_name)
+            classes_in_subpackage = _get_classes_from_package_recursively(package=full_module_name)
             classes_in_package.extend(classes_in_subpackage)
 
         # Load the module for inspection
@@ -67,7 +92,7 @@ def get_classes_from_package_recursively(package: str) -> list[type]:
             lambda member, module_name=full_module_name: inspect.isclass(member) and member.__module__ == module_name,
         ):
             classes_in_package.append(obj)
-    return classes_in_package
+    return tuple(classes_in_package)
 
 
 def get_subclasses_of_class_from_package_recursively(parent_class: type, package: str) -> list[type]:
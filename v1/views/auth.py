@@ -0,0 +1,34 @@
+"""Authentication endpoints."""
+
+from http import HTTPStatus
+
+from fastapi import Response
+
+from v1.exceptions.auth import IncorrectLoginError
+from v1.schemas.auth import AccessTokenResponse, LoginRequest
+from v1.services import users as users_service
+from v1.services.access_tokens import issue_access_token, revoked_access_tokens
+from v1.settings import ACCESS_TOKEN_TTL_SECONDS
+from v1.views.base import APIRouter, DbSession, RouteTags
+from v1.views.dependencies.auth import AccessTokenClaimsDependency
+
+router = APIRouter(prefix="/auth", tags=[RouteTags.AUTH])
+
+
+@router.post("/login", response_model=AccessTokenResponse)
+def login(db_session: DbSession, login_request: LoginRequest) -> AccessTokenResponse:
+    """Return a short lived access token if the email and password are correct.
+
+    The password is verified in the password hashing pool, while this endpoint waits in a thread.
+    """
+    db_user = users_service.authenticate_user(db_session, login_request.email, login_request.password)
+    if db_user is None:
+        raise IncorrectLoginError
+    return AccessTokenResponse(access_token=issue_access_token(db_user.id), expires_in=ACCESS_TOKEN_TTL_SECONDS)
+
+
+@router.post("/logout", status_code=HTTPStatus.NO_CONTENT)
+async def logout(access_token_claims: AccessTokenClaimsDependency) -> Response:
+    """Revoke the request's access token."""
+    revoked_access_tokens.revoke(access_token_claims)
+    return Response(status_code=HTTPStatus.NO_CONTENT)
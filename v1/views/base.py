@@ -1,14 +1,31 @@
 """Router related code."""
 
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, Callable, Generator
 from enum import Enum
+from http import HTTPStatus
 from typing import Annotated, Any, Self
 
 from fastapi import APIRouter as FastAPIRouter
-from fastapi import Depends
+from fastapi import Depends, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 
-from v1.database.connections import get_db_session
+from v1.api_infra.middlewares.read_your_writes import is_reading_own_writes
+from v1.database.connections import (
+    create_async_read_db_session,
+    create_read_db_session,
+    get_async_db_session,
+    get_db_session,
+)
+from v1.services.conditional_requests import (
+    IF_MODIFIED_SINCE_HEADER,
+    IF_NONE_MATCH_HEADER,
+    ConditionalHeaders,
+    get_conditional_headers,
+    is_not_modified,
+)
+from v1.views.responses import FastJSONResponse
 
 
 class APIRouter(FastAPIRouter):
@@ -31,11 +48,73 @@ class APIRouter(FastAPIRouter):
         return super().add_api_route(path, endpoint, include_in_schema=include_in_schema, **kwargs)
 
 
+# Response header holding the cursor to the next page of a keyset paginated listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_conditional_response(
+    request: Request,
+    content: Any,  # noqa: ANN401
+    type_adapter: TypeAdapter[Any],
+    conditional_headers: ConditionalHeaders,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Return the content as JSON, with ETag and Last-Modified headers.
+
+    Return 304 Not Modified, with the same headers but without rendering the content, if the If-None-Match or
+    If-Modified-Since header of the request shows the request's copy of the content is up to date.
+
+    Keyword arguments:
+    request -- request whose conditional headers are checked
+    content -- content of the response, e.g. ORM objects
+    type_adapter -- adapter of the response model, used to render the content
+    conditional_headers -- ETag and Last-Modified time of the current version of the content
+    headers -- other response headers (default None)
+    """
+    etag, last_modified = conditional_headers.etag, conditional_headers.last_modified
+    headers = {**(headers or {}), **get_conditional_headers(etag, last_modified)}
+    if is_not_modified(
+        request.headers.get(IF_NONE_MATCH_HEADER),
+        request.headers.get(IF_MODIFIED_SINCE_HEADER),
+        etag,
+        last_modified,
+    ):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return FastJSONResponse(content, headers=headers, type_adapter=type_adapter)
+
+
 class RouteTags(Enum):
     """API route tags that can be used in documentation (e.g. OpenAPI Schema)."""
 
     HEALTH_CHECK = "health-check"
+    METRICS = "metrics"
+    AUTH = "auth"
     USERS = "users"
 
 
+def get_read_db_session(request: Request) -> Generator[Session, None, None]:
+    """Yield database session for reads, which reads from the primary if the client wrote recently.
+
+    See `create_read_db_session` in the database connections for details.
+    """
+    db_session = create_read_db_session(prefer_primary=is_reading_own_writes(request))
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+
+async def get_async_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield async database session for reads, which reads from the primary if the client wrote recently.
+
+    See `create_read_db_session` in the database connections for details.
+    """
+    async with create_async_read_db_session(prefer_primary=is_reading_own_writes(request)) as db_session:
+        yield db_session
+
+
 DbSession = Annotated[Session, Depends(get_db_session)]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db_session)]
+# Sessions for endpoints which only read, which may read from a replica
+ReadDbSession = Annotated[Session, Depends(get_read_db_session)]
+AsyncReadDbSession = Annotated[AsyncSession, Depends(get_async_read_db_session)]
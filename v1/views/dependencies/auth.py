@@ -0,0 +1,28 @@
+"""Dependencies for authenticated endpoints."""
+
+from typing import Annotated
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from v1.exceptions.auth import InvalidAccessTokenError
+from v1.schemas.auth import AccessTokenClaims
+from v1.services.access_tokens import verify_access_token
+
+# Missing credentials raise InvalidAccessTokenError below, so every authentication failure has the same response
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_access_token_claims(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+) -> AccessTokenClaims:
+    """Get claims of the request's bearer access token, verified in memory without reading the database.
+
+    The dependency is async, so it runs on the event loop rather than in a thread, as it never blocks.
+    """
+    if credentials is None:
+        raise InvalidAccessTokenError(reason="Missing bearer token")
+    return verify_access_token(credentials.credentials)
+
+
+AccessTokenClaimsDependency = Annotated[AccessTokenClaims, Depends(get_access_token_claims)]
@@ -5,18 +5,28 @@ from uuid import UUID
 
 from fastapi import Depends
 
-from v1.database.models.users import User
 from v1.exceptions.users import UserIdDoesNotExistError
+from v1.services import async_users as async_users_service
 from v1.services import users as users_service
-from v1.views.base import DbSession
+from v1.services.user_cache import UserSnapshot
+from v1.views.base import AsyncReadDbSession, ReadDbSession
 
 
-def get_user_parameter_from_user_id(db_session: DbSession, user_id: UUID) -> User:
-    """Get user object from user id."""
-    user = users_service.get_user_from_id(db_session, user_id)
+def get_user_parameter_from_user_id(db_session: ReadDbSession, user_id: UUID) -> UserSnapshot:
+    """Get snapshot of the user from user id."""
+    user = users_service.get_user_snapshot_from_id(db_session, user_id)
     if user is None:
         raise UserIdDoesNotExistError(id=user_id)
     return user
 
 
-UserDependency = Annotated[User, Depends(get_user_parameter_from_user_id)]
+async def get_async_user_parameter_from_user_id(db_session: AsyncReadDbSession, user_id: UUID) -> UserSnapshot:
+    """Get snapshot of the user from user id using an async database session."""
+    user = await async_users_service.get_user_snapshot_from_id(db_session, user_id)
+    if user is None:
+        raise UserIdDoesNotExistError(id=user_id)
+    return user
+
+
+UserDependency = Annotated[UserSnapshot, Depends(get_user_parameter_from_user_id)]
+AsyncUserDependency = Annotated[UserSnapshot, Depends(get_async_user_parameter_from_user_id)]
@@ -1,11 +1,84 @@
 """Health check endpoints."""
 
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, Request, Response
+
+from v1.database.connections import get_created_engines, get_db_async_engine, get_db_engine
+from v1.database.pools import PoolStats, get_pool_stats
+from v1.services.health_checks import (
+    CachedDatabasePing,
+    Readiness,
+    get_readiness,
+    ping_async_database,
+    ping_database,
+)
+from v1.settings import (
+    HEALTH_CHECK_CACHE_SECONDS,
+    HEALTH_CHECK_DATABASE_TIMEOUT_SECONDS,
+    HEALTH_CHECK_MAX_POOL_SATURATION,
+)
 from v1.views.base import APIRouter, RouteTags
 
 router = APIRouter(prefix="/health-check", tags=[RouteTags.HEALTH_CHECK])
 
+database_ping = CachedDatabasePing(
+    lambda: ping_database(get_db_engine(), HEALTH_CHECK_DATABASE_TIMEOUT_SECONDS),
+    HEALTH_CHECK_CACHE_SECONDS,
+)
+async_database_ping = CachedDatabasePing(
+    lambda: ping_async_database(get_db_async_engine(), HEALTH_CHECK_DATABASE_TIMEOUT_SECONDS),
+    HEALTH_CHECK_CACHE_SECONDS,
+)
+
+
+def get_database_ping(request: Request) -> CachedDatabasePing:
+    """Return the database ping of the engine serving the app."""
+    return async_database_ping if request.app.state.use_async_database else database_ping
+
+
+def get_serving_pool_stats(request: Request) -> PoolStats | None:
+    """Return the metrics of the connection pool of the engine serving the app."""
+    return get_pool_stats(get_db_async_engine() if request.app.state.use_async_database else get_db_engine())
+
 
 @router.get("/")
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"message": "Alive and well!"}
+
+
+@router.get("/live")
+async def liveness() -> dict:
+    """Return 200 while the worker is running and responsive, without checking its dependencies.
+
+    Use for liveness probes, so a worker is only restarted if it is stuck, not when the database is down.
+    """
+    return {"message": "Alive and well!"}
+
+
+@router.get("/ready", responses={HTTPStatus.SERVICE_UNAVAILABLE.value: {"model": Readiness}})
+async def readiness(
+    response: Response,
+    cached_database_ping: Annotated[CachedDatabasePing, Depends(get_database_ping)],
+    pool_stats: Annotated[PoolStats | None, Depends(get_serving_pool_stats)],
+) -> Readiness:
+    """Return whether the worker can serve traffic, with 503 Service Unavailable if it cannot.
+
+    The worker is ready if the database answers a ping within the timeout and its connection pool is not saturated.
+    Use for readiness probes, so load balancers stop sending traffic to the worker until it has recovered.
+    """
+    worker_readiness = get_readiness(await cached_database_ping.get(), pool_stats, HEALTH_CHECK_MAX_POOL_SATURATION)
+    if not worker_readiness.is_ready:
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    return worker_readiness
+
+
+@router.get("/database-pool")
+async def database_pool_stats() -> dict[str, PoolStats | None]:
+    """Return the live metrics of this worker's database connection pools by engine name, for monitoring.
+
+    Only the engines which have been created, i.e. used, are returned, so this does not create any engines.
+    """
+    return {name: get_pool_stats(engine) for name, engine in get_created_engines().items()}
@@ -0,0 +1,31 @@
+"""Metrics endpoints."""
+
+from fastapi import Response
+
+from v1.database.connections import get_created_engines
+from v1.database.pools import get_pool_stats
+from v1.services.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    PrometheusTextWriter,
+    add_password_hashing_metrics,
+    add_pool_metrics,
+    add_request_metrics,
+    request_metrics,
+)
+from v1.services.password_hashing import password_hashing_pool
+from v1.views.base import APIRouter, RouteTags
+
+router = APIRouter(tags=[RouteTags.METRICS])
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics() -> Response:
+    """Return this worker's request, database pool and password hashing metrics in the Prometheus text format.
+
+    Pool metrics are only returned for the engines which have been created, i.e. used.
+    """
+    writer = PrometheusTextWriter()
+    add_request_metrics(writer, request_metrics)
+    add_pool_metrics(writer, {name: get_pool_stats(engine) for name, engine in get_created_engines().items()})
+    add_password_hashing_metrics(writer, password_hashing_pool.stats())
+    return Response(content=writer.render(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
@@ -0,0 +1,45 @@
+"""Response classes."""
+
+from typing import Any, Self
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON response rendered by orjson or, for pydantic types, by a type adapter.
+
+    FastAPI validates what an endpoint returns against its response model, dumps the models to dicts and then encodes
+    the dicts as JSON. Endpoints returning ORM objects can skip this by returning this response with a type adapter:
+    the objects are validated into the adapter's type once and dumped straight to JSON bytes by pydantic-core.
+    Content without a type adapter (e.g. that of endpoints returning dicts) is encoded by orjson.
+    """
+
+    def __init__(
+        self: Self,
+        content: Any,  # noqa: ANN401
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        type_adapter: TypeAdapter[Any] | None = None,
+    ) -> None:
+        """Render the content.
+
+        Keyword arguments:
+        content -- content of the response, e.g. ORM objects if a type adapter is given
+        status_code -- HTTP status code (default 200)
+        headers -- response headers (default None)
+        media_type -- media type of the response (default application/json)
+        background -- task run after the response is sent (default None)
+        type_adapter -- adapter of the response model, which reads the content's attributes (default None)
+        """
+        self.type_adapter = type_adapter
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self: Self, content: Any) -> bytes:  # noqa: ANN401
+        """Return the content encoded as JSON."""
+        if self.type_adapter is None:
+            return super().render(content)
+        return self.type_adapter.dump_json(self.type_adapter.validate_python(content, from_attributes=True))
@@ -0,0 +1,58 @@
+"""Test module for async authentication router."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main import API_V1_PREFIX
+from v1.database.models.test_factories.users import UserFactory
+from v1.services.access_tokens import verify_access_token
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_login_and_logout(async_fastapi_test_client: AsyncClient, async_db_session: AsyncSession):
+    """Test async login returns an access token for the user, which is revoked by logging out."""
+    # Given
+    user = UserFactory()
+    await async_db_session.commit()
+
+    # When
+    response = await async_fastapi_test_client.post(
+        f"{API_V1_PREFIX}/auth/login",
+        json={"email": user.email, "password": UserFactory.password},
+    )
+
+    # Then
+    assert response.status_code == 200
+    access_token = response.json()["access_token"]
+    assert str(verify_access_token(access_token).sub) == str(user.id)
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await async_fastapi_test_client.post(f"{API_V1_PREFIX}/auth/logout", headers=headers)
+    assert response.status_code == 204
+    response = await async_fastapi_test_client.post(f"{API_V1_PREFIX}/auth/logout", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_login_with_incorrect_credentials_fails(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+):
+    """Test async login with an incorrect password or an unknown email fails."""
+    # Given
+    user = UserFactory()
+    await async_db_session.commit()
+
+    # When
+    responses = [
+        await async_fastapi_test_client.post(f"{API_V1_PREFIX}/auth/login", json={"email": email, "password": password})
+        for email, password in [(user.email, "=TopSecRET42"), ("unknown.user@gmail.com", UserFactory.password)]
+    ]
+
+    # Then
+    for response in responses:
+        assert response.status_code == 401
+        assert response.json() == {"message": "Incorrect email or password."}
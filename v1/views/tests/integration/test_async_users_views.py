@@ -0,0 +1,249 @@
+"""Test module for async user router."""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from operator import itemgetter
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main import API_V1_PREFIX
+from v1.database.instrumentation import QueryStats
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.schemas.users import CreateUserRequest
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_create_user(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+    create_user_request: CreateUserRequest,
+):
+    """Test async create user route and response."""
+    # When
+    response = await async_fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=create_user_request.model_dump())
+
+    # Then
+    response_data = response.json()
+    assert response.status_code == 201
+    assert response_data["email"] == create_user_request.email
+    assert "hashed_password" not in response_data
+    assert response_data["updated_at"] == response_data["created_at"]
+
+    # Verify information recorded in database is correct
+    db_user = await async_db_session.get(User, uuid.UUID(response_data["id"]))
+    assert db_user is not None
+    assert db_user.email == create_user_request.email
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_creating_a_user_who_already_exists_fails(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+    create_user_request: CreateUserRequest,
+):
+    """Test that given a user already exists, they cannot be created again using the async route."""
+    # Given
+    user = create_user_request.model_dump()
+    UserFactory(**user)
+    await async_db_session.commit()
+
+    # When
+    response = await async_fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=user)
+
+    # Then
+    assert response.status_code == 400
+    assert response.json() == {
+        "message": f"User {user['email']} already exists. Cannot create a user who already exists.",
+    }
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_create_users(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+    create_user_request: CreateUserRequest,
+):
+    """Test async bulk create users route and response."""
+    # Given
+    existing_user = UserFactory()
+    await async_db_session.commit()
+    new_user = create_user_request.model_dump()
+
+    # When
+    response = await async_fastapi_test_client.post(
+        f"{API_V1_PREFIX}/users/bulk",
+        json={"users": [new_user, {**new_user, "email": existing_user.email}]},
+    )
+
+    # Then
+    response_data = response.json()
+    assert response.status_code == 200
+    assert [result["status"] for result in response_data] == ["created", "already_exists"]
+    assert response_data[0]["user"]["email"] == new_user["email"]
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_read_users(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+    assert_query_count: Callable[[int], AbstractContextManager[QueryStats]],
+):
+    """Test getting a list of users using the async route."""
+    # Given
+    users = UserFactory.create_batch(3)
+    await async_db_session.commit()
+
+    # When
+    with assert_query_count(1):
+        response = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users")
+
+    # Then
+    response_data = response.json()
+    assert response.status_code == 200
+    assert sorted(user["id"] for user in response_data) == sorted(str(user.id) for user in users)
+    assert response_data == sorted(response_data, key=itemgetter("first_name", "last_name", "id"))
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_export_users(async_fastapi_test_client: AsyncClient, async_db_session: AsyncSession):
+    """Test exporting every user using the async route."""
+    # Given
+    users = UserFactory.create_batch(3)
+    await async_db_session.commit()
+    user_ids = sorted(str(user.id) for user in users)
+
+    # When
+    ndjson_response = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users/export")
+    csv_response = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users/export", params={"format": "csv"})
+
+    # Then
+    assert ndjson_response.status_code == 200
+    assert [json.loads(line)["id"] for line in ndjson_response.text.splitlines()] == user_ids
+    assert csv_response.status_code == 200
+    assert [user["id"] for user in csv.DictReader(io.StringIO(csv_response.text))] == user_ids
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_read_user(
+    async_fastapi_test_client: AsyncClient,
+    async_db_session: AsyncSession,
+    assert_query_count: Callable[[int], AbstractContextManager[QueryStats]],
+):
+    """Test getting a single user using the async route."""
+    # Given
+    UserFactory()
+    user = UserFactory(first_name="Fulton", last_name="Sheen", is_superuser=True)
+    await async_db_session.commit()
+
+    # When
+    with assert_query_count(1):
+        response = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users/{user.id}")
+    random_user_id = str(uuid.uuid4())
+    response_for_random_user_id = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users/{random_user_id}")
+
+    # Then
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user.id)
+    assert response.json()["first_name"] == "Fulton"
+    assert response_for_random_user_id.status_code == 400
+    assert response_for_random_user_id.json() == {"message": f"User id {random_user_id} does not exist."}
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_read_user_conditionally(async_fastapi_test_client: AsyncClient, async_db_session: AsyncSession):
+    """Test conditionally getting users using the async routes."""
+    # Given
+    user = UserFactory()
+    await async_db_session.commit()
+    user_url = f"{API_V1_PREFIX}/users/{user.id}"
+    response = await async_fastapi_test_client.get(user_url)
+    etag = response.headers["ETag"]
+
+    # When
+    not_modified_response = await async_fastapi_test_client.get(user_url, headers={"If-None-Match": etag})
+    last_modified_response = await async_fastapi_test_client.get(
+        user_url,
+        headers={"If-Modified-Since": response.headers["Last-Modified"]},
+    )
+    modified_response = await async_fastapi_test_client.get(user_url, headers={"If-None-Match": '"another-version"'})
+    users_response = await async_fastapi_test_client.get(f"{API_V1_PREFIX}/users")
+    users_not_modified_response = await async_fastapi_test_client.get(
+        f"{API_V1_PREFIX}/users",
+        headers={"If-None-Match": users_response.headers["ETag"]},
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.content == b""
+    assert last_modified_response.status_code == 304
+    assert modified_response.status_code == 200
+    assert users_response.status_code == 200
+    assert "Last-Modified" not in users_response.headers
+    assert users_not_modified_response.status_code == 304
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_update_user(async_fastapi_test_client: AsyncClient, async_db_session: AsyncSession):
+    """Test updating a user's information using the async route."""
+    # Given
+    user = UserFactory(first_name="John", last_name="Tolkien")
+    await async_db_session.commit()
+    user_hashed_password = user.hashed_password
+
+    # When
+    response = await async_fastapi_test_client.patch(
+        f"{API_V1_PREFIX}/users/{user.id}",
+        json={"first_name": "Jonathan", "is_superuser": True, "password": "MyStronglyFakePassword@!"},
+    )
+
+    # Then
+    response_data = response.json()
+    assert response.status_code == 200
+    assert response_data["first_name"] == "Jonathan"
+    assert response_data["last_name"] == "Tolkien"
+    assert response_data["is_superuser"] is True
+    db_user = await async_db_session.get(User, user.id, populate_existing=True)
+    assert db_user is not None
+    assert db_user.hashed_password != user_hashed_password
+
+
+@pytest.mark.integration()
+@pytest.mark.asyncio()
+async def test_delete_user(async_fastapi_test_client: AsyncClient, async_db_session: AsyncSession):
+    """Test soft deleting a user using the async route."""
+    # Given
+    user_1 = UserFactory()
+    user_2 = UserFactory()
+    await async_db_session.commit()
+
+    # When
+    response = await async_fastapi_test_client.delete(f"{API_V1_PREFIX}/users/{user_1.id}")
+    response_for_deleted_user = await async_fastapi_test_client.delete(f"{API_V1_PREFIX}/users/{user_1.id}")
+
+    # Then
+    assert response.status_code == 200
+    assert response.json() == {"message": "success"}
+    db_user_1 = await async_db_session.get(User, user_1.id, populate_existing=True)
+    db_user_2 = await async_db_session.get(User, user_2.id, populate_existing=True)
+    assert db_user_1 is not None
+    assert db_user_1.deleted_at is not None
+    assert db_user_2 is not None
+    assert db_user_2.deleted_at is None
+    # Verify that deleting the user again fails
+    assert response_for_deleted_user.status_code == 400
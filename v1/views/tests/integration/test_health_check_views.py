@@ -1,8 +1,14 @@
 """Test router for health check."""
 
+from unittest.mock import AsyncMock
+
 import pytest
 from fastapi.testclient import TestClient
 
+from v1.database.connections import get_created_engines, get_db_engine
+from v1.services.health_checks import CachedDatabasePing, DatabasePing
+from v1.views.health_check import get_database_ping
+
 
 @pytest.mark.integration()
 def test_health_check_for_main_app(fastapi_test_client: TestClient):
@@ -20,3 +26,71 @@ def test_health_check_for_app_v1(fastapi_test_client: TestClient):
     response = fastapi_test_client.get("/api/v1/health-check")
     assert response.status_code == 200
     assert response.json() == {"message": "Alive and well!"}
+
+
+@pytest.mark.integration()
+def test_database_pool_stats(fastapi_test_client: TestClient):
+    """Test database pool stats endpoint returns the metrics of the connection pools created, without creating any."""
+    # Given
+    get_db_engine()
+    created_engine_names = set(get_created_engines())
+
+    # When
+    response = fastapi_test_client.get("/api/v1/health-check/database-pool")
+
+    # Then
+    assert response.status_code == 200
+    response_data = response.json()
+    assert set(response_data) == created_engine_names
+    assert set(get_created_engines()) == created_engine_names
+    assert set(response_data["sync"]) == {
+        "pool_size",
+        "max_overflow",
+        "checked_out",
+        "checked_in",
+        "overflow",
+        "checkouts",
+        "timeouts",
+        "total_wait_seconds",
+        "max_wait_seconds",
+    }
+    assert response_data["sync"]["pool_size"] == 5
+
+
+@pytest.mark.integration()
+def test_liveness(fastapi_test_client: TestClient):
+    """Test liveness endpoint."""
+    response = fastapi_test_client.get("/health-check/live")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Alive and well!"}
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    ("database_ping", "expected_status_code"),
+    [
+        (DatabasePing(is_reachable=True, latency_seconds=0.001), 200),
+        (DatabasePing(is_reachable=False, latency_seconds=1, error="Timed out"), 503),
+    ],
+    ids=["ready", "database-unreachable"],
+)
+def test_readiness(fastapi_test_client: TestClient, database_ping: DatabasePing, expected_status_code: int):
+    """Test readiness endpoint returns 503 if the database cannot be reached, with the pool's saturation."""
+    # Given
+    cached_database_ping = CachedDatabasePing(AsyncMock(return_value=database_ping), ttl_seconds=0)
+    fastapi_test_client.app.dependency_overrides[get_database_ping] = lambda: cached_database_ping  # type: ignore[attr-defined]
+
+    # When
+    response = fastapi_test_client.get("/api/v1/health-check/ready")
+
+    # Then
+    assert response.status_code == expected_status_code
+    response_data = response.json()
+    assert response_data["is_ready"] is (expected_status_code == 200)
+    assert response_data["database"] == {
+        "is_reachable": database_ping.is_reachable,
+        "latency_seconds": database_ping.latency_seconds,
+        "error": database_ping.error,
+    }
+    assert response_data["pool"]["pool_size"] == 5
+    assert response_data["pool_saturation"] == 0
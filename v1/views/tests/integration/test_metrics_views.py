@@ -0,0 +1,33 @@
+"""Test router for metrics."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from v1.database.connections import get_db_engine
+from v1.services.metrics import PROMETHEUS_CONTENT_TYPE, request_metrics
+
+
+@pytest.mark.integration()
+def test_metrics(fastapi_test_client: TestClient):
+    """Test metrics endpoint returns request, database pool and password hashing metrics in the Prometheus format."""
+    # Given
+    request_metrics.reset()
+    # The test client's sessions are bound to the test database, so create the app's engine to report its pool
+    get_db_engine()
+    fastapi_test_client.get("/health-check")
+    fastapi_test_client.get("/health-check/")
+
+    # When
+    response = fastapi_test_client.get("/metrics")
+
+    # Then
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+    metric_lines = response.text.splitlines()
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/health-check",status="200",le="+Inf"} 2'
+        in metric_lines
+    )
+    assert "# TYPE db_pool_checkout_wait_seconds_total counter" in metric_lines
+    assert 'db_pool_size{engine="sync"} 5' in metric_lines
+    assert "# TYPE password_hashing_queued_tasks gauge" in metric_lines
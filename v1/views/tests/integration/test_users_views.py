@@ -1,19 +1,29 @@
 """Test module for user router."""
 
+import csv
+import io
+import json
 import uuid
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from operator import itemgetter
 from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from main import v1_router  # pylint: disable=no-name-in-module
+from main import API_V1_PREFIX
+from v1.database.instrumentation import QueryStats
 from v1.database.models.test_factories.users import UserFactory
 from v1.database.models.users import User
+from v1.exceptions.passwords import PasswordHashingPoolFullError
 from v1.schemas.users import CreateUserRequest
+from v1.services.password_hashing import password_hashing_pool
 
 
 def datetime_obj_to_str(datetime_obj: datetime):
@@ -29,7 +39,7 @@ def test_create_user(fastapi_test_client: TestClient, db_session: Session, creat
     datetime_before_request = datetime.now(timezone.utc) - timedelta(minutes=1)
 
     # When
-    response = fastapi_test_client.post(f"{v1_router.prefix}/users", json=create_user_request.model_dump())
+    response = fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=create_user_request.model_dump())
     datetime_after_request = datetime.now(timezone.utc) + timedelta(minutes=1)
 
     # Then
@@ -91,7 +101,7 @@ def test_create_same_user_as_above_test_is_possible(
     made in the database from the previous test. Each test should rollback any commits that were made.
     """
     # When
-    response = fastapi_test_client.post(f"{v1_router.prefix}/users", json=create_user_request.model_dump())
+    response = fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=create_user_request.model_dump())
 
     # Then
     # Verify response status and data
@@ -111,7 +121,7 @@ def test_create_user_with_an_invalid_email_address_fails(
     user_request.email = "florence..faolluiere@gmail.com"
 
     # When
-    response = fastapi_test_client.post(f"{v1_router.prefix}/users", json=user_request.model_dump())
+    response = fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=user_request.model_dump())
 
     # Then
     # Verify response status and type
@@ -135,7 +145,7 @@ def test_creating_a_user_who_already_exists_fails(
 
     # When
     # Try to create the user again
-    response = fastapi_test_client.post(f"{v1_router.prefix}/users", json=user)
+    response = fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=user)
 
     # Then
     # Verify response status and data
@@ -147,7 +157,85 @@ def test_creating_a_user_who_already_exists_fails(
 
 
 @pytest.mark.integration()
-def test_read_users(fastapi_test_client: TestClient, db_session: Session):
+def test_create_user_when_password_hashing_pool_is_full_fails(
+    fastapi_test_client: TestClient,
+    create_user_request: CreateUserRequest,
+    mocker: MockerFixture,
+):
+    """Test that a user cannot be created while the password hashing pool is full."""
+    # Given
+    mocker.patch.object(password_hashing_pool, "hash", side_effect=PasswordHashingPoolFullError(queue_depth=64))
+
+    # When
+    response = fastapi_test_client.post(f"{API_V1_PREFIX}/users", json=create_user_request.model_dump())
+
+    # Then
+    # Verify response status, headers and data
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json() == {"message": "Too many password operations in progress. Please try again later."}
+
+
+@pytest.mark.integration()
+def test_create_users(fastapi_test_client: TestClient, db_session: Session, create_user_request: CreateUserRequest):
+    """Test bulk create users route and response."""
+    # Given
+    existing_user = UserFactory()
+    db_session.commit()
+    new_user = create_user_request.model_dump()
+    existing_user_request = {**new_user, "email": existing_user.email}
+
+    # When
+    response = fastapi_test_client.post(
+        f"{API_V1_PREFIX}/users/bulk",
+        json={"users": [new_user, existing_user_request, new_user]},
+    )
+
+    # Then
+    response_data = response.json()
+    assert response.status_code == 200
+    assert [(result["email"], result["status"]) for result in response_data] == [
+        (new_user["email"], "created"),
+        (existing_user.email, "already_exists"),
+        (new_user["email"], "duplicate_in_request"),
+    ]
+    # Verify the created user is in the response without any password related data
+    created_user = response_data[0]["user"]
+    assert created_user["first_name"] == new_user["first_name"]
+    assert "hashed_password" not in created_user
+    assert response_data[1]["user"] is None
+    assert response_data[2]["user"] is None
+
+    # Verify information recorded in database is correct
+    db_user = db_session.query(User).filter_by(id=created_user["id"]).first()
+    assert db_user is not None
+    assert db_user.email == new_user["email"]
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize("number_of_users", [0, 1001])
+def test_create_users_with_an_invalid_number_of_users_fails(
+    fastapi_test_client: TestClient,
+    create_user_request: CreateUserRequest,
+    number_of_users: int,
+):
+    """Test bulk creating no users or more than the limit of users fails."""
+    # When
+    response = fastapi_test_client.post(
+        f"{API_V1_PREFIX}/users/bulk",
+        json={"users": [create_user_request.model_dump()] * number_of_users},
+    )
+
+    # Then
+    assert response.status_code == 422
+
+
+@pytest.mark.integration()
+def test_read_users(
+    fastapi_test_client: TestClient,
+    db_session: Session,
+    assert_query_count: Callable[[int], AbstractContextManager[QueryStats]],
+):
     """Test getting a list of users."""
     # Given
     # Create users in the database
@@ -158,7 +246,8 @@ def test_read_users(fastapi_test_client: TestClient, db_session: Session):
     db_session.commit()
 
     # When
-    response = fastapi_test_client.get(f"{v1_router.prefix}/users")
+    with assert_query_count(1):
+        response = fastapi_test_client.get(f"{API_V1_PREFIX}/users")
 
     # Then
     # Verify response status and data
@@ -203,7 +292,143 @@ def test_read_users(fastapi_test_client: TestClient, db_session: Session):
 
 
 @pytest.mark.integration()
-def test_read_user(fastapi_test_client: TestClient, db_session: Session):
+def test_read_users_using_cursors(fastapi_test_client: TestClient, db_session: Session):
+    """Test getting a list of users by following the next cursor of each page."""
+    # Given
+    UserFactory.create_batch(5)
+    db_session.commit()
+    all_users_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users")
+
+    # When
+    page_1_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users", params={"limit": 2})
+    page_2_response = fastapi_test_client.get(
+        f"{API_V1_PREFIX}/users",
+        params={"limit": 2, "cursor": page_1_response.headers["X-Next-Cursor"]},
+    )
+    page_3_response = fastapi_test_client.get(
+        f"{API_V1_PREFIX}/users",
+        params={"limit": 2, "cursor": page_2_response.headers["X-Next-Cursor"]},
+    )
+
+    # Then
+    assert page_1_response.status_code == 200
+    assert page_2_response.status_code == 200
+    assert page_3_response.status_code == 200
+    # Verify that the last page does not have a next cursor
+    assert "X-Next-Cursor" not in page_3_response.headers
+    # Verify that combining the pages matches the full listing of users, without any users repeated
+    response_data = [*page_1_response.json(), *page_2_response.json(), *page_3_response.json()]
+    assert len(response_data) == 5
+    assert response_data == all_users_response.json()
+
+
+@pytest.mark.integration()
+def test_read_users_conditionally(fastapi_test_client: TestClient, db_session: Session):
+    """Test getting a page of users returns 304 Not Modified only if the users on the page are unchanged."""
+    # Given
+    users = UserFactory.create_batch(3)
+    db_session.commit()
+    users_url = f"{API_V1_PREFIX}/users"
+    response = fastapi_test_client.get(users_url, params={"limit": 2})
+    etag = response.headers["ETag"]
+
+    # When
+    not_modified_response = fastapi_test_client.get(users_url, params={"limit": 2}, headers={"If-None-Match": etag})
+    other_page_response = fastapi_test_client.get(users_url, params={"limit": 3}, headers={"If-None-Match": etag})
+    modified_response = fastapi_test_client.get(
+        users_url,
+        params={"limit": 2},
+        headers={"If-None-Match": '"another-version"'},
+    )
+
+    # Then
+    assert len(users) == 3
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.content == b""
+    # Verify the cursor to the next page is still returned
+    assert not_modified_response.headers["X-Next-Cursor"] == response.headers["X-Next-Cursor"]
+    assert other_page_response.status_code == 200
+    assert modified_response.status_code == 200
+    assert modified_response.json() == response.json()
+
+
+@pytest.mark.integration()
+def test_read_users_ignores_if_modified_since(fastapi_test_client: TestClient, db_session: Session):
+    """Test a page of users is returned when a user moves out of it, even though no user on it has been updated since.
+
+    The latest update time of the users on the page does not show whether users moved in or out of it.
+    """
+    # Given the first page has Anna and Bob, then Cleo, who was updated before both
+    cleo = UserFactory(first_name="Cleo", updated_at=datetime.now(timezone.utc) - timedelta(days=1))
+    anna = UserFactory(first_name="Anna")
+    bob = UserFactory(first_name="Bob")
+    db_session.commit()
+    users_url = f"{API_V1_PREFIX}/users"
+    response = fastapi_test_client.get(users_url, params={"limit": 2})
+    not_modified_since = format_datetime(datetime.now(timezone.utc) + timedelta(hours=1), usegmt=True)
+
+    # When Bob is renamed, so they move out of the page and Cleo moves into it
+    bob.first_name = "Zed"
+    db_session.commit()
+    modified_response = fastapi_test_client.get(
+        users_url,
+        params={"limit": 2},
+        headers={"If-Modified-Since": not_modified_since},
+    )
+
+    # Then
+    assert [user["id"] for user in response.json()] == [str(anna.id), str(bob.id)]
+    assert modified_response.status_code == 200
+    assert [user["id"] for user in modified_response.json()] == [str(anna.id), str(cleo.id)]
+
+
+@pytest.mark.integration()
+def test_read_users_with_an_invalid_cursor_fails(fastapi_test_client: TestClient):
+    """Test getting a list of users with an invalid cursor fails."""
+    # When
+    response = fastapi_test_client.get(f"{API_V1_PREFIX}/users", params={"cursor": "notAValidCursor"})
+
+    # Then
+    assert response.status_code == 400
+    assert response.json() == {"message": "Cursor notAValidCursor is not valid."}
+
+
+@pytest.mark.integration()
+def test_export_users(fastapi_test_client: TestClient, db_session: Session):
+    """Test exporting every user as newline delimited JSON and as CSV."""
+    # Given
+    users = UserFactory.create_batch(5)
+    db_session.commit()
+    users_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users")
+
+    # When
+    ndjson_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users/export")
+    csv_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users/export", params={"format": "csv"})
+    invalid_format_response = fastapi_test_client.get(f"{API_V1_PREFIX}/users/export", params={"format": "xml"})
+
+    # Then
+    # Verify that the export has the same users as the listing, sorted by id
+    expected_users = sorted(users_response.json(), key=itemgetter("id"))
+    assert ndjson_response.status_code == 200
+    assert ndjson_response.headers["Content-Type"] == "application/x-ndjson"
+    assert ndjson_response.headers["Content-Disposition"] == 'attachment; filename="users.ndjson"'
+    assert [json.loads(line) for line in ndjson_response.text.splitlines()] == expected_users
+    assert csv_response.status_code == 200
+    assert csv_response.headers["Content-Type"] == "text/csv; charset=utf-8"
+    csv_users = list(csv.DictReader(io.StringIO(csv_response.text)))
+    assert [user["id"] for user in csv_users] == sorted(str(user.id) for user in users)
+    assert "hashed_password" not in csv_users[0]
+    assert invalid_format_response.status_code == 422
+
+
+@pytest.mark.integration()
+def test_read_user(
+    fastapi_test_client: TestClient,
+    db_session: Session,
+    assert_query_count: Callable[[int], AbstractContextManager[QueryStats]],
+):
     """Test getting a single user."""
     # Given
     # Create users in the database
@@ -212,9 +437,12 @@ def test_read_user(fastapi_test_client: TestClient, db_session: Session):
     user_2 = UserFactory(first_name="Fulton", last_name="Sheen", is_superuser=True)
     _user_3 = UserFactory(first_name="John", last_name="Tolkien", created_at=datetime_now)
     db_session.commit()
+    # Load the user's id before counting queries, as committing expired it
+    user_2_url = f"{API_V1_PREFIX}/users/{user_2.id}"
 
     # When
-    response = fastapi_test_client.get(f"{v1_router.prefix}/users/{user_2.id}")
+    with assert_query_count(1):
+        response = fastapi_test_client.get(user_2_url)
 
     # Then
     # Verify response status and data
@@ -233,6 +461,36 @@ def test_read_user(fastapi_test_client: TestClient, db_session: Session):
     assert response_data == expected_response
 
 
+@pytest.mark.integration()
+def test_read_user_conditionally(fastapi_test_client: TestClient, db_session: Session):
+    """Test getting a user returns 304 Not Modified, without a body, only if the request's copy is up to date."""
+    # Given
+    user = UserFactory()
+    db_session.commit()
+    user_url = f"{API_V1_PREFIX}/users/{user.id}"
+    response = fastapi_test_client.get(user_url)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    # When
+    etag_response = fastapi_test_client.get(user_url, headers={"If-None-Match": etag})
+    last_modified_response = fastapi_test_client.get(user_url, headers={"If-Modified-Since": last_modified})
+    # Tests run in a single transaction, so updated_at does not change on update. Use an ETag of another version.
+    modified_response = fastapi_test_client.get(user_url, headers={"If-None-Match": '"another-version"'})
+
+    # Then
+    assert response.status_code == 200
+    assert etag.startswith('"')
+    assert etag_response.status_code == 304
+    assert etag_response.content == b""
+    assert etag_response.headers["ETag"] == etag
+    assert etag_response.headers["Last-Modified"] == last_modified
+    assert last_modified_response.status_code == 304
+    assert modified_response.status_code == 200
+    assert modified_response.headers["ETag"] == etag
+    assert modified_response.json()["id"] == str(user.id)
+
+
 @pytest.mark.integration()
 def test_read_user_with_a_user_id_which_does_not_match_any_users_fails(
     fastapi_test_client: TestClient,
@@ -250,7 +508,7 @@ def test_read_user_with_a_user_id_which_does_not_match_any_users_fails(
     # When
     # Create a random id that does not match any users
     random_user_id = str(uuid.uuid4())
-    response = fastapi_test_client.get(f"{v1_router.prefix}/users/{random_user_id}")
+    response = fastapi_test_client.get(f"{API_V1_PREFIX}/users/{random_user_id}")
 
     # Then
     # Verify response status and data
@@ -274,7 +532,7 @@ def test_update_user(fastapi_test_client: TestClient, db_session: Session):
 
     # When
     response = fastapi_test_client.patch(
-        f"{v1_router.prefix}/users/{user_3.id}",
+        f"{API_V1_PREFIX}/users/{user_3.id}",
         json={"first_name": "Jonathan", "is_superuser": True, "password": "MyStronglyFakePassword@!"},
     )
 
@@ -326,7 +584,7 @@ def test_update_user_with_a_user_id_which_does_not_match_any_users_fails(
     # Create a random id that does not match any users
     random_user_id = str(uuid.uuid4())
     response = fastapi_test_client.patch(
-        f"{v1_router.prefix}/users/{random_user_id}",
+        f"{API_V1_PREFIX}/users/{random_user_id}",
         json={"first_name": "Jonathan", "is_superuser": True, "password": "MyStronglyFakePassword@!"},
     )
 
@@ -346,7 +604,7 @@ def test_update_user_with_an_invalid_email_address_fails(fastapi_test_client: Te
 
     # When
     response = fastapi_test_client.patch(
-        f"{v1_router.prefix}/users/{user.id}",
+        f"{API_V1_PREFIX}/users/{user.id}",
         json={"email": "fulton.sheen@elpaso-university.com"},
     )
 
@@ -354,7 +612,10 @@ def test_update_user_with_an_invalid_email_address_fails(fastapi_test_client: Te
     # Verify response status and data
     response_data = response.json()
     assert response.status_code == 422
-    assert isinstance(response_data, dict)
+    assert response_data == {
+        "message": "User email fulton.sheen@elpaso-university.com cannot receive email. "
+        "The domain name elpaso-university.com does not exist.",
+    }
 
 
 @pytest.mark.integration()
@@ -369,7 +630,7 @@ def test_delete_user(fastapi_test_client: TestClient, db_session: Session):
     datetime_before_request = datetime.now(timezone.utc) - timedelta(minutes=1)
 
     # When
-    response = fastapi_test_client.delete(f"{v1_router.prefix}/users/{user_1.id}")
+    response = fastapi_test_client.delete(f"{API_V1_PREFIX}/users/{user_1.id}")
     datetime_after_request = datetime.now(timezone.utc) + timedelta(minutes=1)
 
     # Then
@@ -410,7 +671,7 @@ def test_delete_user_who_has_been_previously_deleted_fails(
     db_session.commit()
 
     # When
-    response = fastapi_test_client.delete(f"{v1_router.prefix}/users/{user_1.id}")
+    response = fastapi_test_client.delete(f"{API_V1_PREFIX}/users/{user_1.id}")
 
     # Then
     # Verify response status and data
@@ -438,7 +699,7 @@ def test_delete_user_with_a_user_id_which_does_not_match_any_users_fails(
     # When
     # Create a random id that does not match any users
     random_user_id = str(uuid.uuid4())
-    response = fastapi_test_client.delete(f"{v1_router.prefix}/users/{random_user_id}")
+    response = fastapi_test_client.delete(f"{API_V1_PREFIX}/users/{random_user_id}")
 
     # Then
     # Verify response status and data
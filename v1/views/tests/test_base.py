@@ -0,0 +1,28 @@
+"""Test router related code."""
+
+import time
+from unittest.mock import MagicMock
+
+from fastapi import Request
+from pytest_mock import MockerFixture
+
+from v1.api_infra.middlewares.read_your_writes import READ_YOUR_WRITES_COOKIE
+from v1.views.base import get_read_db_session
+
+
+def test_get_read_db_session(mocker: MockerFixture):
+    """Test read sessions prefer the primary only if the client wrote recently, so it can read its own writes."""
+    # Given
+    create_read_db_session = mocker.patch("v1.views.base.create_read_db_session")
+    request = MagicMock(Request, cookies={})
+    own_writes_request = MagicMock(Request, cookies={READ_YOUR_WRITES_COOKIE: str(time.time() + 60)})
+
+    # When
+    next(get_read_db_session(request))
+    next(get_read_db_session(own_writes_request))
+
+    # Then
+    assert [call.kwargs for call in create_read_db_session.call_args_list] == [
+        {"prefer_primary": False},
+        {"prefer_primary": True},
+    ]
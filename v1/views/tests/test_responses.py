@@ -0,0 +1,58 @@
+"""Test response classes."""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from v1.database.models.test_factories.users import UserFactory
+from v1.database.models.users import User
+from v1.schemas.users import UserResponse, user_responses_adapter
+from v1.views.responses import FastJSONResponse
+
+
+def render_with_response_model(users: list[User]) -> bytes:
+    """Return the users rendered the way FastAPI renders an endpoint's return value using its response model."""
+    field = create_response_field(name="Response_read_users", type_=list[UserResponse])
+    content = asyncio.run(serialize_response(field=field, response_content=users))
+    return JSONResponse(content).body
+
+
+def test_fast_json_response_renders_the_same_json_as_the_response_model():
+    """Test that rendering ORM objects with a type adapter matches rendering them with FastAPI's response model."""
+    # Given
+    users = [
+        *UserFactory.build_batch(3, hashed_password="not-a-real-hash"),  # nosec: hardcoded_password_funcarg
+        UserFactory.build(
+            first_name="Zoë",
+            hashed_password="not-a-real-hash",  # nosec: hardcoded_password_funcarg
+            updated_at=datetime(2026, 10, 18, 13, 0, 0, 123456, tzinfo=timezone.utc),
+            deleted_at=datetime(2026, 10, 18, 14, 0, 0, tzinfo=timezone.utc),
+        ),
+    ]
+
+    # When
+    response = FastJSONResponse(users, type_adapter=user_responses_adapter)
+
+    # Then
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == json.loads(render_with_response_model(users))
+    assert "hashed_password" not in json.loads(response.body)[0]
+
+
+def test_fast_json_response_renders_content_without_a_type_adapter_using_orjson():
+    """Test that content without a type adapter is rendered like any other JSON response."""
+    # Given
+    content = {"message": "Zoë", "ids": [str(uuid.UUID(int=1))], "count": 1, "deleted": None}
+
+    # When
+    response = FastJSONResponse(content, status_code=201, headers={"X-Test": "test"})
+
+    # Then
+    assert response.status_code == 201
+    assert response.headers["X-Test"] == "test"
+    assert json.loads(response.body) == content
@@ -1,53 +1,120 @@
 """User endpoints."""
 
-from collections.abc import Sequence
 from http import HTTPStatus
+from uuid import UUID
+
+from fastapi import Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from v1.database.models.users import User
-from v1.exceptions.users import UserAlreadyExistsError
 from v1.schemas.base import DeleteResponse
-from v1.schemas.users import CreateUserRequest, CreateUserService, UpdateUserRequest, UpdateUserService, UserResponse
+from v1.schemas.users import (
+    BulkCreateUserResult,
+    BulkCreateUsersRequest,
+    CreateUserRequest,
+    CreateUserService,
+    UpdateUserRequest,
+    UpdateUserService,
+    UserCursor,
+    UserResponse,
+    bulk_create_user_results_adapter,
+    user_response_adapter,
+    user_responses_adapter,
+)
 from v1.services import users as users_service
-from v1.views.base import APIRouter, DbSession, RouteTags
+from v1.services.conditional_requests import ConditionalHeaders, get_etag, get_last_modified
+from v1.services.exports import ExportFormat, iter_export
+from v1.services.pagination import decode_cursor, get_next_cursor
+from v1.views.base import NEXT_CURSOR_HEADER, APIRouter, DbSession, ReadDbSession, RouteTags, get_conditional_response
 from v1.views.dependencies.users import UserDependency
+from v1.views.responses import FastJSONResponse
 
 router = APIRouter(prefix="/users", tags=[RouteTags.USERS])
 
 
 @router.post("/", response_model=UserResponse, status_code=HTTPStatus.CREATED)
-def create_user(db_session: DbSession, user: CreateUserRequest) -> User:
+def create_user(db_session: DbSession, user: CreateUserRequest) -> FastJSONResponse:
     """Return created user."""
-    db_user = users_service.get_user_from_email(db_session, user.email)
-    if db_user:
-        raise UserAlreadyExistsError(email=user.email)
-    return users_service.create_user(db_session, CreateUserService(**user.model_dump()))
+    db_user = users_service.create_user(db_session, CreateUserService(**user.model_dump()))
+    return FastJSONResponse(db_user, status_code=HTTPStatus.CREATED, type_adapter=user_response_adapter)
+
+
+@router.post("/bulk", response_model=list[BulkCreateUserResult])
+def create_users(
+    db_session: DbSession,
+    bulk_create_users: BulkCreateUsersRequest,
+) -> FastJSONResponse:
+    """Return the result of creating each user, in the same order as the users in the request."""
+    users = [CreateUserService(**user.model_dump()) for user in bulk_create_users.users]
+    results = users_service.create_users(db_session, users)
+    return FastJSONResponse(results, type_adapter=bulk_create_user_results_adapter)
 
 
 @router.get("/", response_model=list[UserResponse])
-def read_users(db_session: DbSession, offset: int = 0, limit: int = 100) -> Sequence[User]:
-    """Return list of users in the database."""
-    return users_service.get_users(db_session, offset, limit)
+def read_users(
+    db_session: ReadDbSession,
+    request: Request,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Response:
+    """Return list of users in the database.
+
+    For keyset pagination, pass the X-Next-Cursor response header as the cursor of the next request.
+    The header is omitted on the last page.
+
+    Return 304 Not Modified if the If-None-Match header shows the page has not changed. Last-Modified is not sent
+    and If-Modified-Since is ignored, as users can move in or out of the page without the latest update time of the
+    page changing (e.g. a user on the page being renamed so that it sorts elsewhere).
+    """
+    user_cursor = decode_cursor(cursor, UserCursor) if cursor else None
+    users = users_service.get_users(db_session, offset, limit, user_cursor)
+    next_cursor = get_next_cursor(users, limit, UserCursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+    conditional_headers = ConditionalHeaders(get_etag(users))
+    return get_conditional_response(request, users, user_responses_adapter, conditional_headers, headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_users(
+    db_session: ReadDbSession,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    """Stream every user, sorted by id, as newline delimited JSON (the default) or CSV.
+
+    Users are read from the database in batches and sent as each batch is read, so memory use does not grow with the
+    number of users.
+    """
+    batches = users_service.stream_users_export(db_session)
+    return StreamingResponse(
+        iter_export(batches, UserResponse, export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def read_user(user: UserDependency) -> User:
-    """Return user belonging to user id."""
-    return user
+def read_user(request: Request, user: UserDependency) -> Response:
+    """Return user belonging to user id.
+
+    Return 304 Not Modified if the If-None-Match or If-Modified-Since header shows the user has not changed.
+    """
+    conditional_headers = ConditionalHeaders(get_etag([user]), get_last_modified(user))
+    return get_conditional_response(request, user, user_response_adapter, conditional_headers)
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
-def update_user(db_session: DbSession, user: UserDependency, update_user_data: UpdateUserRequest) -> User | None:
+def update_user(db_session: DbSession, user_id: UUID, update_user_data: UpdateUserRequest) -> FastJSONResponse:
     """Return updated user."""
-    users_service.update_user_using_id(
+    db_user = users_service.update_user_using_id(
         db_session,
-        user_id=user.id,
+        user_id=user_id,
         update_user_data=UpdateUserService(**update_user_data.model_dump(exclude_unset=True)),
     )
-    return users_service.get_user_from_id(db_session, user_id=user.id)
+    return FastJSONResponse(db_user, type_adapter=user_response_adapter)
 
 
 @router.delete("/{user_id}", response_model=DeleteResponse)
-def soft_delete_user(db_session: DbSession, user: UserDependency) -> DeleteResponse:
+def soft_delete_user(db_session: DbSession, user_id: UUID) -> DeleteResponse:
     """Return success message on delete."""
-    users_service.soft_delete_user(db_session, user)
+    users_service.soft_delete_user(db_session, user_id)
     return DeleteResponse()